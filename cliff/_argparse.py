@@ -13,14 +13,216 @@
 """Overrides of standard argparse behavior."""
 
 import argparse
-from collections.abc import Iterable
-from typing import Any
+from collections.abc import Callable, Iterable, Sequence
+import sys
+import threading
+from typing import Any, NamedTuple, TypeVar
 import warnings
 
 import autopage.argparse
 
+_T = TypeVar('_T')
+
+
+class _DeferredArguments(NamedTuple):
+    selector: argparse.Action
+    choice: str
+    callback: Callable[[argparse.ArgumentParser], None]
+    serial: int
+    action_anchor: argparse.Action | None
+    group_anchor: argparse._ArgumentGroup | None
+
 
 class ArgumentParser(autopage.argparse.ArgumentParser):
+    _epilog: str | Callable[[], str | None] | None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._deferred_arguments: list[_DeferredArguments] = []
+        self._deferred_serials: dict[int, int] = {}
+        self._deferred_count = 0
+        # Parsers may be cached and shared between threads, so adding the
+        # deferred arguments must not happen while another thread parses.
+        self._deferred_lock = threading.RLock()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def epilog(self) -> str | None:
+        """Text shown after the description of the arguments in the help.
+
+        It can be set to a callable returning the text, which is then only
+        called when the text is first needed.
+        """
+        epilog = self._epilog
+        if callable(epilog):
+            epilog = epilog()
+            self._epilog = epilog
+        return epilog
+
+    @epilog.setter
+    def epilog(self, value: str | Callable[[], str | None] | None) -> None:
+        self._epilog = value
+
+    def add_deferred_arguments(
+        self,
+        selector: argparse.Action,
+        choice: str,
+        callback: Callable[[argparse.ArgumentParser], None],
+    ) -> None:
+        """Add arguments to the parser only when they may be used.
+
+        ``callback`` is called with the parser to add the arguments when
+        ``choice`` is the value of the ``selector`` option in the arguments
+        being parsed, and before the help or usage is formatted. The
+        arguments are positioned as if they had been added right away.
+        """
+        self._deferred_arguments.append(
+            _DeferredArguments(
+                selector,
+                choice,
+                callback,
+                self._deferred_count,
+                self._actions[-1] if self._actions else None,
+                self._action_groups[-1] if self._action_groups else None,
+            )
+        )
+        self._deferred_count += 1
+
+    def add_all_deferred_arguments(self) -> None:
+        """Add all the arguments deferred by :meth:`add_deferred_arguments`.
+
+        This is needed before looking at the actions of the parser directly,
+        rather than through :meth:`format_help` or :meth:`format_usage`.
+        """
+        with self._deferred_lock:
+            while self._deferred_arguments:
+                self._add_deferred(self._deferred_arguments[0])
+
+    def _add_deferred(self, deferred: _DeferredArguments) -> None:
+        self._deferred_arguments.remove(deferred)
+        num_actions = len(self._actions)
+        num_groups = len(self._action_groups)
+        deferred.callback(self)
+        self._move_deferred(
+            self._actions, num_actions, deferred.action_anchor, deferred.serial
+        )
+        self._move_deferred(
+            self._action_groups,
+            num_groups,
+            deferred.group_anchor,
+            deferred.serial,
+        )
+
+    def _move_deferred(
+        self, items: list[_T], start: int, anchor: _T | None, serial: int
+    ) -> None:
+        # Move the items added from start to where they would have been if
+        # they had not been deferred: after the anchor and after the items
+        # of the deferred arguments registered before them.
+        added = items[start:]
+        del items[start:]
+        for item in added:
+            self._deferred_serials[id(item)] = serial
+        index = 0 if anchor is None else items.index(anchor) + 1
+        while (
+            index < len(items)
+            and self._deferred_serials.get(id(items[index]), serial) < serial
+        ):
+            index += 1
+        items[index:index] = added
+
+    def _select_deferred(
+        self, args: Sequence[str]
+    ) -> tuple[dict[argparse.Action, str], bool] | None:
+        # Find the values given to the known options in the arguments,
+        # without adding the deferred arguments, and whether all the options
+        # are known. Return None if the arguments cannot be interpreted
+        # without the deferred arguments.
+        selected: dict[argparse.Action, str] = {}
+        complete = True
+        known = self._option_string_actions
+        prefixes = self.prefix_chars
+        for index, arg in enumerate(args):
+            if arg == '--':
+                break
+            if (
+                arg
+                and self.fromfile_prefix_chars
+                and arg[0] in self.fromfile_prefix_chars
+            ):
+                return None
+            if (
+                len(arg) < 2
+                or arg[0] not in prefixes
+                or self._negative_number_matcher.match(arg)
+            ):
+                continue
+            option, sep, inline = arg.partition('=')
+            value: str | None = inline
+            following = args[index + 1] if index + 1 < len(args) else None
+            if arg in known:
+                action, value = known[arg], following
+            elif sep and option in known:
+                action = known[option]
+            elif arg[1] in prefixes:
+                matches = {
+                    known[name]
+                    for name in known
+                    if self.allow_abbrev and name.startswith(option)
+                }
+                if len(matches) > 1:
+                    return None
+                if not matches:
+                    complete = False
+                    continue
+                action = matches.pop()
+                if not sep:
+                    value = following
+            elif arg[:2] in known:
+                action, value = known[arg[:2]], arg[2:]
+                if action.nargs == 0:
+                    # Combined single character flags, such as -vf
+                    return None
+            else:
+                complete = False
+                continue
+            if action.nargs != 0 and value is not None:
+                selected[action] = value
+        return selected, complete
+
+    def parse_known_args(  # type: ignore[override]
+        self,
+        args: Sequence[str] | None = None,
+        namespace: argparse.Namespace | None = None,
+    ) -> tuple[argparse.Namespace, list[str]]:
+        if not self._deferred_arguments:
+            return super().parse_known_args(args, namespace)
+        with self._deferred_lock:
+            args = sys.argv[1:] if args is None else list(args)
+            found = self._select_deferred(args)
+            if found is not None:
+                selected, complete = found
+                for deferred in list(self._deferred_arguments):
+                    value = selected.get(
+                        deferred.selector, deferred.selector.default
+                    )
+                    if value == deferred.choice:
+                        self._add_deferred(deferred)
+                if not complete:
+                    # The unknown options may belong to the arguments just
+                    # added, otherwise they may belong to the others.
+                    found = self._select_deferred(args)
+            if found is None or not found[1]:
+                self.add_all_deferred_arguments()
+            return super().parse_known_args(args, namespace)
+
+    def format_usage(self) -> str:
+        self.add_all_deferred_arguments()
+        return super().format_usage()
+
+    def format_help(self) -> str:
+        self.add_all_deferred_arguments()
+        return super().format_help()
+
     # NOTE(dhellmann): We have to override the methods for creating
     # groups to return our objects that know how to deal with the
     # special conflict handler.
@@ -0,0 +1,115 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+"""Helpers for consuming asynchronous data from synchronous code."""
+
+from collections.abc import AsyncIterable, Generator
+import inspect
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    import asyncio
+
+_T = TypeVar('_T')
+
+_ITEM = object()
+_END = object()
+_ERROR = object()
+
+
+async def resolve(value: Any) -> Any:
+    """Await the value if it is awaitable, otherwise return it."""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def iterate_in_loop(
+    aiterable: AsyncIterable[_T],
+    loop: 'asyncio.AbstractEventLoop',
+    prefetch: int = 1,
+) -> Generator[_T, None, None]:
+    """Iterate over an async iterable from outside of its event loop.
+
+    The items are fetched by a task running on ``loop``, which must be
+    running in another thread. Up to ``prefetch`` items are fetched ahead of
+    the consumer, so that fetching the next items overlaps with processing
+    the current ones. Closing the returned iterator early cancels the task
+    and closes the async iterable, if it supports it.
+    """
+    # Deferred, as asyncio is a slow import only needed by async commands
+    import asyncio
+
+    items: queue.SimpleQueue[tuple[object, Any]] = queue.SimpleQueue()
+    slots = asyncio.Semaphore(max(prefetch, 1))
+    done = threading.Event()
+
+    async def fetch() -> None:
+        iterator = aiter(aiterable)
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    item = await anext(iterator)
+                except StopAsyncIteration:
+                    items.put((_END, None))
+                    return
+                items.put((_ITEM, item))
+        except BaseException as err:
+            items.put((_ERROR, err))
+            raise
+        finally:
+            try:
+                aclose = getattr(iterator, 'aclose', None)
+                if aclose is not None:
+                    await aclose()
+            finally:
+                done.set()
+
+    future = asyncio.run_coroutine_threadsafe(fetch(), loop)
+    try:
+        while True:
+            kind, value = items.get()
+            if kind is _END:
+                return
+            if kind is _ERROR:
+                raise value
+            loop.call_soon_threadsafe(slots.release)
+            yield value
+    finally:
+        if not done.is_set():
+            future.cancel()
+            done.wait()
+
+
+def iterate_in_thread(
+    aiterable: AsyncIterable[_T], prefetch: int = 1
+) -> Generator[_T, None, None]:
+    """Iterate over an async iterable using an event loop in a new thread.
+
+    See :func:`iterate_in_loop` for the meaning of ``prefetch``.
+    """
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(
+        target=loop.run_forever, name='cliff-async-rows', daemon=True
+    )
+    thread.start()
+    try:
+        yield from iterate_in_loop(aiterable, loop, prefetch)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
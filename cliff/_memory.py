@@ -0,0 +1,161 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+"""Profile the memory allocated by the phases of a command."""
+
+from collections.abc import Iterator
+import contextlib
+import contextvars
+import fnmatch
+import sys
+import tracemalloc
+from typing import NamedTuple, TextIO
+
+_profiler: contextvars.ContextVar['Profiler | None'] = contextvars.ContextVar(
+    'profiler', default=None
+)
+
+# The allocations of the profiler and of the import system are not those of
+# the command.
+_FILTERS = [
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, contextlib.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+]
+
+
+class _Phase(NamedTuple):
+    name: str
+    # Highest memory traced during the phase, above that traced before it.
+    peak: int
+    # Memory allocated during the phase and still traced at its end.
+    allocated: int
+    top: list[tracemalloc.StatisticDiff]
+
+
+def _format_size(size: int) -> str:
+    if abs(size) < 1024:
+        return f'{size} B'
+    value = size / 1024
+    for unit in ('KiB', 'MiB'):
+        if abs(value) < 1024:
+            return f'{value:.1f} {unit}'
+        value /= 1024
+    return f'{value:.1f} GiB'
+
+
+def _peak_rss() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere.
+    return int(rss if sys.platform == 'darwin' else rss * 1024)
+
+
+class Profiler:
+    """Trace the memory allocated by each phase of a command.
+
+    The phases of the command run while :meth:`tracing` are recorded:
+    ``take_action``, and for :class:`cliff.lister.Lister` and
+    :class:`cliff.show.ShowOne` the ``sort``, ``columns`` and ``formatter``
+    phases of their output. Phases run inside another phase are part of it.
+
+    :param limit: the number of allocation sites reported for each phase
+    """
+
+    def __init__(self, limit: int = 5) -> None:
+        self.limit = limit
+        self.phases: list[_Phase] = []
+        self.peak = 0
+        self._in_phase = False
+
+    @contextlib.contextmanager
+    def tracing(self) -> Iterator['Profiler']:
+        """Record the phases run in this context."""
+        # Compile the patterns of the filters before tracing, not during the
+        # first phase.
+        for trace_filter in _FILTERS:
+            fnmatch.fnmatch('', trace_filter.filename_pattern)
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        token = _profiler.set(self)
+        try:
+            yield self
+        finally:
+            _profiler.reset(token)
+            if started:
+                tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record the memory allocated in this context as a phase."""
+        if self._in_phase or not tracemalloc.is_tracing():
+            yield
+            return
+        self._in_phase = True
+        before = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            self._in_phase = False
+            diffs = [
+                diff
+                for diff in after.compare_to(before, 'lineno')
+                if diff.size_diff > 0
+            ]
+            diffs.sort(key=lambda diff: diff.size_diff, reverse=True)
+            self.phases.append(
+                _Phase(
+                    name, peak - start, current - start, diffs[: self.limit]
+                )
+            )
+            self.peak = max(self.peak, peak)
+
+    def report(self, stream: TextIO, title: str) -> None:
+        """Write the memory allocated by each phase recorded so far."""
+        lines = [f'memory profile of {title!r}:']
+        for phase in self.phases:
+            lines.append(
+                f'  {phase.name}: peak {_format_size(phase.peak)}, '
+                f'allocated {_format_size(phase.allocated)}'
+            )
+            for diff in phase.top:
+                frame = diff.traceback[0]
+                lines.append(
+                    f'    {frame.filename}:{frame.lineno}: '
+                    f'{_format_size(diff.size_diff)} in '
+                    f'{diff.count_diff} blocks'
+                )
+        summary = f'  peak traced memory {_format_size(self.peak)}'
+        rss = _peak_rss()
+        if rss is not None:
+            summary += f', peak RSS of the process {_format_size(rss)}'
+        lines.append(summary)
+        stream.write(''.join(f'{line}\n' for line in lines))
+
+
+def phase(name: str) -> contextlib.AbstractContextManager[None]:
+    """Record the memory allocated in this context when profiling."""
+    profiler = _profiler.get()
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.phase(name)
@@ -13,20 +13,37 @@
 """Application base class."""
 
 import argparse
+import collections
+from collections.abc import (
+    Callable,
+    Coroutine,
+    Generator,
+    Iterable,
+    Iterator,
+)
+import contextlib
+import contextvars
 import inspect
+import io
 import locale
 import logging
 import logging.handlers
 import os
+import shlex
+import signal
 import sys
-from typing import TYPE_CHECKING, Any, TextIO
+import threading
+import types
+from typing import TYPE_CHECKING, Any, BinaryIO, TextIO, TypeVar, cast
 
 from cliff import _argparse
+from cliff import _memory
 from . import complete
 from . import help
-from . import utils
 
 if TYPE_CHECKING:
+    import asyncio
+
     from . import command as _command
     from . import commandmanager as _commandmanager
     from . import interactive as _interactive
@@ -38,6 +55,118 @@ logging.getLogger('cliff').addHandler(logging.NullHandler())
 _SIGINT_EXIT = 130
 _SIGPIPE_EXIT = 141
 
+_T = TypeVar('_T')
+
+
+class _Terminated(SystemExit):
+    """Raised by the SIGTERM handler of :meth:`App.serve`.
+
+    Unlike other exits, it must not be turned into the exit code of a
+    forwarded or batch command, but stop the daemon.
+    """
+
+
+def _terminate(signum: int, frame: types.FrameType | None) -> None:
+    raise _Terminated(128 + signum)
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f'invalid positive integer: {value!r}'
+        )
+    return number
+
+
+def _exit_code(ex: SystemExit) -> int:
+    if ex.code is None or isinstance(ex.code, int):
+        return ex.code or 0
+    return 1
+
+
+def _buffered_output(stream: TextIO, buffer_size: int) -> TextIO | None:
+    # Return a text stream writing to the file of the stream in blocks of
+    # the given size, unless it is a terminal or has no file.
+    try:
+        fileno = stream.fileno()
+        if stream.isatty():
+            return None
+    except (AttributeError, OSError, ValueError):
+        return None
+    stream.flush()
+    buffer = io.BufferedWriter(
+        io.FileIO(fileno, 'w', closefd=False), buffer_size
+    )
+    return io.TextIOWrapper(
+        buffer,
+        encoding=getattr(stream, 'encoding', None),
+        errors=getattr(stream, 'errors', None),
+    )
+
+
+class _ThreadBufferedStream:
+    """Output stream sending writes from capturing threads to a buffer.
+
+    Writes from threads that are not capturing output go to the wrapped
+    stream. The binary buffer of a capturing thread, used by formatters
+    writing bytes, is the one holding its output, so that binary and text
+    output are kept in order. All other attributes are those of the
+    wrapped stream.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._encoding = getattr(stream, 'encoding', None) or 'utf-8'
+        self._errors = getattr(stream, 'errors', None) or 'surrogatepass'
+        # A context variable rather than a thread local, so that the threads
+        # started with asyncio.to_thread() by async commands write to the
+        # buffer of the command too.
+        self._buffer: contextvars.ContextVar[io.BytesIO | None] = (
+            contextvars.ContextVar('buffer', default=None)
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+    @property
+    def buffer(self) -> BinaryIO:
+        buffer = self._buffer.get()
+        if buffer is None:
+            return self._stream.buffer
+        return buffer
+
+    def write(self, s: str) -> int:
+        buffer = self._buffer.get()
+        if buffer is None:
+            return self._stream.write(s)
+        # Text is encoded as it is written, so that it comes before any
+        # bytes written next.
+        buffer.write(s.encode(self._encoding, self._errors))
+        return len(s)
+
+    def capture(self, func: Callable[..., _T], *args: Any) -> tuple[_T, bytes]:
+        """Call a function and return its result and buffered output."""
+        buffer = io.BytesIO()
+        token = self._buffer.set(buffer)
+        try:
+            result = func(*args)
+        finally:
+            self._buffer.reset(token)
+        return result, buffer.getvalue()
+
+    def write_captured(self, output: bytes) -> None:
+        """Write output returned by capture() to the wrapped stream."""
+        buffer = getattr(self._stream, 'buffer', None)
+        if buffer is None:
+            self._stream.write(output.decode(self._encoding, self._errors))
+            return
+        self._stream.flush()
+        buffer.write(output)
+
 
 class App:
     """Application base class.
@@ -60,6 +189,31 @@ class App:
     :param deferred_help: True - Allow subcommands to accept --help with
                           allowing to defer help print after initialize_app
     :paramtype deferred_help: bool
+    :param cache_parsers: True - Reuse the argument parser built for a
+                          command class when the same command is run again
+                          with the same program name and hooks
+    :paramtype cache_parsers: bool
+    :param batch_mode: True - Add the --batch option, which runs the commands
+                       read from a file or standard input, one per line,
+                       after initialize_app
+    :paramtype batch_mode: bool
+    :param daemon_mode: True - Add the --daemon option, which serves the
+                        commands forwarded by :func:`cliff.daemon.forward`
+                        on a Unix socket after initialize_app
+    :paramtype daemon_mode: bool
+    :param memory_profiling: True - Add the --profile-memory option, which
+                             reports the memory allocated by each phase of
+                             the commands run
+    :paramtype memory_profiling: bool
+    :param output_buffer_size: Size in bytes of the blocks written to the
+                               standard output when it is neither given nor
+                               a terminal, rather than the small strings
+                               written by the formatters. None - Use
+                               sys.stdout as it is
+    :paramtype output_buffer_size: int
+    :param pager_option: True - Add the --pager option to the list and show
+                         commands, which shows their output in a pager
+    :paramtype pager_option: bool
     """
 
     NAME = os.path.splitext(os.path.basename(sys.argv[0]))[0]
@@ -85,17 +239,34 @@ class App:
         interactive_app_factory: type['_interactive.InteractiveApp']
         | None = None,
         deferred_help: bool = False,
+        cache_parsers: bool = False,
+        batch_mode: bool = False,
+        daemon_mode: bool = False,
+        memory_profiling: bool = False,
+        output_buffer_size: int | None = None,
+        pager_option: bool = False,
     ) -> None:
         """Initialize the application."""
         self.command_manager = command_manager
         self.command_manager.add_command('help', help.HelpCommand)
         self.command_manager.add_command('complete', complete.CompleteCommand)
+        self.output_buffer_size = output_buffer_size
+        self._buffered_stdout: TextIO | None = None
         self._set_streams(stdin, stdout, stderr)
         self.interactive_app_factory = interactive_app_factory
         self.deferred_help = deferred_help
+        self.batch_mode = batch_mode
+        self.daemon_mode = daemon_mode
+        self.memory_profiling = memory_profiling
+        self.pager_option = pager_option
         self.parser = self.build_option_parser(description, version)
         self.interactive_mode = False
         self.interpreter: _interactive.InteractiveApp | None = None
+        self._parser_cache: dict[Any, argparse.ArgumentParser] | None = None
+        self._event_loop_runner: asyncio.Runner | None = None
+        self._cmd_name_factories: dict[type[_command.Command], bool] = {}
+        if cache_parsers:
+            self._parser_cache = {}
 
     def _set_streams(
         self,
@@ -138,6 +309,17 @@ class App:
         self.stdout = stdout or sys.stdout
         self.stderr = stderr or sys.stderr
 
+        # Formatters write many small strings, a row or a field at a time,
+        # which cost a system call each when sys.stdout is unbuffered or
+        # line buffered. They can share a larger buffer instead, flushed
+        # when the application exits, see _flush_output().
+        if stdout is None and self.output_buffer_size:
+            self._buffered_stdout = _buffered_output(
+                sys.stdout, self.output_buffer_size
+            )
+            if self._buffered_stdout is not None:
+                self.stdout = self._buffered_stdout
+
     def build_option_parser(
         self,
         description: str | None,
@@ -212,6 +394,61 @@ class App:
             action='store_true',
             help='Show tracebacks on errors.',
         )
+        if self.batch_mode:
+            parser.add_argument(
+                '--batch',
+                metavar='<file>',
+                default=None,
+                help=(
+                    'Run the commands read from a file, one per line. '
+                    'Use "-" to read the commands from standard input.'
+                ),
+            )
+            parser.add_argument(
+                '--batch-errexit',
+                default=False,
+                action='store_true',
+                help='Stop running batch commands after the first failure.',
+            )
+            parser.add_argument(
+                '--batch-workers',
+                metavar='<n>',
+                default=1,
+                type=_positive_int,
+                help=(
+                    'Number of batch commands to run concurrently '
+                    '(default: 1).'
+                ),
+            )
+        if self.daemon_mode:
+            parser.add_argument(
+                '--daemon',
+                metavar='<socket>',
+                default=None,
+                help=(
+                    'Stay resident and run the commands forwarded to the '
+                    'Unix socket at this path.'
+                ),
+            )
+            parser.add_argument(
+                '--daemon-fork',
+                default=False,
+                action='store_true',
+                help=(
+                    'Run each command forwarded to the daemon in a new '
+                    'child process, so that commands run concurrently.'
+                ),
+            )
+        if self.memory_profiling:
+            parser.add_argument(
+                '--profile-memory',
+                default=False,
+                action='store_true',
+                help=(
+                    'Report the memory allocated by each phase of the '
+                    'command on standard error.'
+                ),
+            )
         return parser
 
     def configure_logging(self) -> None:
@@ -260,11 +497,48 @@ class App:
         :param argv: input arguments and options
         :paramtype argv: list of str
         """
+        try:
+            result = self._run(argv)
+        finally:
+            self._close_event_loop()
+        return self._flush_output(result)
 
+    def _flush_output(self, result: int) -> int:
+        # Write out what is left in the buffer of the standard output, if
+        # any, and return the exit code.
+        stream = self._buffered_stdout
+        if stream is None:
+            return result
+        try:
+            if result != _SIGPIPE_EXIT:
+                stream.flush()
+                return result
+        except BrokenPipeError:
+            result = _SIGPIPE_EXIT
+        # The reader is gone, so the buffer can never be written, not even
+        # when the interpreter exits, which would print a traceback.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        try:
+            os.dup2(devnull, stream.fileno())
+        finally:
+            os.close(devnull)
+        return result
+
+    def _run(self, argv: list[str]) -> int:
         try:
             self.options, remainder = self.parser.parse_known_args(argv)
             self.configure_logging()
-            self.interactive_mode = not remainder
+            batch_file = getattr(self.options, 'batch', None)
+            daemon_socket = getattr(self.options, 'daemon', None)
+            if batch_file and remainder:
+                self.parser.error('--batch cannot be combined with a command')
+            if daemon_socket and (remainder or batch_file):
+                self.parser.error(
+                    '--daemon cannot be combined with a command or --batch'
+                )
+            self.interactive_mode = not (
+                remainder or batch_file or daemon_socket
+            )
             if self.deferred_help and self.options.deferred_help and remainder:
                 # When help is requested and `remainder` has any values disable
                 # `deferred_help` and instead allow the help subcommand to
@@ -299,7 +573,14 @@ class App:
             self.interact()
         else:
             try:
-                result = self.run_subcommand(remainder)
+                if daemon_socket:
+                    result = self.serve(
+                        daemon_socket, fork=self.options.daemon_fork
+                    )
+                elif batch_file:
+                    result = self._run_batch_file(batch_file)
+                else:
+                    result = self.run_subcommand(remainder)
             except BrokenPipeError:
                 return _SIGPIPE_EXIT
             except KeyboardInterrupt:
@@ -343,6 +624,33 @@ class App:
         """
         return
 
+    def run_coroutine(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """Run a coroutine to completion and return its result.
+
+        Coroutines run from the main thread share an event loop, which is
+        kept for the lifetime of :meth:`run` so that resources created by one
+        command, or by :meth:`initialize_app`, can be used by the next.
+        Coroutines run from other threads get an event loop of their own.
+
+        :param coro: coroutine to run
+        """
+        # Defer importing asyncio as it is a slow import only needed by
+        # async commands
+        import asyncio
+
+        context = contextvars.copy_context()
+        if threading.current_thread() is not threading.main_thread():
+            with asyncio.Runner() as runner:
+                return runner.run(coro, context=context)
+        if self._event_loop_runner is None:
+            self._event_loop_runner = asyncio.Runner()
+        return self._event_loop_runner.run(coro, context=context)
+
+    def _close_event_loop(self) -> None:
+        if self._event_loop_runner is not None:
+            self._event_loop_runner.close()
+            self._event_loop_runner = None
+
     def interact(self) -> None:
         # Defer importing .interactive as cmd2 is a slow import
         from .interactive import InteractiveApp
@@ -358,47 +666,300 @@ class App:
             self.stdin,
             self.stdout,
         )
-        self.interpreter.cmdloop()
+        parser_cache = self._parser_cache
+        if parser_cache is None and self.interpreter.cache_parsers:
+            self._parser_cache = {}
+        try:
+            self.interpreter.cmdloop()
+        finally:
+            self._parser_cache = parser_cache
 
     def get_fuzzy_matches(self, cmd: str) -> list[str]:
         """return fuzzy matches of unknown command"""
+        return self.command_manager.get_fuzzy_matches(cmd)
 
-        sep = '_'
-        if self.command_manager.convert_underscores:
-            sep = ' '
-        all_cmds = [k[0] for k in self.command_manager]
-        dist = []
-        for candidate in sorted(all_cmds):
-            prefix = candidate.split(sep)[0]
-            # Give prefix match a very good score
-            if candidate.startswith(cmd):
-                dist.append((0, candidate))
-                continue
-            # Levenshtein distance
-            dist.append(
-                (
-                    utils.damerau_levenshtein(cmd, prefix, utils.COST) + 1,
-                    candidate,
-                )
+    def get_command_parser(
+        self, cmd: '_command.Command', prog_name: str
+    ) -> argparse.ArgumentParser:
+        """Return the argument parser for a command.
+
+        If parser caching was enabled when the application was created, the
+        parser built for the first instance of a command class is reused for
+        later instances with the same program name and set of hooks.
+        Commands whose parser depends on per-instance state should not be
+        used with parser caching.
+
+        :param cmd: command processor being invoked
+        :paramtype cmd: cliff.command.Command
+        :param prog_name: program name to use in usage and help messages
+        :paramtype prog_name: str
+        """
+        if self._parser_cache is None:
+            return cmd.get_parser(prog_name)
+        # Hooks can add arguments to the parser, so a change in the set of
+        # hooks loaded for a command must result in a new parser.
+        hook_names = tuple(h.name for h in getattr(cmd, '_hooks', []))
+        key = (type(cmd), prog_name, hook_names)
+        parser = self._parser_cache.get(key)
+        if parser is None:
+            parser = cmd.get_parser(prog_name)
+            self._parser_cache[key] = parser
+        return parser
+
+    def _run_batch_file(self, batch_file: str) -> int:
+        errexit = self.options.batch_errexit
+        workers = self.options.batch_workers
+        if batch_file == '-':
+            return self.run_batch(self.stdin, errexit, workers)
+        try:
+            stream = open(batch_file)
+        except OSError as err:
+            self.LOG.error('Could not read batch file: %s', err)
+            return 1
+        with stream:
+            return self.run_batch(stream, errexit, workers)
+
+    def run_batch(
+        self,
+        lines: Iterable[str],
+        errexit: bool = False,
+        workers: int = 1,
+    ) -> int:
+        """Run a series of commands with the initialized application.
+
+        Each line holds one command line, split using shell-like syntax.
+        Blank lines and comments starting with ``#`` are skipped. Failing
+        lines are reported with their exit code.
+
+        With more than one worker, commands are run concurrently in a pool
+        of threads. The output each command writes to ``self.stdout`` is
+        buffered and written out in the order of the input lines. Commands,
+        ``prepare_to_run_command()`` and ``clean_up()`` must be thread-safe
+        to be run this way. With ``errexit``, no command is started once a
+        command has failed, but the commands which were already running
+        alongside it, at most ``workers - 1`` of them, run to completion.
+
+        :param lines: command lines to run
+        :paramtype lines: iterable of str
+        :param errexit: stop at the first command that fails
+        :paramtype errexit: bool
+        :param workers: number of commands to run concurrently
+        :paramtype workers: int
+        :returns: the exit code of the first failing command, or 0
+        """
+        if workers < 1:
+            raise ValueError(f'Invalid number of batch workers: {workers}')
+        commands = self._parse_batch_lines(lines)
+        if workers > 1:
+            results = self._run_batch_parallel(commands, workers, errexit)
+        else:
+            results = (
+                (lineno, line, self._run_batch_command(argv) if argv else 2)
+                for lineno, line, argv in commands
             )
+        result = 0
+        with contextlib.closing(results):
+            for lineno, line, ret in results:
+                if not ret:
+                    self.LOG.debug('line %d: %r exited with 0', lineno, line)
+                    continue
+                self.LOG.error('line %d: %r exited with %d', lineno, line, ret)
+                result = result or ret
+                if errexit:
+                    break
+        return result
+
+    def _parse_batch_lines(
+        self, lines: Iterable[str]
+    ) -> Iterator[tuple[int, str, list[str] | None]]:
+        for lineno, line in enumerate(lines, 1):
+            line = line.strip()
+            try:
+                argv = shlex.split(line, comments=True)
+            except ValueError as err:
+                self.LOG.error('line %d: %s', lineno, err)
+                yield lineno, line, None
+                continue
+            if argv:
+                yield lineno, line, argv
+
+    def _run_batch_parallel(
+        self,
+        commands: Iterable[tuple[int, str, list[str] | None]],
+        workers: int,
+        errexit: bool = False,
+    ) -> Generator[tuple[int, str, int], None, None]:
+        import concurrent.futures
+
+        stdout = self.stdout
+        buffered = _ThreadBufferedStream(stdout)
+        self.stdout = cast(TextIO, buffered)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        pending: collections.deque[
+            tuple[
+                int,
+                str,
+                concurrent.futures.Future[tuple[int, bytes] | None] | None,
+            ]
+        ] = collections.deque()
+        # Bound the number of commands read ahead of the output. With
+        # errexit, a command is only submitted when a worker is free for it,
+        # and none is started once a command has failed.
+        window = workers if errexit else 2 * workers
+        failed = threading.Event()
 
-        matches = []
-        match_distance = 0
-        for distance, candidate in sorted(dist):
-            if distance > match_distance:
-                if match_distance:
-                    # we copied all items with minimum distance, we are done
+        def run(argv: list[str]) -> tuple[int, bytes] | None:
+            if failed.is_set():
+                return None
+            ret, output = buffered.capture(self._run_batch_command, argv)
+            if ret and errexit:
+                failed.set()
+            return ret, output
+
+        def finish() -> tuple[int, str, int] | None:
+            lineno, line, future = pending.popleft()
+            if future is None:
+                return lineno, line, 2
+            result = future.result()
+            if result is None:
+                # Skipped after an earlier command failed
+                return None
+            ret, output = result
+            buffered.write_captured(output)
+            return lineno, line, ret
+
+        try:
+            for lineno, line, argv in commands:
+                while len(pending) >= window and not failed.is_set():
+                    if (result := finish()) is not None:
+                        yield result
+                if failed.is_set():
                     break
-                # we copied all items with distance=0,
-                # now we match all candidates at the minimum distance
-                match_distance = distance
-            matches.append(candidate)
+                future = None
+                if argv:
+                    future = executor.submit(run, argv)
+                elif errexit:
+                    failed.set()
+                pending.append((lineno, line, future))
+            while pending:
+                if (result := finish()) is not None:
+                    yield result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.stdout = stdout
 
-        return matches
+    def _run_batch_command(self, argv: list[str]) -> int:
+        try:
+            return self.run_subcommand(argv)
+        except _Terminated:
+            raise
+        except SystemExit as ex:
+            # Argument parsing errors exit, but must not end the batch.
+            return _exit_code(ex)
+
+    def preload(self) -> None:
+        """Import the command and formatter plugins ahead of time.
+
+        :meth:`serve` calls this before accepting commands, so that the
+        commands run without importing anything, and processes forked to
+        run them share the imported modules. Override
+        :meth:`cliff.commandmanager.CommandManager.is_preload_safe` to leave
+        out commands which must not be imported early.
+        """
+        # Deferred as cliff.display imports this module
+        from . import display
+
+        self.command_manager.preload()
+        display.preload_formatters()
+
+    def serve(self, socket_path: str, fork: bool = False) -> int:
+        """Run the commands forwarded to a Unix socket until interrupted.
+
+        Each command is run by this application, which has already been
+        initialized, with the arguments, working directory, environment
+        and standard streams of the :func:`cliff.daemon.forward` call that
+        sent it. Commands are run one at a time, unless ``fork`` is set.
+
+        :param socket_path: path of the Unix socket to listen on
+        :paramtype socket_path: str
+        :param fork: run each command in a new child process
+        :paramtype fork: bool
+        """
+        # Deferred as only the daemon needs it
+        from . import daemon
+
+        self.preload()
+        server_class = (
+            daemon.ForkingDaemonServer if fork else daemon.DaemonServer
+        )
+        with contextlib.ExitStack() as stack:
+            if threading.current_thread() is threading.main_thread():
+                # Remove the socket when terminated, not only when
+                # interrupted.
+                handler = signal.signal(signal.SIGTERM, _terminate)
+                stack.callback(signal.signal, signal.SIGTERM, handler)
+            server = stack.enter_context(server_class(self, socket_path))
+            self.LOG.debug('serving commands on %s', socket_path)
+            server.serve_forever()
+        return 0
+
+    def _run_forwarded(self, argv: list[str]) -> int:
+        # Run a command line received by the daemon, once the streams,
+        # environment and working directory of the client are in place.
+        try:
+            self.options, remainder = self.parser.parse_known_args(argv)
+            self.configure_logging()
+            batch_file = getattr(self.options, 'batch', None)
+            if getattr(self.options, 'daemon', None):
+                self.parser.error('--daemon cannot be forwarded')
+            if batch_file and remainder:
+                self.parser.error('--batch cannot be combined with a command')
+            if self.deferred_help and self.options.deferred_help:
+                if not remainder:
+                    self.print_help_if_requested()
+                self.options.deferred_help = False
+                remainder.insert(0, 'help')
+            if batch_file:
+                return self._run_batch_file(batch_file)
+            if not remainder:
+                self.parser.error('interactive mode cannot be forwarded')
+            return self.run_subcommand(remainder)
+        except _Terminated:
+            # The daemon itself is being terminated.
+            raise
+        except SystemExit as ex:
+            return _exit_code(ex)
+        except BrokenPipeError:
+            return _SIGPIPE_EXIT
+        except KeyboardInterrupt:
+            return _SIGINT_EXIT
+        except Exception as err:
+            if self.options.debug:
+                self.LOG.exception(err)
+            else:
+                self.LOG.error(err)
+            return 1
+
+    def _find_command(
+        self, argv: list[str]
+    ) -> tuple[type['_command.Command'], str, list[str]]:
+        if self.interactive_mode and self.interpreter is not None:
+            # Reuse the commands found earlier in the session.
+            return self.interpreter.find_command(argv)
+        return self.command_manager.find_command(argv)
+
+    def _accepts_cmd_name(self, cmd_factory: type['_command.Command']) -> bool:
+        accepts = self._cmd_name_factories.get(cmd_factory)
+        if accepts is None:
+            args = inspect.getfullargspec(cmd_factory.__init__).args
+            accepts = self._cmd_name_factories[cmd_factory] = (
+                'cmd_name' in args
+            )
+        return accepts
 
     def run_subcommand(self, argv: list[str]) -> int:
         try:
-            subcommand = self.command_manager.find_command(argv)
+            subcommand = self._find_command(argv)
         except ValueError as exc:
             # If there was no exact match, try to find a fuzzy match
             the_cmd = argv[0]
@@ -429,7 +990,7 @@ class App:
 
         cmd_factory, cmd_name, sub_argv = subcommand
         kwargs = {}
-        if 'cmd_name' in inspect.getfullargspec(cmd_factory.__init__).args:
+        if self._accepts_cmd_name(cmd_factory):
             kwargs['cmd_name'] = cmd_name
         cmd = cmd_factory(self, self.options, **kwargs)
         result = 1
@@ -441,7 +1002,7 @@ class App:
                 if self.interactive_mode
                 else ' '.join([self.NAME, cmd_name])
             )
-            cmd_parser = cmd.get_parser(full_name)
+            cmd_parser = self.get_command_parser(cmd, full_name)
             try:
                 parsed_args = cmd_parser.parse_args(sub_argv)
             except SystemExit as ex:
@@ -452,7 +1013,15 @@ class App:
                     raise cmd2.exceptions.Cmd2ArgparseError from ex
                 else:
                     raise ex
-            result = cmd.run(parsed_args)
+            if getattr(self.options, 'profile_memory', False):
+                profiler = _memory.Profiler()
+                try:
+                    with profiler.tracing():
+                        result = cmd.run(parsed_args)
+                finally:
+                    profiler.report(self.stderr, cmd_name)
+            else:
+                result = cmd.run(parsed_args)
         except BrokenPipeError as err1:
             result = _SIGPIPE_EXIT
             err = err1
@@ -12,23 +12,50 @@
 
 import abc
 import argparse
+from collections.abc import Iterable
+import hashlib
 from importlib.metadata import packages_distributions
 import inspect
+import json
+import logging
+import os
+import sys
+import threading
 import types
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from stevedore import extension
 
 from cliff import _argparse
+from cliff import _async
+from cliff import _memory
 
 if TYPE_CHECKING:
     from . import app as _app
     from . import hooks
-    from typing import Never
+
+LOG = logging.getLogger(__name__)
 
 _T = TypeVar('_T')
 _dists_by_mods = None
 
+_hook_managers: dict[str, extension.ExtensionManager[Any]] = {}
+_hook_lock = threading.Lock()
+
+
+def _get_hook_manager(namespace: str) -> extension.ExtensionManager[Any]:
+    """Return the hook plugins of a command namespace, loading them once.
+
+    The hook classes are shared by all the instances of the commands, and
+    only instantiated for a command when its hooks are used.
+    """
+    with _hook_lock:
+        manager = _hook_managers.get(namespace)
+        if manager is None:
+            manager = extension.ExtensionManager(namespace=namespace)
+            _hook_managers[namespace] = manager
+        return manager
+
 
 def _get_distributions_by_modules() -> dict[str, str]:
     """Return dict mapping module name to distribution names.
@@ -40,12 +67,86 @@ def _get_distributions_by_modules() -> dict[str, str]:
     """
     global _dists_by_mods
     if _dists_by_mods is None:
-        # There can be multiple distribution in the case of namespace packages
-        # so we'll just grab the first one
-        _dists_by_mods = {k: v[0] for k, v in packages_distributions().items()}
+        _dists_by_mods = _load_distributions_by_modules()
     return _dists_by_mods
 
 
+def _get_cache_dir() -> str:
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(
+            os.path.join('~', '.cache')
+        )
+    return os.path.join(base, 'cliff')
+
+
+def _holds_distributions(path: str) -> bool:
+    # Whether the metadata of distributions is installed in a directory of
+    # the path, rather than only modules, as in the directory of a script.
+    if os.path.basename(path) in ('site-packages', 'dist-packages'):
+        return True
+    try:
+        with os.scandir(path or '.') as entries:
+            return any(
+                entry.name.endswith(('.dist-info', '.egg-info'))
+                for entry in entries
+            )
+    except OSError:
+        return False
+
+
+def _load_distributions_by_modules() -> dict[str, str]:
+    # Scanning the files of every installed distribution is slow, so the
+    # result is cached on disk. Installing or removing a distribution
+    # changes the modification time of the directory of the path holding
+    # it, and so the name of the cache file. The other directories of the
+    # path, whose files may change at any time, are left out.
+    path_values: list[tuple[str, float | None]] = []
+    for path in sys.path:
+        mtime = None
+        if _holds_distributions(path):
+            try:
+                mtime = os.path.getmtime(path or '.')
+            except OSError:
+                pass
+        path_values.append((path, mtime))
+    # The cache of each interpreter replaces its older ones.
+    prefix = hashlib.sha256(sys.executable.encode('utf-8')).hexdigest()[:16]
+    digest = hashlib.sha256(
+        json.dumps(path_values).encode('utf-8')
+    ).hexdigest()
+    cache_dir = _get_cache_dir()
+    filename = os.path.join(cache_dir, f'distributions-{prefix}-{digest}.json')
+    try:
+        with open(filename, encoding='utf-8') as f:
+            cached = json.load(f)
+        if isinstance(cached, dict):
+            return cached
+    except (OSError, ValueError):
+        pass
+    # There can be multiple distribution in the case of namespace packages
+    # so we'll just grab the first one
+    dists_by_mods = {k: v[0] for k, v in packages_distributions().items()}
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        temp = f'{filename}.{os.getpid()}'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(dists_by_mods, f)
+        os.replace(temp, filename)
+        for name in os.listdir(cache_dir):
+            if (
+                name.startswith(f'distributions-{prefix}-')
+                and name.endswith('.json')
+                and name != os.path.basename(filename)
+            ):
+                os.unlink(os.path.join(cache_dir, name))
+    except OSError:
+        # The cache cannot be written, it is only an optimization.
+        pass
+    return dists_by_mods
+
+
 def _get_distribution_for_module(
     module: types.ModuleType | None,
 ) -> str | None:
@@ -60,8 +161,8 @@ def _get_distribution_for_module(
 class Command(metaclass=abc.ABCMeta):
     """Base class for command plugins.
 
-    When the command is instantiated, it loads extensions from a
-    namespace based on the parent application namespace and the
+    When the hooks of the command are first used, it loads extensions
+    from a namespace based on the parent application namespace and the
     command name::
 
         app.namespace + '.' + cmd_name.replace(' ', '_')
@@ -89,30 +190,50 @@ class Command(metaclass=abc.ABCMeta):
         self.app = app
         self.app_args = app_args
         self.cmd_name = cmd_name
-        self._load_hooks()
+        self._loaded_hooks: (
+            Iterable[extension.Extension[hooks.CommandHook]] | None
+        ) = None
+
+    @property
+    def _hooks(self) -> Iterable[extension.Extension['hooks.CommandHook']]:
+        # Commands are instantiated to list them in the help or to complete
+        # them, so their hooks are only loaded once used.
+        if self._loaded_hooks is None:
+            self._load_hooks()
+        return self._loaded_hooks or []
+
+    @_hooks.setter
+    def _hooks(
+        self, value: Iterable[extension.Extension['hooks.CommandHook']]
+    ) -> None:
+        self._loaded_hooks = value
+
+    @_hooks.deleter
+    def _hooks(self) -> None:
+        self._loaded_hooks = None
 
     def _load_hooks(self) -> None:
         # Look for command extensions
-        if self.cmd_name:
-            namespace = '{}.{}'.format(
-                self.app.command_manager.namespace,
-                self.cmd_name.replace(' ', '_'),
-            )
-            self._hooks: (
-                extension.ExtensionManager[hooks.CommandHook] | list[Never]
-            )
-            self._hooks = extension.ExtensionManager(
-                namespace=namespace,
-                invoke_on_load=True,
-                invoke_kwds={
-                    'command': self,
-                },
-            )
-        else:
+        if not self.cmd_name:
             # Setting _hooks to an empty list allows iteration without
             # checking if there are hooks every time.
             self._hooks = []
-        return
+            return
+        namespace = '{}.{}'.format(
+            self.app.command_manager.namespace,
+            self.cmd_name.replace(' ', '_'),
+        )
+        loaded = []
+        for ext in _get_hook_manager(namespace):
+            try:
+                obj = ext.plugin(command=self)
+            except Exception as err:
+                LOG.error('Could not load %r: %s', ext.name, err)
+                continue
+            loaded.append(
+                extension.Extension(ext.name, ext.entry_point, ext.plugin, obj)
+            )
+        self._hooks = loaded
 
     def get_description(self) -> str:
         """Return the command description.
@@ -162,7 +283,8 @@ class Command(metaclass=abc.ABCMeta):
         """Return an :class:`argparse.ArgumentParser`."""
         parser = _argparse.ArgumentParser(
             description=self.get_description(),
-            epilog=self.get_epilog(),
+            # Only build the epilog when the help is shown
+            epilog=self.get_epilog,
             prog=prog_name,
             formatter_class=_argparse.SmartHelpFormatter,
             conflict_handler=self.conflict_handler,
@@ -193,7 +315,8 @@ class Command(metaclass=abc.ABCMeta):
         Return the value returned by :meth:`take_action` or 0.
         """
         parsed_args = self._run_before_hooks(parsed_args)
-        return_code = self.take_action(parsed_args) or 0
+        with _memory.phase('take_action'):
+            return_code = self.take_action(parsed_args) or 0
         return_code = self._run_after_hooks(parsed_args, return_code)
         return return_code
 
@@ -241,3 +364,69 @@ class Command(metaclass=abc.ABCMeta):
             if ret is not None:
                 return_code = ret
         return return_code
+
+
+class AsyncCommand(Command, metaclass=abc.ABCMeta):
+    """Base class for command plugins implemented as coroutines.
+
+    :meth:`take_action` is a coroutine, which the application runs to
+    completion on its event loop. The ``before()`` and ``after()`` methods
+    of hooks for async commands may also be coroutine functions.
+    """
+
+    @abc.abstractmethod
+    async def take_action(self, parsed_args: argparse.Namespace) -> Any:
+        """Override to do something useful.
+
+        The returned value will be returned by the program.
+        """
+
+    def run(self, parsed_args: argparse.Namespace) -> int:
+        """Invoked by the application when the command is run.
+
+        Runs :meth:`run_async` on the application event loop.
+        """
+        result: int = self.app.run_coroutine(self.run_async(parsed_args))
+        return result
+
+    async def run_async(self, parsed_args: argparse.Namespace) -> int:
+        """Coroutine wrapping :meth:`take_action` and the command hooks.
+
+        Developers creating new async command base classes should override
+        this method rather than :meth:`run`.
+
+        Return the value returned by :meth:`take_action` or 0.
+        """
+        parsed_args = await self._run_before_hooks_async(parsed_args)
+        with _memory.phase('take_action'):
+            return_code = await self.take_action(parsed_args) or 0
+        return_code = await self._run_after_hooks_async(
+            parsed_args, return_code
+        )
+        return return_code
+
+    async def _run_before_hooks_async(
+        self, parsed_args: argparse.Namespace
+    ) -> argparse.Namespace:
+        """Calls before() method of the hooks, awaiting coroutines."""
+        for hook in self._hooks:
+            if hook.obj is None:
+                continue
+            ret = await _async.resolve(hook.obj.before(parsed_args))
+            if ret is not None:
+                parsed_args = ret
+        return parsed_args
+
+    async def _run_after_hooks_async(
+        self, parsed_args: argparse.Namespace, result: _T
+    ) -> _T:
+        """Calls after() method of the hooks, awaiting coroutines."""
+        for hook in self._hooks:
+            if hook.obj is None:
+                continue
+            ret = await _async.resolve(
+                hook.obj.after(parsed_args, result)  # type: ignore[arg-type]
+            )
+            if ret is not None:
+                result = ret
+        return result
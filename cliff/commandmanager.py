@@ -12,6 +12,7 @@
 
 """Discover and lookup command plugins."""
 
+import bisect
 from collections.abc import Iterable, Iterator
 import importlib.metadata
 import logging
@@ -20,6 +21,7 @@ from typing import TypeAlias
 import stevedore
 
 from cliff import command
+from cliff import utils
 
 LOG = logging.getLogger(__name__)
 
@@ -38,6 +40,78 @@ def _get_commands_by_partial_name(
     return candidates
 
 
+class _FuzzyIndex:
+    """Command names indexed to find the closest ones to a mistyped name.
+
+    The names are scored on their first word, so the names sharing one are
+    scored once. The weighted Damerau-Levenshtein distance is not a metric,
+    a swap costs nothing and insertions cost less than deletions, so the
+    words cannot be arranged in a metric tree. Instead, they are grouped by
+    length, which bounds their distance from below, and scored in the order
+    of that bound until it exceeds the best distance found.
+    """
+
+    def __init__(self, names: Iterable[str], sep: str) -> None:
+        self.names = sorted(names)
+        self.names_by_word: dict[str, list[str]] = {}
+        for name in self.names:
+            self.names_by_word.setdefault(name.split(sep)[0], []).append(name)
+        self.words_by_length: dict[int, list[str]] = {}
+        for word in self.names_by_word:
+            self.words_by_length.setdefault(len(word), []).append(word)
+
+    def _min_distance(self, name: str, length: int) -> int:
+        # Changing the length of a name takes one insertion or deletion for
+        # each character added or removed.
+        if length >= len(name):
+            return (length - len(name)) * utils.COST['a']
+        return (len(name) - length) * utils.COST['d']
+
+    def find(self, name: str) -> list[str]:
+        """Return the names starting with a name, and the closest others."""
+        start = bisect.bisect_left(self.names, name)
+        end = start
+        while end < len(self.names) and self.names[end].startswith(name):
+            end += 1
+        prefixed = self.names[start:end]
+
+        best: int | None = None
+        closest: list[str] = []
+        lengths = sorted(
+            self.words_by_length,
+            key=lambda length: self._min_distance(name, length),
+        )
+        for length in lengths:
+            if best is not None and self._min_distance(name, length) > best:
+                break
+            # Only the words of names which are not prefixed by the name
+            words = [
+                word
+                for word in self.words_by_length[length]
+                if not all(
+                    candidate.startswith(name)
+                    for candidate in self.names_by_word[word]
+                )
+            ]
+            distances = utils.damerau_levenshtein_many(
+                name, words, utils.COST, best
+            )
+            for word, distance in zip(words, distances):
+                if distance is None:
+                    continue
+                others = [
+                    candidate
+                    for candidate in self.names_by_word[word]
+                    if not candidate.startswith(name)
+                ]
+                if best is None or distance < best:
+                    best = distance
+                    closest = others
+                elif distance == best:
+                    closest.extend(others)
+        return prefixed + sorted(closest)
+
+
 class EntryPointWrapper:
     """An entrypoint-like object.
 
@@ -90,6 +164,7 @@ class CommandManager:
         self.ignored_modules = ignored_modules or ()
 
         self.commands: dict[str, EntryPointT] = {}
+        self._fuzzy_index: tuple[tuple[str, ...], _FuzzyIndex] | None = None
         self._legacy: dict[str, str] = {}
         self.group_list: list[str] = []
         self._load_commands()
@@ -183,6 +258,23 @@ class CommandManager:
     ) -> None:
         self.commands[name] = EntryPointWrapper(name, command_class)
 
+    def get_fuzzy_matches(self, name: str) -> list[str]:
+        """Return the names of the commands close to an unknown name.
+
+        These are the commands whose name starts with ``name``, followed by
+        the commands whose first word is the closest to ``name``, as
+        measured by :func:`cliff.utils.damerau_levenshtein`. The index used
+        to find them is built once, and again when the commands change.
+
+        :param name: The unknown command name.
+        :type name: str
+        """
+        names = tuple(self.commands)
+        if self._fuzzy_index is None or self._fuzzy_index[0] != names:
+            sep = ' ' if self.convert_underscores else '_'
+            self._fuzzy_index = (names, _FuzzyIndex(names, sep))
+        return self._fuzzy_index[1].find(name)
+
     def add_legacy_command(self, old_name: str, new_name: str) -> None:
         """Map an old command name to the new name.
 
@@ -235,6 +327,47 @@ class CommandManager:
                 return i
         return len(argv)
 
+    def is_preload_safe(self, name: str, entry_point: EntryPointT) -> bool:
+        """Return whether a command may be imported by :meth:`preload`.
+
+        The default is to preload every command. Override this to leave out
+        commands whose modules must not be imported ahead of time, for
+        example because they start threads or open connections when they
+        are imported, which is not safe in a process that is going to fork.
+
+        :param name: The name of the command.
+        :param entry_point: The entry point of the command.
+        """
+        return True
+
+    def preload(self, names: Iterable[str] | None = None) -> list[str]:
+        """Import the modules of commands ahead of time.
+
+        Commands which are not safe to preload according to
+        :meth:`is_preload_safe`, and commands which cannot be imported,
+        are skipped.
+
+        :param names: The names of the commands to import. Defaults to all
+            the commands.
+        :returns: The names of the commands imported.
+        """
+        preloaded = []
+        for name in self.commands if names is None else names:
+            try:
+                entry_point = self.commands[name]
+            except KeyError:
+                raise ValueError(f'Unknown command {name!r}')
+            if not self.is_preload_safe(name, entry_point):
+                LOG.debug('not preloading command %r', name)
+                continue
+            try:
+                entry_point.load()
+            except Exception as err:
+                LOG.warning('could not preload command %r: %s', name, err)
+                continue
+            preloaded.append(name)
+        return preloaded
+
     def add_command_group(self, group: str | None = None) -> None:
         """Adds another group of command entrypoints"""
         if group:
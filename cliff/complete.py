@@ -19,6 +19,7 @@ from typing import TYPE_CHECKING, Any, TextIO
 
 import stevedore
 
+from cliff import _argparse
 from cliff import command as _command
 
 if TYPE_CHECKING:
@@ -229,6 +230,8 @@ class CompleteCommand(_command.Command):
         else:
             full_name = ' '.join([self.app.NAME, cmd_name])
         cmd_parser = cmd.get_parser(full_name)
+        if isinstance(cmd_parser, _argparse.ArgumentParser):
+            cmd_parser.add_all_deferred_arguments()
         return cmd_parser._get_optional_actions()
 
     def take_action(self, parsed_args: argparse.Namespace) -> int:
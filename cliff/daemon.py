@@ -0,0 +1,336 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+"""Run commands in a resident, already initialized application.
+
+An application started with ``--daemon <socket>`` listens on a Unix socket.
+:func:`forward` sends it a command line together with the working
+directory, the environment and the standard streams of the calling
+process, and returns the exit code of the command. The launcher only
+imports the standard library, so it starts much faster than the
+application itself::
+
+    python -m cliff.daemon <socket> [arg ...]
+
+The protocol is a 4 byte payload length sent along with the standard
+input, output and error file descriptors, followed by a JSON payload. The
+daemon replies with the 4 byte exit code of the command.
+"""
+
+from collections.abc import Sequence
+import contextlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import sys
+from typing import IO, TYPE_CHECKING, Any, TextIO, cast
+
+if TYPE_CHECKING:
+    from . import app as _app
+
+_HEADER = struct.Struct('!I')
+_EXIT = struct.Struct('!i')
+_STDIO_FDS = 3
+
+
+class DaemonUnavailable(OSError):
+    """No daemon is listening on the socket, so nothing was run."""
+
+
+def _recv_exactly(conn: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('connection closed by the other end')
+        data += chunk
+    return bytes(data)
+
+
+def _peer_uid(conn: socket.socket) -> int | None:
+    if not hasattr(socket, 'SO_PEERCRED'):
+        # Only the file permissions of the socket protect it.
+        return None
+    creds = struct.Struct('3i')
+    _pid, uid, _gid = creds.unpack(
+        conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, creds.size)
+    )
+    return int(uid)
+
+
+def _close(stream: IO[Any]) -> None:
+    try:
+        stream.close()
+    except BrokenPipeError:
+        # The client stopped reading, what is left cannot be written.
+        pass
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    server: 'DaemonServer'
+
+    def handle(self) -> None:
+        self.server.handle_connection(self.request)
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serve the commands forwarded by :func:`forward` on a Unix socket.
+
+    Commands are run one at a time, because each of them changes state
+    shared by the whole process: the working directory, the environment
+    and the standard streams. The socket is only accessible to the user
+    running the daemon.
+
+    :param app: the initialized application running the commands
+    :param socket_path: path of the Unix socket to listen on
+    """
+
+    #: Seconds to wait for a client to send its command, so that a client
+    #: which connects and sends nothing does not block the daemon.
+    request_timeout = 10.0
+
+    def __init__(self, app: '_app.App', socket_path: str) -> None:
+        self.app = app
+        self._bound = False
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_bind(self) -> None:
+        path = cast(str, self.server_address)
+        if os.path.exists(path):
+            # Replace the socket left behind by a daemon that is gone, but
+            # never one which is still accepting connections.
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(path)
+                except ConnectionRefusedError:
+                    os.unlink(path)
+                else:
+                    raise OSError(f'a daemon is already listening on {path}')
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        self._bound = True
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self._bound:
+            self._bound = False
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(cast(str, self.server_address))
+
+    def verify_request(
+        self,
+        request: socket.socket | tuple[bytes, socket.socket],
+        client_address: Any,
+    ) -> bool:
+        uid = _peer_uid(cast(socket.socket, request))
+        return uid is None or uid == os.getuid()
+
+    def handle_connection(self, conn: socket.socket) -> None:
+        """Read a forwarded command from the connection and run it."""
+        conn.settimeout(self.request_timeout)
+        try:
+            msg, fds, _flags, _addr = socket.recv_fds(
+                conn, _HEADER.size, _STDIO_FDS
+            )
+        except TimeoutError:
+            self.app.LOG.warning('no daemon request received in time')
+            return
+        with contextlib.ExitStack() as stack:
+            for fd in fds:
+                stack.callback(os.close, fd)
+            if len(msg) != _HEADER.size or len(fds) != _STDIO_FDS:
+                self.app.LOG.warning('ignoring invalid daemon request')
+                return
+            (size,) = _HEADER.unpack(msg)
+            try:
+                request = json.loads(_recv_exactly(conn, size))
+            except TimeoutError:
+                self.app.LOG.warning('no daemon request received in time')
+                return
+            # The command itself may run for as long as it needs.
+            conn.settimeout(None)
+            encoding = request.get('encoding') or 'utf-8'
+            stdin = open(fds[0], encoding=encoding, closefd=False)
+            stack.callback(_close, stdin)
+            stdout = open(
+                fds[1],
+                'w',
+                buffering=1 if os.isatty(fds[1]) else -1,
+                encoding=encoding,
+                closefd=False,
+            )
+            stack.callback(_close, stdout)
+            stderr = open(
+                fds[2],
+                'w',
+                buffering=1,
+                encoding=encoding,
+                errors='backslashreplace',
+                closefd=False,
+            )
+            stack.callback(_close, stderr)
+            result = self.run_command(
+                request['argv'],
+                request['cwd'],
+                request['env'],
+                stdin,
+                stdout,
+                stderr,
+            )
+        conn.sendall(_EXIT.pack(result))
+
+    def run_command(
+        self,
+        argv: list[str],
+        cwd: str,
+        env: dict[str, str],
+        stdin: TextIO,
+        stdout: TextIO,
+        stderr: TextIO,
+    ) -> int:
+        """Run a forwarded command in the environment of the client.
+
+        The working directory, the environment, the standard streams and
+        the logging handlers of the process are replaced while the command
+        runs, and restored afterwards.
+        """
+        app = self.app
+        root_logger = logging.getLogger('')
+        saved_cwd = os.getcwd()
+        saved_env = dict(os.environ)
+        saved_handlers = root_logger.handlers[:]
+        saved_streams = (app.stdin, app.stdout, app.stderr)
+        saved_sys_streams = (sys.stdin, sys.stdout, sys.stderr)
+        saved_options = getattr(app, 'options', None)
+        try:
+            os.chdir(cwd)
+        except OSError as err:
+            stderr.write(f'{app.NAME}: {err}\n')
+            return 1
+        try:
+            os.environ.clear()
+            os.environ.update(env)
+            app.stdin, app.stdout, app.stderr = stdin, stdout, stderr
+            sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+            root_logger.handlers = []
+            return app._run_forwarded(argv)
+        finally:
+            for handler in root_logger.handlers:
+                if handler not in saved_handlers:
+                    handler.close()
+            root_logger.handlers = saved_handlers
+            sys.stdin, sys.stdout, sys.stderr = saved_sys_streams
+            app.stdin, app.stdout, app.stderr = saved_streams
+            if saved_options is not None:
+                app.options = saved_options
+            os.environ.clear()
+            os.environ.update(saved_env)
+            os.chdir(saved_cwd)
+
+
+class ForkingDaemonServer(socketserver.ForkingMixIn, DaemonServer):
+    """Serve each forwarded command in a new child process.
+
+    Commands run concurrently, each in a child forked from the daemon. The
+    children share the modules imported by the daemon, see
+    :meth:`cliff.app.App.preload`, until they write to them.
+    """
+
+    def finish_request(
+        self,
+        request: socket.socket | tuple[bytes, socket.socket],
+        client_address: Any,
+    ) -> None:
+        # The event loop of the daemon, if any, must not be used by the
+        # child: its selector is shared with the daemon.
+        self.app._event_loop_runner = None
+        super().finish_request(request, client_address)
+
+
+def forward(
+    socket_path: str,
+    argv: Sequence[str],
+    stdin: IO[Any] | None = None,
+    stdout: IO[Any] | None = None,
+    stderr: IO[Any] | None = None,
+) -> int:
+    """Run a command in the daemon listening on a Unix socket.
+
+    The command runs with the working directory and environment of the
+    calling process, and reads and writes its standard streams directly.
+
+    :param socket_path: path of the Unix socket of the daemon
+    :param argv: arguments and options of the command
+    :param stdin: standard input stream, defaults to ``sys.stdin``
+    :param stdout: standard output stream, defaults to ``sys.stdout``
+    :param stderr: standard error stream, defaults to ``sys.stderr``
+    :returns: the exit code of the command
+    :raises DaemonUnavailable: if no daemon accepts the connection
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    stdout.flush()
+    stderr.flush()
+    payload = json.dumps(
+        {
+            'argv': list(argv),
+            'cwd': os.getcwd(),
+            'env': dict(os.environ),
+            'encoding': getattr(stdout, 'encoding', None),
+        }
+    ).encode('utf-8')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        try:
+            conn.connect(socket_path)
+        except OSError as err:
+            raise DaemonUnavailable(
+                err.errno, f'no daemon on {socket_path}: {err.strerror}'
+            ) from err
+        socket.send_fds(
+            conn,
+            [_HEADER.pack(len(payload))],
+            [stream.fileno() for stream in (stdin, stdout, stderr)],
+        )
+        conn.sendall(payload)
+        (result,) = _EXIT.unpack(_recv_exactly(conn, _EXIT.size))
+    return int(result)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Forward a command line to a daemon and return its exit code."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        sys.stderr.write('usage: python -m cliff.daemon <socket> [arg ...]\n')
+        return 2
+    try:
+        return forward(argv[0], argv[1:])
+    except DaemonUnavailable as err:
+        sys.stderr.write(f'{err.strerror}\n')
+        return 1
+    except ConnectionError as err:
+        # The daemon rejected the request or failed while running it.
+        sys.stderr.write(f'daemon on {argv[0]} closed the connection: {err}\n')
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,18 +14,87 @@
 
 import abc
 import argparse
-from collections.abc import Iterable, Iterator, Sequence
+from collections.abc import AsyncIterable, Iterable, Iterator, Sequence
+import contextlib
+import functools
 from itertools import compress
-from typing import Any, Generic, TypeVar
+import threading
+from typing import Any, Generic, TextIO, TypeVar
 
+import autopage
+import autopage.command
 import stevedore
 
+from cliff import _argparse
+from cliff import _async
+from cliff import _memory
 from cliff import app
 from cliff import command
+from cliff import utils
 from cliff.formatters import base as base_formatters
 
 _T = TypeVar("_T")
 
+_formatter_managers: dict[str, stevedore.ExtensionManager[Any]] = {}
+_formatter_lock = threading.Lock()
+
+
+def preload_formatters(
+    namespaces: Iterable[str] = (
+        'cliff.formatter.list',
+        'cliff.formatter.show',
+    ),
+) -> None:
+    """Import the formatter plugins of the given namespaces ahead of time."""
+    for namespace in namespaces:
+        _get_formatter_manager(namespace)
+
+
+def _get_formatter_manager(namespace: str) -> stevedore.ExtensionManager[Any]:
+    # The formatter plugins of a namespace are discovered once per process
+    # and shared by all the commands. They are only instantiated when used,
+    # see _get_formatter().
+    with _formatter_lock:
+        manager = _formatter_managers.get(namespace)
+        if manager is None:
+            manager = stevedore.ExtensionManager(namespace)
+            _formatter_managers[namespace] = manager
+        return manager
+
+
+def _add_formatter_arguments(
+    extension: stevedore.extension.Extension[base_formatters.FormatterT],
+    parser: argparse.ArgumentParser,
+) -> None:
+    _get_formatter(extension).add_argument_group(parser)
+
+
+@contextlib.contextmanager
+def _closing_rows(*rows: Iterable[Any]) -> Iterator[None]:
+    """Close the iterators of rows that have a ``close`` method on exit.
+
+    Rows generated from a paginated API stop being fetched when the output
+    is closed early, e.g. by a closed pipe, rather than when they are
+    garbage collected.
+    """
+    try:
+        yield
+    finally:
+        for iterable in rows:
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()
+
+
+def _get_formatter(
+    extension: stevedore.extension.Extension[base_formatters.FormatterT],
+) -> base_formatters.FormatterT:
+    if extension.obj is None:
+        with _formatter_lock:
+            if extension.obj is None:
+                extension.obj = extension.plugin()
+    return extension.obj
+
 
 class DisplayCommandBase(
     command.Command,
@@ -36,6 +105,7 @@ class DisplayCommandBase(
 
     _formatter_plugins: stevedore.ExtensionManager[base_formatters.FormatterT]
     formatter: base_formatters.FormatterT
+    _pager_stream: TextIO | None = None
 
     def __init__(
         self,
@@ -56,14 +126,75 @@ class DisplayCommandBase(
     def formatter_default(self) -> str:
         """String specifying the name of the default formatter."""
 
+    @property
+    def async_prefetch(self) -> int:
+        """Number of items fetched ahead of the formatter.
+
+        Only used when :meth:`take_action` returns an async iterable, for
+        example to page through the results of an API. The next items are
+        fetched while the current ones are being written, overlapping the
+        latency of the data source with formatting.
+        """
+        return 1000
+
+    @property
+    def defer_formatter_arguments(self) -> bool:
+        """Whether to add the options of unused formatters to the parser.
+
+        By default, the options of a formatter are only added to the parser
+        when it is selected with ``-f``, or when the help is shown, so that
+        only the selected formatter is loaded. Override this to return False
+        to always add the options of all the formatters.
+        """
+        return True
+
+    @property
+    def pager_option(self) -> bool:
+        """Whether to add the ``--pager`` option to the parser.
+
+        Defaults to the ``pager_option`` argument of the application.
+        Override this to return False for a command defining its own
+        ``--pager`` option, or True to add it to a single command.
+        """
+        return isinstance(self.app, app.App) and self.app.pager_option
+
+    @property
+    def _output(self) -> TextIO:
+        # The stream the formatter writes to, see _paging()
+        return self._pager_stream or self.app.stdout
+
+    @contextlib.contextmanager
+    def _paging(self, parsed_args: argparse.Namespace) -> Iterator[None]:
+        # Send the output to a pager while it is produced, if requested.
+        if not getattr(parsed_args, 'pager', False):
+            yield
+            return
+        # The default pager command of autopage is looked up when it is
+        # imported, look it up for each command instead.
+        pager = autopage.AutoPager(
+            self.app.stdout, pager_command=autopage.command.DefaultPager()
+        )
+        with pager as stream:
+            self._pager_stream = stream
+            try:
+                yield
+            finally:
+                self._pager_stream = None
+        if pager.exit_code() == app._SIGPIPE_EXIT:
+            # The pager was quit before the end of the output, which is
+            # handled like a closed pipe.
+            raise BrokenPipeError('the pager exited')
+
     def _load_formatter_plugins(
         self,
     ) -> stevedore.ExtensionManager[base_formatters.FormatterT]:
         # Here so tests can override
-        return stevedore.ExtensionManager(
-            self.formatter_namespace,
-            invoke_on_load=True,
-        )
+        return _get_formatter_manager(self.formatter_namespace)
+
+    def _select_formatter(self, name: str) -> base_formatters.FormatterT:
+        formatter = _get_formatter(self._formatter_plugins[name])
+        self.formatter = formatter
+        return formatter
 
     def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
         parser = super().get_parser(prog_name)
@@ -76,7 +207,7 @@ class DisplayCommandBase(
         formatter_default = self.formatter_default
         if formatter_default not in formatter_choices:
             formatter_default = formatter_choices[0]
-        formatter_group.add_argument(
+        formatter_action = formatter_group.add_argument(
             '-f',
             '--format',
             dest='formatter',
@@ -97,9 +228,28 @@ class DisplayCommandBase(
                 'repeated to show multiple columns'
             ),
         )
-        for formatter in self._formatter_plugins:
-            assert formatter.obj is not None  # noqa
-            formatter.obj.add_argument_group(parser)
+        if self.pager_option:
+            formatter_group.add_argument(
+                '--pager',
+                action='store_true',
+                default=utils.env_flag('CLIFF_USE_PAGER'),
+                help=(
+                    'show the output in a pager when it is a terminal, set '
+                    'the environment variable CLIFF_USE_PAGER=1 to always '
+                    'enable'
+                ),
+            )
+        for extension in self._formatter_plugins:
+            if self.defer_formatter_arguments and isinstance(
+                parser, _argparse.ArgumentParser
+            ):
+                parser.add_deferred_arguments(
+                    formatter_action,
+                    extension.name,
+                    functools.partial(_add_formatter_arguments, extension),
+                )
+            else:
+                _add_formatter_arguments(extension, parser)
         return parser
 
     @abc.abstractmethod
@@ -154,14 +304,22 @@ class DisplayCommandBase(
 
     def run(self, parsed_args: argparse.Namespace) -> int:
         parsed_args = self._run_before_hooks(parsed_args)
-        formatter = self._formatter_plugins[parsed_args.formatter].obj
-        assert formatter is not None  # noqa
-        self.formatter = formatter
-        column_names, data = self.take_action(parsed_args)
+        self._select_formatter(parsed_args.formatter)
+        with _memory.phase('take_action'):
+            column_names, data = self.take_action(parsed_args)
+        # The hooks may replace the rows, close those of both.
+        rows = data
         column_names, data = self._run_after_hooks(
             parsed_args, (column_names, data)
         )
-        self.produce_output(parsed_args, column_names, data)
+        with self._paging(parsed_args):
+            if isinstance(data, AsyncIterable):
+                rows = _async.iterate_in_thread(data, self.async_prefetch)
+                with contextlib.closing(rows):
+                    self.produce_output(parsed_args, column_names, rows)
+            else:
+                with _closing_rows(rows, data):
+                    self.produce_output(parsed_args, column_names, data)
         return 0
 
     def _run_after_hooks(  # type: ignore[override]
@@ -196,3 +354,45 @@ class DisplayCommandBase(
         selectors: Iterable[Any],
     ) -> Iterator[_T]:
         return compress(iterable, selectors)
+
+
+class AsyncDisplayCommandBase(
+    command.AsyncCommand,
+    DisplayCommandBase[base_formatters.FormatterT],
+    metaclass=abc.ABCMeta,
+):
+    """Command base class for displaying data produced by a coroutine.
+
+    The data returned by :meth:`take_action` may be an async iterable, in
+    which case the output is produced in a separate thread while the event
+    loop fetches the items, so that formatters can write items as they
+    arrive.
+    """
+
+    async def run_async(self, parsed_args: argparse.Namespace) -> int:
+        import asyncio
+
+        parsed_args = await self._run_before_hooks_async(parsed_args)
+        self._select_formatter(parsed_args.formatter)
+        with _memory.phase('take_action'):
+            column_names, data = await self.take_action(parsed_args)
+        rows = data
+        column_names, data = await self._run_after_hooks_async(
+            parsed_args, (column_names, data)
+        )
+        if isinstance(data, AsyncIterable):
+            async_rows = _async.iterate_in_loop(
+                data, asyncio.get_running_loop(), self.async_prefetch
+            )
+
+            def produce_output() -> None:
+                # Close the rows from this thread, since closing them waits
+                # for the event loop.
+                with contextlib.closing(async_rows), self._paging(parsed_args):
+                    self.produce_output(parsed_args, column_names, async_rows)
+
+            await asyncio.to_thread(produce_output)
+        else:
+            with self._paging(parsed_args), _closing_rows(rows, data):
+                self.produce_output(parsed_args, column_names, data)
+        return 0
@@ -14,13 +14,64 @@
 
 import abc
 import argparse
-from collections.abc import Iterable, Sequence
-from typing import Any, TextIO, TypeVar
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import compress
+from typing import Any, TextIO, TypeVar, overload
 
+from cliff import columns
 
 FormatterT = TypeVar('FormatterT', bound='Formatter')
 
 
+class ColumnarRows(Sequence[tuple[Any, ...]]):
+    """Rows of a list stored as one sequence of values per column.
+
+    Commands holding their data by column, such as the results of a
+    columnar query, can return it as is rather than building a tuple per
+    row. It is a sequence of rows for formatters which do not know about
+    it, while columns can be selected without going through the rows.
+
+    :param columns: the values of each column, all of the same length
+    """
+
+    def __init__(self, columns: Sequence[Sequence[Any]]) -> None:
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[Any, ...]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'ColumnarRows': ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> 'tuple[Any, ...] | ColumnarRows':
+        if isinstance(index, slice):
+            return ColumnarRows([column[index] for column in self.columns])
+        return tuple(column[index] for column in self.columns)
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        return zip(*self.columns)
+
+    def select(self, selectors: Iterable[Any]) -> 'ColumnarRows':
+        """Return the rows of the columns for which selectors are true."""
+        return ColumnarRows(list(compress(self.columns, selectors)))
+
+
+def machine_readable(values: Iterable[Any]) -> list[Any]:
+    """Return the values with formattable columns as machine readable data.
+
+    :param values: the values of a row, or of a column
+    """
+    return [
+        v.machine_readable() if isinstance(v, columns.FormattableColumn) else v
+        for v in values
+    ]
+
+
 class Formatter(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def add_argument_group(self, parser: argparse.ArgumentParser) -> None:
@@ -49,6 +100,12 @@ class ListFormatter(Formatter, metaclass=abc.ABCMeta):
         handled differently for human readable output vs. machine
         readable output.
 
+        The data is either an iterator, such as a generator, which can be
+        iterated over only once and may still be producing its rows, a
+        sequence of rows which is sized and can be iterated over again, or
+        a :class:`ColumnarRows` sequence holding the values by column.
+        Formatters may use the cheapest way of writing each of them.
+
         :param column_names: names of the columns
         :param data: iterable data source, one tuple per object
                      with values in order of column names
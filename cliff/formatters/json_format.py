@@ -14,14 +14,19 @@
 
 import argparse
 from collections.abc import Iterable, Sequence
+import itertools
 import json
 from typing import Any, TextIO
 
-from cliff import columns
 from cliff.formatters import base
 
 
 class JSONFormatter(base.ListFormatter, base.SingleFormatter):
+    # Number of rows of a sequence encoded at a time
+    BATCH_ROWS = 1000
+    # Number of rows of an iterator encoded at a time
+    STREAM_ROWS = 100
+
     def add_argument_group(self, parser: argparse.ArgumentParser) -> None:
         group = parser.add_argument_group(title='json formatter')
         group.add_argument(
@@ -30,6 +35,17 @@ class JSONFormatter(base.ListFormatter, base.SingleFormatter):
             dest='noindent',
             help='whether to disable indenting the JSON',
         )
+        group.add_argument(
+            '--json-layout',
+            choices=['rows', 'columns', 'table'],
+            default='rows',
+            help=(
+                'layout of the JSON of a list: an array with an object per '
+                'row (rows, the default), an object with an array of values '
+                'per column (columns), or an object with the array of the '
+                'column names and an array of values per row (table)'
+            ),
+        )
 
     def emit_list(
         self,
@@ -38,22 +54,89 @@ class JSONFormatter(base.ListFormatter, base.SingleFormatter):
         stdout: TextIO,
         parsed_args: argparse.Namespace,
     ) -> None:
-        items = []
-        for item in data:
-            items.append(
-                {
-                    n: (
-                        i.machine_readable()
-                        if isinstance(i, columns.FormattableColumn)
-                        else i
-                    )
-                    for n, i in zip(column_names, item)
-                }
+        encoder = json.JSONEncoder(indent=None if parsed_args.noindent else 2)
+        # The rows are encoded in batches, which is faster than one at a
+        # time. Those of an iterator are written in small batches, so that
+        # the rows stop being generated soon after the output is closed.
+        batch = (
+            self.BATCH_ROWS if isinstance(data, Sequence) else self.STREAM_ROWS
+        )
+        layout = parsed_args.json_layout
+        if layout == 'columns':
+            # Each column needs all the rows, so nothing is written until
+            # they have all arrived.
+            if isinstance(data, base.ColumnarRows):
+                values = [base.machine_readable(c) for c in data.columns]
+            else:
+                values = [[] for _ in column_names]
+                for row in data:
+                    for column, value in zip(
+                        values, base.machine_readable(row)
+                    ):
+                        column.append(value)
+            stdout.write(encoder.encode(dict(zip(column_names, values))))
+        elif layout == 'table':
+            # The names of the columns are written once rather than in each
+            # row, followed by the rows as they arrive.
+            head = encoder.encode({'columns': list(column_names), 'data': []})
+            tail = '}' if encoder.indent is None else '\n}'
+            stdout.write(head[: -len('[]' + tail)])
+            self._write_array(
+                encoder,
+                (base.machine_readable(row) for row in data),
+                batch,
+                1,
+                stdout,
+            )
+            stdout.write(tail)
+        else:
+            self._write_array(
+                encoder,
+                (
+                    dict(zip(column_names, base.machine_readable(row)))
+                    for row in data
+                ),
+                batch,
+                0,
+                stdout,
             )
-        indent = None if parsed_args.noindent else 2
-        json.dump(items, stdout, indent=indent)
         stdout.write('\n')
 
+    def _write_array(
+        self,
+        encoder: json.JSONEncoder,
+        items: Iterable[Any],
+        batch: int,
+        level: int,
+        stdout: TextIO,
+    ) -> None:
+        # Write the items a batch at a time, as json.dump() would write the
+        # array of them nested at the given level, so that they are not all
+        # held in memory and the rows stop being generated when the output
+        # is closed.
+        if encoder.indent is None:
+            first, separator, last = '[', ', ', ']'
+        else:
+            first, separator, last = '[\n  ', ',\n  ', '\n]'
+        # The lines of a nested array are indented further.
+        nested = bool(level) and encoder.indent is not None
+        margin = '\n' + '  ' * level
+        if nested:
+            first, separator, last = (
+                t.replace('\n', margin) for t in (first, separator, last)
+            )
+        prefix = first
+        iterator = iter(items)
+        while batch_items := list(itertools.islice(iterator, batch)):
+            # The encoded array of the items, without its brackets, is a
+            # part of the whole array.
+            text = encoder.encode(batch_items)
+            if nested:
+                text = text.replace('\n', margin)
+            stdout.write(prefix + text[len(first) : -len(last)])
+            prefix = separator
+        stdout.write('[]' if prefix is first else last)
+
     def emit_one(
         self,
         column_names: Sequence[str],
@@ -61,14 +144,7 @@ class JSONFormatter(base.ListFormatter, base.SingleFormatter):
         stdout: TextIO,
         parsed_args: argparse.Namespace,
     ) -> None:
-        one = {
-            n: (
-                i.machine_readable()
-                if isinstance(i, columns.FormattableColumn)
-                else i
-            )
-            for n, i in zip(column_names, data)
-        }
+        one = dict(zip(column_names, base.machine_readable(data)))
         indent = None if parsed_args.noindent else 2
         json.dump(one, stdout, indent=indent)
         stdout.write('\n')
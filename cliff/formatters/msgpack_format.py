@@ -0,0 +1,72 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+"""Output formatters using MessagePack."""
+
+import argparse
+from collections.abc import Iterable, Sequence
+from typing import Any, BinaryIO, TextIO
+
+from cliff.formatters import base
+
+
+class MsgPackFormatter(base.ListFormatter, base.SingleFormatter):
+    """Write a stream of MessagePack arrays.
+
+    The first array holds the names of the columns, and each of the next
+    ones the values of a row, or of the object shown. It requires the
+    msgpack package, which cliff does not install by default.
+    """
+
+    def add_argument_group(self, parser: argparse.ArgumentParser) -> None:
+        pass
+
+    def _open(self, stdout: TextIO) -> tuple[Any, BinaryIO]:
+        try:
+            import msgpack
+        except ImportError:
+            raise RuntimeError(
+                'the msgpack formatter requires the msgpack package'
+            )
+        buffer = getattr(stdout, 'buffer', None)
+        if buffer is None:
+            raise RuntimeError(
+                'the msgpack formatter requires a binary output'
+            )
+        # Write what was written as text before the binary output.
+        stdout.flush()
+        return msgpack.Packer(), buffer
+
+    def emit_list(
+        self,
+        column_names: Sequence[str],
+        data: Iterable[Sequence[Any]],
+        stdout: TextIO,
+        parsed_args: argparse.Namespace,
+    ) -> None:
+        packer, buffer = self._open(stdout)
+        # Each row is written as soon as it arrives, and the reader can
+        # decode it as soon as it is written.
+        buffer.write(packer.pack(list(column_names)))
+        for row in data:
+            buffer.write(packer.pack(base.machine_readable(row)))
+
+    def emit_one(
+        self,
+        column_names: Sequence[str],
+        data: Sequence[Any],
+        stdout: TextIO,
+        parsed_args: argparse.Namespace,
+    ) -> None:
+        packer, buffer = self._open(stdout)
+        buffer.write(packer.pack(list(column_names)))
+        buffer.write(packer.pack(base.machine_readable(data)))
@@ -13,7 +13,8 @@
 """Output formatters using prettytable."""
 
 import argparse
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Iterator, Sequence
+import itertools
 import os
 import sys
 from typing import Any, Literal, TextIO, TypeVar
@@ -40,6 +41,13 @@ def _format_row(
     return new_row
 
 
+def _isatty(stream: TextIO) -> bool:
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
 def _do_fit(fit_width: bool) -> bool:
     if os.name == 'nt':
         # NOTE(pas-ha) the isatty is not reliable enough on Windows,
@@ -54,6 +62,8 @@ class TableFormatter(base.ListFormatter, base.SingleFormatter):
         str: 'l',
         float: 'r',
     }
+    # Number of rows printed at a time with --progressive
+    PROGRESSIVE_ROWS = 20
 
     def add_argument_group(self, parser: argparse.ArgumentParser) -> None:
         group = parser.add_argument_group('table formatter')
@@ -84,6 +94,17 @@ class TableFormatter(base.ListFormatter, base.SingleFormatter):
             action='store_true',
             help='Print empty table if there is no data to show.',
         )
+        group.add_argument(
+            '--progressive',
+            action='store_true',
+            default=utils.env_flag('CLIFF_PROGRESSIVE_TABLE'),
+            help=(
+                'Print the rows as they arrive when the output is a '
+                'terminal, printing the header again when columns must '
+                'widen. Set the environment variable '
+                'CLIFF_PROGRESSIVE_TABLE=1 to always enable'
+            ),
+        )
 
     def add_rows(
         self,
@@ -121,9 +142,23 @@ class TableFormatter(base.ListFormatter, base.SingleFormatter):
         )
         x.padding_width = 1
 
-        # Add rows if data is provided
-        if data:
-            self.add_rows(x, column_names, data)
+        if (
+            getattr(parsed_args, 'progressive', False)
+            and not isinstance(data, Sequence)
+            and _isatty(stdout)
+        ):
+            # Print the first rows without waiting for all of them, unless
+            # they all fit in the first window anyway. The rows of a
+            # sequence have all arrived already.
+            data_iter = iter(data)
+            data = list(itertools.islice(data_iter, self.PROGRESSIVE_ROWS))
+            if len(data) == self.PROGRESSIVE_ROWS:
+                self._emit_progressive(x, data, data_iter, stdout, parsed_args)
+                return
+
+        # There is no need to check for rows first, which says nothing
+        # about those of an iterator anyway.
+        self.add_rows(x, column_names, data)
 
         # Choose a reasonable min_width to better handle many columns on a
         # narrow console. The table will overflow the console width in
@@ -138,6 +173,48 @@ class TableFormatter(base.ListFormatter, base.SingleFormatter):
         stdout.write('\n')
         return
 
+    def _emit_progressive(
+        self,
+        table: prettytable.PrettyTable,
+        first_rows: list[Sequence[Any]],
+        data: Iterator[Sequence[Any]],
+        stdout: TextIO,
+        parsed_args: argparse.Namespace,
+    ) -> None:
+        # The widths of the columns are those of the first rows, and only
+        # grow, so rows print as soon as a window of them is collected. The
+        # header is printed again whenever the columns widen.
+        self.add_rows(table, table.field_names, first_rows)
+        self._assign_max_widths(
+            table, int(parsed_args.max_width), 8, parsed_args.fit_width
+        )
+        widths: dict[str, int] = {}
+        border = None
+        rows = first_rows
+        while rows:
+            table.min_width = widths
+            lines = table.get_string().splitlines()
+            new_widths = self._field_widths(table.field_names, lines[0])
+            widened = new_widths != widths
+            if widened:
+                widths = table.min_width = new_widths
+            # Without the header, the rows are the lines between the borders.
+            body = table.get_string(header=False).splitlines()[1:-1]
+            if widened:
+                if border is not None:
+                    stdout.write(border + '\n')
+                stdout.write(
+                    ''.join(f'{line}\n' for line in lines[: -len(body) - 1])
+                )
+            stdout.write(''.join(f'{line}\n' for line in body))
+            stdout.flush()
+            border = lines[-1]
+            rows = list(itertools.islice(data, self.PROGRESSIVE_ROWS))
+            table.clear_rows()
+            for row in rows:
+                table.add_row(_format_row(row))
+        stdout.write(f'{border}\n')
+
     def emit_one(
         self,
         column_names: Sequence[str],
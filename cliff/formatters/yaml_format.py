@@ -14,6 +14,7 @@
 
 import argparse
 from collections.abc import Iterable, Sequence
+import itertools
 from typing import Any, TextIO
 
 from cliff import columns
@@ -32,6 +33,11 @@ def _yaml_friendly(value: Any) -> Any:
 
 
 class YAMLFormatter(base.ListFormatter, base.SingleFormatter):
+    # Number of rows of a sequence dumped at a time
+    BATCH_ROWS = 1000
+    # Number of rows of an iterator dumped at a time
+    STREAM_ROWS = 100
+
     def add_argument_group(self, parser: argparse.ArgumentParser) -> None:
         pass
 
@@ -45,12 +51,23 @@ class YAMLFormatter(base.ListFormatter, base.SingleFormatter):
         # the yaml import is slow, so defer loading until we know we want it
         import yaml
 
-        items = []
-        for item in data:
-            items.append(
-                {n: _yaml_friendly(i) for n, i in zip(column_names, item)}
-            )
-        yaml.safe_dump(items, stream=stdout, default_flow_style=False)
+        # Write the items a batch at a time, each batch as a sequence of
+        # items, which reads the same as the sequence of all of them. Those
+        # of an iterator are written in small batches, so that the rows
+        # stop being generated soon after the output is closed.
+        batch = (
+            self.BATCH_ROWS if isinstance(data, Sequence) else self.STREAM_ROWS
+        )
+        rows = iter(data)
+        empty = True
+        while items := [
+            {n: _yaml_friendly(i) for n, i in zip(column_names, item)}
+            for item in itertools.islice(rows, batch)
+        ]:
+            yaml.safe_dump(items, stream=stdout, default_flow_style=False)
+            empty = False
+        if empty:
+            yaml.safe_dump([], stream=stdout, default_flow_style=False)
 
     def emit_one(
         self,
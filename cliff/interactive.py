@@ -20,9 +20,13 @@ from typing import TYPE_CHECKING, TextIO
 import autopage.argparse
 import cmd2
 
+from . import commandmanager
+from . import lister
+from . import pipeline
+
 if TYPE_CHECKING:
     from . import app as _app
-    from . import commandmanager as _commandmanager
+    from . import command as _command
 
 
 class InteractiveApp(cmd2.Cmd):
@@ -42,6 +46,23 @@ class InteractiveApp(cmd2.Cmd):
     :param stdout: Standard output stream
     """
 
+    #: Reuse the argument parser built for a command class for the rest of
+    #: the session, as with the ``cache_parsers`` argument of
+    #: :class:`cliff.app.App`. Set this to False if the parser of a command
+    #: depends on the state of the command instance.
+    cache_parsers = True
+
+    #: Separates the stages of a pipeline: a command listing rows followed
+    #: by filters, such as ``list files :: grep -c Name '^a' :: head 5``.
+    pipe_separator = '::'
+
+    #: The filters which can follow a command in a pipeline, by name.
+    filters: dict[str, type[pipeline.Filter]] = {
+        'grep': pipeline.GrepFilter,
+        'head': pipeline.HeadFilter,
+        'sort': pipeline.SortFilter,
+    }
+
     use_rawinput = True
     doc_header = "Shell commands (type help <topic>):"
     app_cmd_header = "Application commands (type help <topic>):"
@@ -49,7 +70,7 @@ class InteractiveApp(cmd2.Cmd):
     def __init__(
         self,
         parent_app: '_app.App',
-        command_manager: '_commandmanager.CommandManager',
+        command_manager: 'commandmanager.CommandManager',
         stdin: TextIO | None,
         stdout: TextIO | None,
         errexit: bool = False,
@@ -62,6 +83,16 @@ class InteractiveApp(cmd2.Cmd):
             self.prompt = ''
         self.command_manager = command_manager
         self.errexit = errexit
+        self._commands: dict[
+            tuple[str, ...], tuple[type[_command.Command], str, int]
+        ] = {}
+        self._commands_state: (
+            tuple[
+                dict[str, commandmanager.EntryPointT],
+                dict[str, str],
+            ]
+            | None
+        ) = None
         cmd2.Cmd.__init__(self, 'tab', stdin=stdin, stdout=stdout)
 
     # def _split_line(self, line: cmd2.Statement) -> list[str]:
@@ -73,6 +104,40 @@ class InteractiveApp(cmd2.Cmd):
             parts.insert(0, line.command)
         return parts
 
+    def find_command(
+        self, argv: list[str]
+    ) -> tuple[type['_command.Command'], str, list[str]]:
+        """Find a command like
+        :meth:`cliff.commandmanager.CommandManager.find_command`.
+
+        The commands found are remembered for the rest of the session, so a
+        command run again is not looked up nor imported again. They are
+        forgotten when the commands of the command manager change.
+        """
+        manager = self.command_manager
+        if (
+            type(manager).find_command
+            is not commandmanager.CommandManager.find_command
+        ):
+            # The lookup cannot be assumed to only depend on the command
+            # words.
+            return manager.find_command(argv)
+        if self._commands_state != (manager.commands, manager._legacy):
+            self._commands.clear()
+            self._commands_state = (
+                dict(manager.commands),
+                dict(manager._legacy),
+            )
+        # Only the words before the first option can name the command.
+        key = tuple(argv[: manager._get_last_possible_command_index(argv)])
+        found = self._commands.get(key)
+        if found is None:
+            cmd_factory, cmd_name, sub_argv = manager.find_command(argv)
+            found = (cmd_factory, cmd_name, len(argv) - len(sub_argv))
+            self._commands[key] = found
+        cmd_factory, cmd_name, consumed = found
+        return cmd_factory, cmd_name, argv[consumed:]
+
     def default(self, line: str) -> bool | None:
         # Tie in the default command processor to
         # dispatch commands known to the command manager.
@@ -80,13 +145,63 @@ class InteractiveApp(cmd2.Cmd):
         # since it already has the logic for executing
         # the subcommand.
         line_parts = self._split_line(line)
-        ret = self.parent_app.run_subcommand(line_parts)
+        if self.pipe_separator in line_parts:
+            ret = self._run_pipeline(line_parts)
+        else:
+            ret = self.parent_app.run_subcommand(line_parts)
         if self.errexit:
             # Only provide this if errexit is enabled,
             # otherise keep old behaviour
             return bool(ret)
         return None
 
+    def _run_pipeline(self, line_parts: list[str]) -> int:
+        stages: list[list[str]] = [[]]
+        for part in line_parts:
+            if part == self.pipe_separator:
+                stages.append([])
+            else:
+                stages[-1].append(part)
+        log = self.parent_app.LOG
+        if not all(stages):
+            log.error('Empty stage in pipeline %r', ' '.join(line_parts))
+            return 2
+
+        filters = []
+        for name, *argv in stages[1:]:
+            filter_factory = self.filters.get(name)
+            if filter_factory is None:
+                log.error(
+                    'Unknown filter %r, known filters are: %s',
+                    name,
+                    ', '.join(sorted(self.filters)),
+                )
+                return 2
+            pipe_filter = filter_factory()
+            try:
+                parsed_args = pipe_filter.get_parser(name).parse_args(argv)
+            except SystemExit as ex:
+                raise cmd2.exceptions.Cmd2ArgparseError from ex
+            filters.append((pipe_filter, parsed_args))
+
+        try:
+            cmd_factory, cmd_name, _ = self.find_command(stages[0])
+        except ValueError:
+            # Let the application report the unknown command.
+            pass
+        else:
+            if not issubclass(cmd_factory, lister._ListerBase):
+                log.error(
+                    'The output of %r cannot be filtered, it does not '
+                    'list rows',
+                    cmd_name,
+                )
+                return 2
+        # The rows returned by the command are passed to the filters as
+        # they are, then formatted as the command's own rows would be.
+        with pipeline._filtering(filters):
+            return self.parent_app.run_subcommand(stages[0])
+
     def completedefault(  # type: ignore[override]
         self, text: str, line: str, begidx: int, endidx: int
     ) -> list[str]:
@@ -175,7 +290,7 @@ class InteractiveApp(cmd2.Cmd):
         # command names by default.
         line_parts = self._split_line(statement)
         try:
-            the_cmd = self.command_manager.find_command(line_parts)
+            the_cmd = self.find_command(line_parts)
             cmd_factory, cmd_name, sub_argv = the_cmd
         except ValueError:
             # Not a plugin command
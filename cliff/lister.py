@@ -14,19 +14,59 @@
 
 import abc
 import argparse
-from collections.abc import Iterable, Sequence
+from collections.abc import (
+    AsyncIterable,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
 import logging
-from typing import Any
+from typing import Any, overload
 
+from cliff import _memory
 from cliff import display
+from cliff import pipeline
 from cliff.formatters import base as base_formatters
 
 
-class Lister(
+class _SelectedRows(Sequence[list[Any]]):
+    # The selected values of each row of a sequence, selected as they are
+    # read, so that formatters still know the number of rows.
+
+    def __init__(
+        self,
+        rows: Sequence[Sequence[Any]],
+        select: Callable[[Sequence[Any]], Iterable[Any]],
+    ) -> None:
+        self.rows = rows
+        self.select = select
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @overload
+    def __getitem__(self, index: int) -> list[Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> '_SelectedRows': ...
+
+    def __getitem__(self, index: int | slice) -> 'list[Any] | _SelectedRows':
+        if isinstance(index, slice):
+            return _SelectedRows(self.rows[index], self.select)
+        return list(self.select(self.rows[index]))
+
+    def __iter__(self) -> Iterator[list[Any]]:
+        select = self.select
+        for row in self.rows:
+            yield list(select(row))
+
+
+class _ListerBase(
     display.DisplayCommandBase[base_formatters.ListFormatter],
     metaclass=abc.ABCMeta,
 ):
-    """Command base class for providing a list of data as output."""
+    """Shared implementation of :class:`Lister` and :class:`AsyncLister`."""
 
     log = logging.getLogger(__name__)
 
@@ -47,16 +87,6 @@ class Lister(
         """
         return True
 
-    @abc.abstractmethod
-    def take_action(
-        self, parsed_args: argparse.Namespace
-    ) -> tuple[Sequence[str], Iterable[Any]]:
-        """Run command.
-
-        Return a tuple containing the column names and an iterable containing
-        the data to be listed.
-        """
-
     def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
         parser = super().get_parser(prog_name)
         group = self._formatter_group
@@ -95,52 +125,99 @@ class Lister(
         column_names: Sequence[str],
         data: Iterable[Sequence[Any]],
     ) -> int:
+        # Apply the filters of a pipeline in interactive mode, if any
+        column_names, data = pipeline._filter(column_names, data)
         if parsed_args.sort_columns and self.need_sort_by_cliff:
-            indexes = [
-                column_names.index(c)
-                for c in parsed_args.sort_columns
-                if c in column_names
-            ]
-            reverse = parsed_args.sort_direction == 'desc'
-            for index in indexes[::-1]:
-                try:
-                    # We need to handle unset values (i.e. None) so we sort on
-                    # multiple conditions: the first comparing the results of
-                    # an 'is None' type check and the second comparing the
-                    # actual value. The second condition will only be checked
-                    # if the first returns True, which only happens if the
-                    # returns from the 'is None' check on the two values are
-                    # the same, i.e. both None or both not-None
-                    data = sorted(
-                        data,
-                        key=lambda k: (k[index] is None, k[index]),
-                        reverse=reverse,
-                    )
-                except TypeError:
-                    # Simply log and then ignore this; sorting is best effort
-                    self.log.warning(
-                        "Could not sort on field '%s'; unsortable types",
-                        parsed_args.sort_columns[index],
-                    )
-
-        columns_to_include, selector = self._generate_columns_and_selector(
-            parsed_args,
-            column_names,
-        )
-        if selector:
-            # Generator expression to only return the parts of a row
-            # of data that the user has expressed interest in
-            # seeing. We have to convert the compress() output to a
-            # list so the table formatter can ask for its length.
-            data = (
-                list(self._compress_iterable(row, selector)) for row in data
+            with _memory.phase('sort'):
+                indexes = [
+                    column_names.index(c)
+                    for c in parsed_args.sort_columns
+                    if c in column_names
+                ]
+                reverse = parsed_args.sort_direction == 'desc'
+                for index in indexes[::-1]:
+                    try:
+                        # We need to handle unset values (i.e. None) so we
+                        # sort on multiple conditions: the first comparing
+                        # the results of an 'is None' type check and the
+                        # second comparing the actual value. The second
+                        # condition will only be checked if the first
+                        # returns True, which only happens if the returns
+                        # from the 'is None' check on the two values are the
+                        # same, i.e. both None or both not-None
+                        data = sorted(
+                            data,
+                            key=lambda k: (k[index] is None, k[index]),
+                            reverse=reverse,
+                        )
+                    except TypeError:
+                        # Simply log and then ignore this; sorting is best
+                        # effort
+                        self.log.warning(
+                            "Could not sort on field '%s'; unsortable types",
+                            parsed_args.sort_columns[index],
+                        )
+
+        with _memory.phase('columns'):
+            columns_to_include, selector = self._generate_columns_and_selector(
+                parsed_args, column_names
+            )
+            if selector and isinstance(data, base_formatters.ColumnarRows):
+                data = data.select(selector)
+            elif selector and isinstance(data, Sequence):
+                # Keep the data a sequence, as formatters may handle all the
+                # rows at once better than one at a time.
+                data = _SelectedRows(
+                    data, lambda row: self._compress_iterable(row, selector)
+                )
+            elif selector:
+                # Generator expression to only return the parts of a row
+                # of data that the user has expressed interest in
+                # seeing. We have to convert the compress() output to a
+                # list so the table formatter can ask for its length.
+                data = (
+                    list(self._compress_iterable(row, selector))
+                    for row in data
+                )
+
+        with _memory.phase('formatter'):
+            self.formatter.emit_list(
+                columns_to_include,
+                data,
+                self._output,
+                parsed_args,
             )
-
-        self.formatter.emit_list(
-            columns_to_include,
-            data,
-            self.app.stdout,
-            parsed_args,
-        )
 
         return 0
+
+
+class Lister(_ListerBase, metaclass=abc.ABCMeta):
+    """Command base class for providing a list of data as output."""
+
+    @abc.abstractmethod
+    def take_action(
+        self, parsed_args: argparse.Namespace
+    ) -> tuple[Sequence[str], Iterable[Any]]:
+        """Run command.
+
+        Return a tuple containing the column names and an iterable containing
+        the data to be listed.
+        """
+
+
+class AsyncLister(
+    display.AsyncDisplayCommandBase[base_formatters.ListFormatter],
+    _ListerBase,
+    metaclass=abc.ABCMeta,
+):
+    """Command base class for providing a list of data from a coroutine."""
+
+    @abc.abstractmethod
+    async def take_action(
+        self, parsed_args: argparse.Namespace
+    ) -> tuple[Sequence[str], Iterable[Any] | AsyncIterable[Any]]:
+        """Run command.
+
+        Return a tuple containing the column names and an iterable or an
+        async iterable containing the data to be listed.
+        """
@@ -0,0 +1,235 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+"""Filter the rows listed by a command in interactive mode."""
+
+import abc
+import argparse
+from collections.abc import Iterable, Iterator, Sequence
+import contextlib
+import contextvars
+import itertools
+import re
+from typing import Any
+
+from cliff import _argparse
+
+Rows = Iterable[Sequence[Any]]
+
+_filters: contextvars.ContextVar[
+    tuple[tuple['Filter', argparse.Namespace], ...]
+] = contextvars.ContextVar('filters', default=())
+
+
+def _normalize_column(column_name: str) -> str:
+    return column_name.lower().strip().replace(' ', '_')
+
+
+def _column_index(column_names: Sequence[str], name: str) -> int:
+    normalized = [_normalize_column(c) for c in column_names]
+    try:
+        return normalized.index(_normalize_column(name))
+    except ValueError:
+        raise ValueError(
+            f'No column {name!r}. Recognized columns are {list(column_names)}.'
+        ) from None
+
+
+class Filter(metaclass=abc.ABCMeta):
+    """Base class for the filters of a pipeline in interactive mode.
+
+    A filter follows a command listing rows, such as a
+    :class:`cliff.lister.Lister`, and receives the column names and the
+    rows returned by the command before they are formatted. Filters should
+    consume the rows lazily where possible, since they may be generated
+    as they are read.
+    """
+
+    def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
+        """Return an :class:`argparse.ArgumentParser`."""
+        return _argparse.ArgumentParser(
+            prog=prog_name, description=self.__class__.__doc__
+        )
+
+    @abc.abstractmethod
+    def filter(
+        self,
+        parsed_args: argparse.Namespace,
+        column_names: Sequence[str],
+        data: Rows,
+    ) -> tuple[Sequence[str], Rows]:
+        """Return the column names and the rows passed to the next stage.
+
+        :param parsed_args: argparse.Namespace instance with argument values
+        :param column_names: sequence of strings containing names
+                             of the columns
+        :param data: iterable with values matching the column names
+        """
+
+
+class GrepFilter(Filter):
+    """Keep the rows with a value matching a regular expression."""
+
+    def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
+        parser = super().get_parser(prog_name)
+        parser.add_argument('pattern', help='the regular expression')
+        parser.add_argument(
+            '-c',
+            '--column',
+            action='append',
+            default=[],
+            dest='columns',
+            metavar='COLUMN',
+            help=(
+                'specify the column(s) to search, can be repeated, '
+                'defaults to all the columns'
+            ),
+        )
+        parser.add_argument(
+            '-i',
+            '--ignore-case',
+            action='store_true',
+            help='ignore case distinctions',
+        )
+        parser.add_argument(
+            '-v',
+            '--invert-match',
+            action='store_true',
+            help='keep the rows without a matching value',
+        )
+        return parser
+
+    def filter(
+        self,
+        parsed_args: argparse.Namespace,
+        column_names: Sequence[str],
+        data: Rows,
+    ) -> tuple[Sequence[str], Rows]:
+        regex = re.compile(
+            parsed_args.pattern,
+            re.IGNORECASE if parsed_args.ignore_case else 0,
+        )
+        if parsed_args.columns:
+            indexes = [
+                _column_index(column_names, c) for c in parsed_args.columns
+            ]
+        else:
+            indexes = list(range(len(column_names)))
+        invert: bool = parsed_args.invert_match
+
+        def matches(row: Sequence[Any]) -> bool:
+            found = any(regex.search(str(row[i])) for i in indexes)
+            return found != invert
+
+        return column_names, filter(matches, data)
+
+
+class SortFilter(Filter):
+    """Sort the rows on the values of columns."""
+
+    def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            'columns',
+            nargs='+',
+            metavar='COLUMN',
+            help='the column(s) to sort on, in order of priority',
+        )
+        parser.add_argument(
+            '-r',
+            '--reverse',
+            action='store_true',
+            help='sort in descending order',
+        )
+        return parser
+
+    def filter(
+        self,
+        parsed_args: argparse.Namespace,
+        column_names: Sequence[str],
+        data: Rows,
+    ) -> tuple[Sequence[str], Rows]:
+        indexes = [_column_index(column_names, c) for c in parsed_args.columns]
+
+        def key(row: Sequence[Any]) -> tuple[tuple[bool, Any], ...]:
+            # Unset values sort last, see cliff.lister.Lister
+            return tuple((row[i] is None, row[i]) for i in indexes)
+
+        try:
+            rows = sorted(data, key=key, reverse=parsed_args.reverse)
+        except TypeError:
+            raise ValueError(
+                f'Could not sort on {parsed_args.columns}; unsortable types'
+            ) from None
+        return column_names, rows
+
+
+def _non_negative_int(value: str) -> int:
+    try:
+        result = int(value)
+    except ValueError:
+        result = -1
+    if result < 0:
+        raise argparse.ArgumentTypeError(
+            f'invalid non-negative integer: {value!r}'
+        )
+    return result
+
+
+class HeadFilter(Filter):
+    """Keep the first rows."""
+
+    def get_parser(self, prog_name: str) -> argparse.ArgumentParser:
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            'count',
+            nargs='?',
+            type=_non_negative_int,
+            default=10,
+            help='the number of rows to keep, defaults to 10',
+        )
+        return parser
+
+    def filter(
+        self,
+        parsed_args: argparse.Namespace,
+        column_names: Sequence[str],
+        data: Rows,
+    ) -> tuple[Sequence[str], Rows]:
+        return column_names, itertools.islice(data, parsed_args.count)
+
+
+@contextlib.contextmanager
+def _filtering(
+    filters: Iterable[tuple[Filter, argparse.Namespace]],
+) -> Iterator[None]:
+    # Filter the rows listed by the next command run in this context.
+    token = _filters.set(tuple(filters))
+    try:
+        yield
+    finally:
+        _filters.reset(token)
+
+
+def _filter(
+    column_names: Sequence[str], data: Rows
+) -> tuple[Sequence[str], Rows]:
+    filters = _filters.get()
+    if filters:
+        # The filters only apply to the command they follow, not to the
+        # commands it may run itself.
+        _filters.set(())
+    for pipe_filter, parsed_args in filters:
+        column_names, data = pipe_filter.filter(
+            parsed_args, column_names, data
+        )
+    return column_names, data
@@ -17,15 +17,16 @@ import argparse
 from collections.abc import Iterable, Sequence
 from typing import Any
 
+from cliff import _memory
 from cliff import display
 from cliff.formatters import base as base_formatters
 
 
-class ShowOne(
+class _ShowOneBase(
     display.DisplayCommandBase[base_formatters.SingleFormatter],
     metaclass=abc.ABCMeta,
 ):
-    """Command base class for displaying data about a single object."""
+    """Shared implementation of :class:`ShowOne` and :class:`AsyncShowOne`."""
 
     @property
     def formatter_namespace(self) -> str:
@@ -35,30 +36,22 @@ class ShowOne(
     def formatter_default(self) -> str:
         return 'table'
 
-    @abc.abstractmethod
-    def take_action(
-        self, parsed_args: argparse.Namespace
-    ) -> tuple[Sequence[str], Iterable[Any]]:
-        """Run command.
-
-        Return a tuple containing the column names and an iterable containing
-        the data to be listed.
-        """
-
     def produce_output(
         self,
         parsed_args: argparse.Namespace,
         column_names: Sequence[str],
         data: Sequence[Any],
     ) -> int:
-        columns_to_include, selector = self._generate_columns_and_selector(
-            parsed_args, column_names
-        )
-        if selector:
-            data = list(self._compress_iterable(data, selector))
-        self.formatter.emit_one(
-            columns_to_include, data, self.app.stdout, parsed_args
-        )
+        with _memory.phase('columns'):
+            columns_to_include, selector = self._generate_columns_and_selector(
+                parsed_args, column_names
+            )
+            if selector:
+                data = list(self._compress_iterable(data, selector))
+        with _memory.phase('formatter'):
+            self.formatter.emit_one(
+                columns_to_include, data, self._output, parsed_args
+            )
         return 0
 
     def dict2columns(
@@ -71,3 +64,37 @@ class ShowOne(
             return ((), ())
         else:
             return (tuple(data.keys()), tuple(data.values()))
+
+
+class ShowOne(_ShowOneBase, metaclass=abc.ABCMeta):
+    """Command base class for displaying data about a single object."""
+
+    @abc.abstractmethod
+    def take_action(
+        self, parsed_args: argparse.Namespace
+    ) -> tuple[Sequence[str], Iterable[Any]]:
+        """Run command.
+
+        Return a tuple containing the column names and an iterable containing
+        the data to be listed.
+        """
+
+
+class AsyncShowOne(
+    display.AsyncDisplayCommandBase[base_formatters.SingleFormatter],
+    _ShowOneBase,
+    metaclass=abc.ABCMeta,
+):
+    """Command base class for displaying data about a single object from a
+    coroutine.
+    """
+
+    @abc.abstractmethod
+    async def take_action(
+        self, parsed_args: argparse.Namespace
+    ) -> tuple[Sequence[str], Iterable[Any]]:
+        """Run command.
+
+        Return a tuple containing the column names and an iterable containing
+        the data to be listed.
+        """
@@ -27,6 +27,7 @@ from docutils.parsers.rst import directives
 from docutils import statemachine
 import sphinx.application
 
+from cliff import _argparse
 from cliff import app
 from cliff import command
 from cliff import commandmanager
@@ -284,6 +285,8 @@ class AutoprogramCliffDirective(rst.Directive):
     def _drop_ignored_options(
         self, parser: argparse.ArgumentParser, ignored_opts: list[str]
     ) -> None:
+        if isinstance(parser, _argparse.ArgumentParser):
+            parser.add_all_deferred_arguments()
         for action in list(parser._actions):
             for option_string in action.option_strings:
                 if option_string in ignored_opts:
@@ -0,0 +1,426 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+"""Benchmarks of the hot paths of cliff.
+
+Run them with::
+
+    python -m cliff.tests.benchmark [-k PATTERN] [--save FILE]
+                                    [--compare FILE]
+
+Each benchmark is timed until it has run for a minimum time, then again a
+few times, and the median and minimum time of a run are reported. The
+results can be saved as a baseline, and compared with a baseline saved
+earlier on the same machine; the exit code is 1 if a benchmark is slower
+than its baseline by more than the threshold.
+"""
+
+import argparse
+from collections.abc import Callable, Iterator
+import contextlib
+import functools
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import timeit
+from typing import Any, NamedTuple
+
+import stevedore
+
+from cliff import app as application
+from cliff import commandmanager
+from cliff import lister
+from cliff.tests import synthetic
+
+COLUMNS = ('ID', 'Name', 'Size', 'Status', 'Description')
+STATUSES = ('active', 'building', 'error', 'deleted')
+
+
+class ListCommand(lister.Lister):
+    "List synthetic rows."
+
+    rows = 10
+
+    def take_action(
+        self, parsed_args: argparse.Namespace
+    ) -> tuple[tuple[str, ...], Iterator[tuple[Any, ...]]]:
+        return COLUMNS, generate_rows(self.rows)
+
+
+def generate_rows(count: int) -> Iterator[tuple[Any, ...]]:
+    """Generate rows of values of mixed types for :data:`COLUMNS`."""
+    for i in range(count):
+        yield (
+            i,
+            f'resource-{i}',
+            i * 1.5,
+            STATUSES[i % len(STATUSES)],
+            None if i % 7 == 0 else 'x' * (i % 40),
+        )
+
+
+def make_app(
+    cli: synthetic.SyntheticCLI, rows: int, stream: Any
+) -> application.App:
+    """Return the synthetic application, with a ``list`` command.
+
+    :param cli: the synthetic application
+    :param rows: the number of rows listed by ``list``
+    :param stream: the standard output and error of the application
+    """
+    app = cli.make_app(stdin=io.StringIO(), stdout=stream, stderr=stream)
+    list_command = type('ListCommand', (ListCommand,), {'rows': rows})
+    app.command_manager.add_command('list', list_command)
+    return app
+
+
+def run_app(app: application.App, argv: list[str]) -> None:
+    # App.run adds logging handlers to the root logger on each run.
+    root_logger = logging.getLogger('')
+    handlers = root_logger.handlers[:]
+    try:
+        with (
+            contextlib.suppress(SystemExit),
+            contextlib.redirect_stdout(app.stdout),
+        ):
+            app.run(argv)
+    finally:
+        root_logger.handlers = handlers
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # Return the function to time, with the stack closed once timed.
+    setup: Callable[[contextlib.ExitStack], Callable[[], object]]
+
+
+def _synthetic_cli(
+    options: argparse.Namespace, stack: contextlib.ExitStack
+) -> synthetic.SyntheticCLI:
+    return stack.enter_context(
+        synthetic.SyntheticCLI(commands=options.commands, hooks=options.hooks)
+    )
+
+
+def _bench_command_manager(
+    options: argparse.Namespace, stack: contextlib.ExitStack
+) -> Callable[[], object]:
+    cli = _synthetic_cli(options, stack)
+    return functools.partial(commandmanager.CommandManager, cli.namespaces[0])
+
+
+def _bench_find_command(
+    options: argparse.Namespace, stack: contextlib.ExitStack
+) -> Callable[[], object]:
+    cli = _synthetic_cli(options, stack)
+    cmd_mgr = commandmanager.CommandManager(cli.namespaces[0])
+    names = cli.names
+    found = [[*name.split(), '--long', 'value'] for name in names[::-50]]
+    # Abbreviated names are matched against all the commands.
+    partial = [
+        [*name.split()[:-1], name.split()[-1][:3]] for name in names[::-500]
+    ]
+
+    def find() -> None:
+        for argv in found + partial:
+            cmd_mgr.find_command(argv)
+        with contextlib.suppress(ValueError):
+            cmd_mgr.find_command(['unknown', 'command'])
+
+    return find
+
+
+def _bench_app(
+    argv: list[str], rows: int = 10
+) -> Callable[
+    [argparse.Namespace, contextlib.ExitStack], Callable[[], object]
+]:
+    def setup(
+        options: argparse.Namespace, stack: contextlib.ExitStack
+    ) -> Callable[[], object]:
+        cli = _synthetic_cli(options, stack)
+        null = stack.enter_context(open(os.devnull, 'w'))
+
+        def run() -> None:
+            run_app(make_app(cli, rows, null), argv)
+
+        return run
+
+    return setup
+
+
+def _bench_help_command(
+    options: argparse.Namespace, stack: contextlib.ExitStack
+) -> Callable[[], object]:
+    cli = _synthetic_cli(options, stack)
+    argv = ['help', *cli.names[-1].split()]
+    return _bench_app(argv)(options, stack)
+
+
+def _formatters(namespace: str) -> list[tuple[str, Any]]:
+    manager: stevedore.ExtensionManager[Any]
+    manager = stevedore.ExtensionManager(namespace)
+    return sorted((ext.name, ext.plugin) for ext in manager)
+
+
+def _formatter_args(formatter: Any) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    formatter.add_argument_group(parser)
+    return parser.parse_args([])
+
+
+def _bench_list_formatter(
+    formatter_class: Any, rows: int
+) -> Callable[
+    [argparse.Namespace, contextlib.ExitStack], Callable[[], object]
+]:
+    def setup(
+        options: argparse.Namespace, stack: contextlib.ExitStack
+    ) -> Callable[[], object]:
+        formatter = formatter_class()
+        parsed_args = _formatter_args(formatter)
+        null = stack.enter_context(open(os.devnull, 'w'))
+
+        def emit() -> None:
+            formatter.emit_list(
+                COLUMNS, generate_rows(rows), null, parsed_args
+            )
+
+        return emit
+
+    return setup
+
+
+def _bench_show_formatter(
+    formatter_class: Any, fields: int
+) -> Callable[
+    [argparse.Namespace, contextlib.ExitStack], Callable[[], object]
+]:
+    def setup(
+        options: argparse.Namespace, stack: contextlib.ExitStack
+    ) -> Callable[[], object]:
+        formatter = formatter_class()
+        parsed_args = _formatter_args(formatter)
+        null = stack.enter_context(open(os.devnull, 'w'))
+        names = [f'field_{i}' for i in range(fields)]
+        values = [value for row in generate_rows(fields) for value in row][
+            :fields
+        ]
+
+        def emit() -> None:
+            formatter.emit_one(names, values, null, parsed_args)
+
+        return emit
+
+    return setup
+
+
+def benchmarks(options: argparse.Namespace) -> list[Benchmark]:
+    """Return the benchmarks to run with the given options."""
+    setups = [
+        ('command_manager', _bench_command_manager),
+        ('find_command', _bench_find_command),
+        ('app_version', _bench_app(['--version'])),
+        ('app_help', _bench_app(['help'])),
+        ('app_help_command', _bench_help_command),
+        ('app_list', _bench_app(['list'], rows=1000)),
+        ('complete', _bench_app(['complete'])),
+    ]
+    for name, formatter_class in _formatters('cliff.formatter.list'):
+        for rows in options.rows:
+            setups.append(
+                (
+                    f'list_{name}_{rows}',
+                    _bench_list_formatter(formatter_class, rows),
+                )
+            )
+    # A single object has as many fields as the rows of a list, up to 10k.
+    for name, formatter_class in _formatters('cliff.formatter.show'):
+        for fields in options.rows:
+            if fields <= 10000:
+                setups.append(
+                    (
+                        f'show_{name}_{fields}',
+                        _bench_show_formatter(formatter_class, fields),
+                    )
+                )
+    return [
+        Benchmark(name, functools.partial(setup, options))
+        for name, setup in setups
+    ]
+
+
+class Result(NamedTuple):
+    median: float
+    min: float
+    runs: int
+
+
+def measure(
+    func: Callable[[], object], min_time: float, repeat: int
+) -> Result:
+    """Time a function, in seconds per call."""
+    # Warm up the caches, imports included.
+    func()
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed * 10 < min_time else 2
+    times = [elapsed / number]
+    # Long benchmarks are not repeated for longer than the minimum time.
+    runs = max(1, min(repeat, int(min_time * repeat / elapsed)))
+    times += [t / number for t in timer.repeat(runs - 1, number)]
+    return Result(statistics.median(times), min(times), len(times))
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3g} {unit}'
+    return f'{seconds / 1e-9:.3g} ns'
+
+
+def _rows(value: str) -> list[int]:
+    try:
+        rows = [int(v) for v in value.split(',')]
+    except ValueError:
+        rows = []
+    if not rows or min(rows) < 1:
+        raise argparse.ArgumentTypeError(f'invalid row counts: {value!r}')
+    return rows
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m cliff.tests.benchmark',
+        description='Run the benchmarks of cliff.',
+    )
+    parser.add_argument(
+        '-k',
+        dest='pattern',
+        default='',
+        help='only run the benchmarks with this string in their name',
+    )
+    parser.add_argument(
+        '--rows',
+        type=_rows,
+        default=[10, 10000, 1000000],
+        help='comma separated numbers of rows of the formatter benchmarks',
+    )
+    parser.add_argument(
+        '--commands',
+        type=int,
+        default=5000,
+        help='number of commands of the application benchmarks',
+    )
+    parser.add_argument(
+        '--hooks',
+        type=int,
+        default=2,
+        help='number of hooks of each command of the application benchmarks',
+    )
+    parser.add_argument(
+        '--min-time',
+        type=float,
+        default=0.2,
+        help='minimum time to run each benchmark for, in seconds',
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='number of times each benchmark is timed',
+    )
+    parser.add_argument('--save', metavar='FILE', help='save the results')
+    parser.add_argument(
+        '--compare',
+        metavar='FILE',
+        help='compare the results with those saved in a file',
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help=(
+            'slowdown relative to the saved results above which a benchmark '
+            'fails, defaults to 0.1 (10%%)'
+        ),
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None, stdout: Any = None) -> int:
+    stdout = stdout or sys.stdout
+    options = get_parser().parse_args(argv)
+    baseline: dict[str, Any] = {}
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)['results']
+
+    results: dict[str, Result] = {}
+    regressions = 0
+    stdout.write(
+        f'{"benchmark":<28} {"median":>10} {"min":>10} {"baseline":>10}\n'
+    )
+    for benchmark in benchmarks(options):
+        if options.pattern not in benchmark.name:
+            continue
+        with contextlib.ExitStack() as stack:
+            func = benchmark.setup(stack)
+            result = measure(func, options.min_time, options.repeat)
+        results[benchmark.name] = result
+        line = (
+            f'{benchmark.name:<28} {_format_time(result.median):>10} '
+            f'{_format_time(result.min):>10}'
+        )
+        if benchmark.name in baseline:
+            before = baseline[benchmark.name]['median']
+            change = result.median / before - 1
+            line += f' {_format_time(before):>10} {change:+.1%}'
+            if change > options.threshold:
+                regressions += 1
+                line += ' SLOWER'
+        stdout.write(line + '\n')
+        stdout.flush()
+
+    if options.save:
+        with open(options.save, 'w') as f:
+            json.dump(
+                {
+                    'python': platform.python_version(),
+                    'machine': platform.machine(),
+                    'results': {
+                        name: result._asdict()
+                        for name, result in results.items()
+                    },
+                },
+                f,
+                indent=2,
+            )
+    if regressions:
+        stdout.write(
+            f'{regressions} benchmark(s) slower than the baseline by more '
+            f'than {options.threshold:.0%}\n'
+        )
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+"""Synthesize large command line applications for performance tests.
+
+:class:`SyntheticCLI` installs an in-memory distribution, found through
+:mod:`importlib.metadata` like an installed one, with the modules and entry
+points of an application: commands spread over namespaces, the hooks of
+each command, and an :class:`~cliff.app.App` class to load them. Loading,
+running, completing and documenting it takes the same paths as a real
+application, without installing one::
+
+    cli = self.useFixture(synthetic.SyntheticCLI(commands=2000, hooks=2))
+    app = cli.make_app()
+    app.run(['help'])
+
+The application can also be documented with ``.. autoprogram-cliff::``,
+using :attr:`SyntheticCLI.app_class` and :attr:`SyntheticCLI.namespaces`.
+"""
+
+import argparse
+from collections.abc import Sequence
+import importlib.abc
+import importlib.machinery
+import importlib.metadata
+import os
+import pathlib
+import sys
+import types
+from typing import Any
+import uuid
+
+import fixtures
+from stevedore import _cache
+
+from cliff import app
+from cliff import command
+from cliff import commandmanager
+from cliff import hooks
+
+NOUNS = ('server', 'volume', 'network', 'image', 'flavor', 'port', 'router')
+VERBS = ('create', 'delete', 'list', 'show', 'set', 'unset', 'add', 'remove')
+
+
+def command_names(count: int) -> list[str]:
+    """Return the names of a number of commands of two and three words.
+
+    No word of the names is the prefix of another, so that each name can be
+    abbreviated.
+    """
+    names = []
+    width = len(str(count))
+    for i in range(count):
+        noun, verb = divmod(i, len(VERBS))
+        word = f'{NOUNS[noun % len(NOUNS)]}{noun // len(NOUNS):0{width}}'
+        if noun % 3 == 0:
+            word += ' group'
+        names.append(f'{word} {VERBS[verb]}')
+    return names
+
+
+class SyntheticApp(app.App):
+    """Application loading the commands of :class:`SyntheticCLI`."""
+
+    NAME = 'synthetic'
+    namespaces: Sequence[str] = ()
+
+    def __init__(self, **kwargs: Any) -> None:
+        cmd_mgr = commandmanager.CommandManager(self.namespaces[0])
+        for namespace in self.namespaces[1:]:
+            cmd_mgr.load_commands(namespace)
+        super().__init__(
+            description='Synthetic application',
+            version='1.0',
+            command_manager=cmd_mgr,
+            **kwargs,
+        )
+
+
+def _command_class(
+    name: str, index: int, arguments: int, module: str
+) -> type[command.Command]:
+    def get_parser(
+        self: command.Command, prog_name: str
+    ) -> argparse.ArgumentParser:
+        parser = command.Command.get_parser(self, prog_name)
+        parser.add_argument('name', metavar='<name>', help='Name to act on')
+        for i in range(arguments):
+            parser.add_argument(
+                f'--option-{i}',
+                metavar=f'<value-{i}>',
+                help=f'Option {i} of the {name} command',
+            )
+        return parser
+
+    def take_action(
+        self: command.Command, parsed_args: argparse.Namespace
+    ) -> int:
+        self.app.stdout.write(f'{name} {parsed_args.name}\n')
+        return 0
+
+    return type(
+        f'Command{index}',
+        (command.Command,),
+        {
+            '__doc__': f'Run {name}.\n\nSynthetic command number {index}.',
+            '__module__': module,
+            'get_parser': get_parser,
+            'take_action': take_action,
+        },
+    )
+
+
+def _hook_class(index: int, module: str) -> type[hooks.CommandHook]:
+    def get_parser(
+        self: hooks.CommandHook, parser: argparse.ArgumentParser
+    ) -> argparse.ArgumentParser:
+        parser.add_argument(f'--hook-{index}', help=f'Option of hook {index}')
+        return parser
+
+    def get_epilog(self: hooks.CommandHook) -> str:
+        return f'Extended by hook {index}.'
+
+    def before(
+        self: hooks.CommandHook, parsed_args: argparse.Namespace
+    ) -> argparse.Namespace:
+        return parsed_args
+
+    def after(
+        self: hooks.CommandHook,
+        parsed_args: argparse.Namespace,
+        return_code: int,
+    ) -> int:
+        return return_code
+
+    return type(
+        f'Hook{index}',
+        (hooks.CommandHook,),
+        {
+            '__module__': module,
+            'get_parser': get_parser,
+            'get_epilog': get_epilog,
+            'before': before,
+            'after': after,
+        },
+    )
+
+
+class _Distribution(importlib.metadata.Distribution):
+    def __init__(self, files: dict[str, str]) -> None:
+        self._files = files
+
+    def read_text(self, filename: str) -> str | None:
+        return self._files.get(filename)
+
+    def locate_file(self, path: str | os.PathLike[str]) -> pathlib.Path:
+        # There are no files, the modules are generated by _Finder.
+        return pathlib.Path(path)
+
+
+class _Finder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def __init__(self, cli: 'SyntheticCLI') -> None:
+        self.cli = cli
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: types.ModuleType | None = None,
+    ) -> importlib.machinery.ModuleSpec | None:
+        package = self.cli.package
+        if fullname != package and not fullname.startswith(package + '.'):
+            return None
+        return importlib.machinery.ModuleSpec(
+            fullname, self, is_package=fullname == package
+        )
+
+    def find_distributions(
+        self,
+        context: importlib.metadata.DistributionFinder.Context = (
+            importlib.metadata.DistributionFinder.Context()
+        ),
+    ) -> list[importlib.metadata.Distribution]:
+        name = context.name
+        if name is None or name.replace('-', '_') == self.cli.package:
+            return [self.cli.distribution]
+        return []
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        self.cli._generate(module)
+
+
+class SyntheticCLI(fixtures.Fixture):
+    """Install a synthetic application in memory.
+
+    :param commands: the number of commands
+    :param namespaces: the number of namespaces the commands are spread over
+    :param hooks: the number of hooks of each command, each adding an
+        option and an epilog
+    :param arguments: the number of options of each command, besides a
+        positional argument
+    """
+
+    def __init__(
+        self,
+        commands: int = 100,
+        namespaces: int = 1,
+        hooks: int = 0,
+        arguments: int = 5,
+    ) -> None:
+        super().__init__()
+        self.commands = commands
+        self.hooks = hooks
+        self.arguments = arguments
+        #: The name of the package of the modules and of the distribution.
+        self.package = f'cliff_synthetic_{uuid.uuid4().hex[:12]}'
+        #: The entry point namespaces of the commands.
+        self.namespaces = [f'{self.package}.{i}' for i in range(namespaces)]
+        #: The dotted path of the application class.
+        self.app_class = f'{self.package}.app.App'
+        #: The names of the commands.
+        self.names = command_names(commands)
+        self.distribution = _Distribution(
+            {
+                'METADATA': (
+                    'Metadata-Version: 2.1\n'
+                    f'Name: {self.package}\n'
+                    'Version: 1.0\n'
+                ),
+                'entry_points.txt': self._entry_points(),
+                'top_level.txt': f'{self.package}\n',
+            }
+        )
+
+    def namespace_of(self, index: int) -> int:
+        """Return the index of the namespace of a command."""
+        return index % len(self.namespaces)
+
+    def _entry_points(self) -> str:
+        groups: dict[str, list[str]] = {ns: [] for ns in self.namespaces}
+        for i, name in enumerate(self.names):
+            ns = self.namespace_of(i)
+            groups[self.namespaces[ns]].append(
+                f'{name.replace(" ", "_")} = '
+                f'{self.package}.commands{ns}:Command{i}'
+            )
+            if self.hooks:
+                # Hooks are found in the namespace of the application.
+                group = f'{self.namespaces[0]}.{name.replace(" ", "_")}'
+                groups[group] = [
+                    f'hook{h} = {self.package}.hooks:Hook{h}'
+                    for h in range(self.hooks)
+                ]
+        return ''.join(
+            f'[{group}]\n' + ''.join(f'{line}\n' for line in lines)
+            for group, lines in groups.items()
+        )
+
+    def _generate(self, module: types.ModuleType) -> None:
+        # Generate the classes of a module when it is imported.
+        name = module.__name__[len(self.package) + 1 :]
+        if name == 'app':
+            app_class = type(
+                'App',
+                (SyntheticApp,),
+                {'__module__': module.__name__, 'namespaces': self.namespaces},
+            )
+            setattr(module, 'App', app_class)
+        elif name == 'hooks':
+            for h in range(self.hooks):
+                setattr(module, f'Hook{h}', _hook_class(h, module.__name__))
+        elif name.startswith('commands'):
+            ns = int(name[len('commands') :])
+            for i, cmd_name in enumerate(self.names):
+                if self.namespace_of(i) == ns:
+                    setattr(
+                        module,
+                        f'Command{i}',
+                        _command_class(
+                            cmd_name, i, self.arguments, module.__name__
+                        ),
+                    )
+
+    def _setUp(self) -> None:
+        finder = _Finder(self)
+        sys.meta_path.append(finder)
+        self.addCleanup(sys.meta_path.remove, finder)
+        self.addCleanup(self._unload)
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        # Entry points are cached for each value of sys.path, which the
+        # distribution does not change, and for each namespace by stevedore,
+        # so use new caches while it is installed. The entry points of its
+        # namespaces must not outlive it.
+        self.useFixture(
+            fixtures.MonkeyPatch(
+                'stevedore._cache.get_group_all',
+                _cache.Cache(cache_dir).get_group_all,
+            )
+        )
+        self.useFixture(
+            fixtures.MonkeyPatch(
+                'stevedore.ExtensionManager.ENTRY_POINT_CACHE', {}
+            )
+        )
+        self.useFixture(
+            fixtures.EnvironmentVariable('XDG_CACHE_HOME', cache_dir)
+        )
+        self.useFixture(
+            fixtures.MonkeyPatch('cliff.command._dists_by_mods', None)
+        )
+        self.useFixture(
+            fixtures.MonkeyPatch('cliff.command._hook_managers', {})
+        )
+
+    def _unload(self) -> None:
+        for name in list(sys.modules):
+            if name == self.package or name.startswith(self.package + '.'):
+                del sys.modules[name]
+
+    def make_app(self, **kwargs: Any) -> app.App:
+        """Return an instance of the application.
+
+        :param kwargs: arguments of :class:`cliff.app.App`, such as the
+            standard streams
+        """
+        module = importlib.import_module(f'{self.package}.app')
+        app_class: type[SyntheticApp] = module.App
+        return app_class(**kwargs)
@@ -10,6 +10,9 @@
 #  License for the specific language governing permissions and limitations
 #  under the License.
 
+import concurrent.futures
+import functools
+import threading
 import unittest
 
 from cliff import _argparse
@@ -46,3 +49,87 @@ class TestArgparse(unittest.TestCase):
         parser = _argparse.ArgumentParser(conflict_handler='ignore')
         group = parser.add_mutually_exclusive_group()
         group.add_mutually_exclusive_group()
+
+
+class TestDeferredArguments(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.parser = _argparse.ArgumentParser(prog='test')
+        self.format = self.parser.add_argument(
+            '-f', '--format', choices=['a', 'b'], default='a'
+        )
+        for name in ('a', 'b'):
+            self.parser.add_deferred_arguments(
+                self.format, name, functools.partial(self.add_options, name)
+            )
+        self.parser.add_argument('--last')
+
+    @staticmethod
+    def add_options(name, parser):
+        group = parser.add_argument_group(f'{name} options')
+        group.add_argument(f'--{name}-width')
+
+    def groups(self):
+        return [group.title for group in self.parser._action_groups]
+
+    def options(self):
+        return [action.dest for action in self.parser._actions]
+
+    def test_default_choice(self):
+        args = self.parser.parse_args(['--a-width', '1'])
+        self.assertEqual('1', args.a_width)
+        self.assertNotIn('b options', self.groups())
+        self.assertFalse(hasattr(args, 'b_width'))
+
+    def test_selected_choice(self):
+        for argv in (
+            ['-f', 'b'],
+            ['-fb'],
+            ['--format', 'b'],
+            ['--format=b'],
+            ['--form', 'b'],
+        ):
+            self.setUp()
+            args = self.parser.parse_args(argv + ['--b-width', '2'])
+            self.assertEqual('2', args.b_width)
+            self.assertNotIn('a options', self.groups())
+
+    def test_options_of_other_choice(self):
+        # Options of the choices which are not selected are still accepted.
+        args = self.parser.parse_args(['-f', 'b', '--a-width', '1'])
+        self.assertEqual('1', args.a_width)
+        self.assertIn('a options', self.groups())
+
+    def test_after_double_dash(self):
+        self.parser.add_argument('rest', nargs='*')
+        args = self.parser.parse_args(['--', '-f', 'b'])
+        self.assertEqual(['-f', 'b'], args.rest)
+        self.assertNotIn('b options', self.groups())
+
+    def test_help_shows_all(self):
+        help_text = self.parser.format_help()
+        self.assertIn('--a-width', help_text)
+        self.assertIn('--b-width', help_text)
+
+    def test_original_order(self):
+        self.parser.parse_args(['-f', 'b'])
+        self.parser.add_all_deferred_arguments()
+        self.assertEqual(
+            ['help', 'format', 'a_width', 'b_width', 'last'], self.options()
+        )
+        self.assertEqual(
+            ['positional arguments', 'options', 'a options', 'b options'],
+            self.groups(),
+        )
+
+    def test_parse_concurrently(self):
+        barrier = threading.Barrier(8, timeout=10)
+
+        def parse(index):
+            name = 'ab'[index % 2]
+            barrier.wait()
+            args = self.parser.parse_args(['-f', name, f'--{name}-width', '1'])
+            return getattr(args, f'{name}_width')
+
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            self.assertEqual(['1'] * 8, list(executor.map(parse, range(8))))
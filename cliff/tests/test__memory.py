@@ -0,0 +1,142 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import io
+import tracemalloc
+
+from cliff import _memory
+from cliff import app as application
+from cliff import commandmanager
+from cliff import lister
+from cliff.tests import base
+
+
+class Allocating(lister.Lister):
+    "List rows allocated in take_action."
+
+    def take_action(self, parsed_args):
+        return ('ID', 'Name'), [(i, f'name-{i}') for i in range(1000)]
+
+
+class TestProfiler(base.TestBase):
+    def test_phase_not_profiling(self):
+        with _memory.phase('take_action'):
+            pass
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_phases(self):
+        profiler = _memory.Profiler()
+        with profiler.tracing():
+            self.assertTrue(tracemalloc.is_tracing())
+            with _memory.phase('first'):
+                data = [str(i) for i in range(1000)]
+            with _memory.phase('second'):
+                pass
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(
+            ['first', 'second'], [phase.name for phase in profiler.phases]
+        )
+        first = profiler.phases[0]
+        self.assertGreater(first.allocated, 1000 * 40)
+        self.assertGreaterEqual(first.peak, first.allocated)
+        self.assertGreaterEqual(profiler.peak, first.peak)
+        self.assertEqual(__file__, first.top[0].traceback[0].filename)
+        self.assertEqual(1000, len(data))
+
+    def test_nested_phases(self):
+        profiler = _memory.Profiler()
+        with profiler.tracing():
+            with _memory.phase('outer'):
+                with _memory.phase('inner'):
+                    pass
+        self.assertEqual(['outer'], [phase.name for phase in profiler.phases])
+
+    def test_limit(self):
+        profiler = _memory.Profiler(limit=1)
+        with profiler.tracing():
+            with _memory.phase('first'):
+                data = [[str(i)] for i in range(100)]
+        self.assertEqual(1, len(profiler.phases[0].top))
+        self.assertEqual(100, len(data))
+
+    def test_already_tracing(self):
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        with _memory.Profiler().tracing():
+            pass
+        self.assertTrue(tracemalloc.is_tracing())
+
+    def test_report(self):
+        profiler = _memory.Profiler()
+        with profiler.tracing():
+            with _memory.phase('first'):
+                data = [str(i) for i in range(1000)]
+        stream = io.StringIO()
+        profiler.report(stream, 'thing list')
+        lines = stream.getvalue().splitlines()
+        self.assertEqual("memory profile of 'thing list':", lines[0])
+        self.assertRegex(lines[1], r'^  first: peak \d+\.\d KiB, allocated')
+        self.assertIn(f'{__file__}:', lines[2])
+        self.assertIn('  peak traced memory ', lines[-1])
+        self.assertEqual(1000, len(data))
+
+    def test_format_size(self):
+        self.assertEqual('512 B', _memory._format_size(512))
+        self.assertEqual('1.5 KiB', _memory._format_size(1536))
+        self.assertEqual('2.0 MiB', _memory._format_size(2 * 1024**2))
+        self.assertEqual('3.0 GiB', _memory._format_size(3 * 1024**3))
+
+
+class TestAppMemoryProfiling(base.TestBase):
+    def make_app(self, **kwargs):
+        cmd_mgr = commandmanager.CommandManager('cliff.tests')
+        cmd_mgr.add_command('allocate', Allocating)
+        self.output = io.StringIO()
+        self.errors = io.StringIO()
+        return application.App(
+            'testing',
+            '1',
+            cmd_mgr,
+            stdout=self.output,
+            stderr=self.errors,
+            **kwargs,
+        )
+
+    def test_profile_memory(self):
+        app = self.make_app(memory_profiling=True)
+        result = app.run(
+            ['--profile-memory', 'allocate', '--sort-column', 'Name', '-c']
+            + ['ID', '-f', 'value']
+        )
+        self.assertEqual(0, result)
+        report = self.errors.getvalue()
+        self.assertIn("memory profile of 'allocate':", report)
+        phases = [
+            line.split(':')[0].strip()
+            for line in report.splitlines()
+            if line.startswith('  ') and not line.startswith('    ')
+        ]
+        self.assertEqual(
+            ['take_action', 'sort', 'columns', 'formatter', 'peak traced'],
+            [phase.split(' memory')[0] for phase in phases],
+        )
+        self.assertIn('999\n', self.output.getvalue())
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_not_profiling(self):
+        app = self.make_app(memory_profiling=True)
+        self.assertEqual(0, app.run(['allocate']))
+        self.assertEqual('', self.errors.getvalue())
+
+    def test_option_requires_memory_profiling(self):
+        app = self.make_app()
+        self.assertNotIn('--profile-memory', app.parser.format_help())
@@ -13,11 +13,16 @@
 
 import argparse
 import io
+import os
+import subprocess
 from unittest import mock
 
+import fixtures
+
 from cliff import app as application
 from cliff import command as c_cmd
 from cliff import commandmanager
+from cliff import lister
 from cliff.tests import base
 from cliff.tests import utils as test_utils
 from cliff import utils
@@ -527,3 +532,379 @@ class TestIO(base.TestBase):
         self.assertIs(sys.stdin, app.stdin)
         self.assertIs(sys.stdout, app.stdout)
         self.assertIs(io, app.stderr)
+
+
+class WritingCommand(c_cmd.Command):
+    "Write numbered lines."
+
+    # Size of the standard output file once the lines are written.
+    written = 0
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument('count', type=int)
+        return parser
+
+    def take_action(self, parsed_args):
+        for i in range(parsed_args.count):
+            self.app.stdout.write(f'line {i}\n')
+        type(self).written = os.fstat(sys.stdout.fileno()).st_size
+        return 0
+
+
+class TestOutputBuffering(base.TestBase):
+    def make_app(self, stdout, **kwargs):
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', stdout))
+        cmd_mgr = commandmanager.CommandManager('cliff.tests')
+        cmd_mgr.add_command('write', WritingCommand)
+        return application.App(
+            'testing', '1', cmd_mgr, stderr=io.StringIO(), **kwargs
+        )
+
+    def test_buffered(self):
+        path = self.useFixture(fixtures.TempDir()).join('out')
+        with open(path, 'w', buffering=1) as stdout:
+            stdout.write('before\n')
+            app = self.make_app(stdout, output_buffer_size=1 << 16)
+            self.assertIsNot(stdout, app.stdout)
+            self.assertEqual(0, app.run(['write', '100']))
+            # Nothing was written before the command was done.
+            self.assertEqual(len('before\n'), WritingCommand.written)
+        with open(path) as f:
+            self.assertEqual(
+                'before\n' + ''.join(f'line {i}\n' for i in range(100)),
+                f.read(),
+            )
+
+    def test_not_buffered(self):
+        path = self.useFixture(fixtures.TempDir()).join('out')
+        with open(path, 'w') as stdout:
+            app = self.make_app(stdout)
+            self.assertIs(stdout, app.stdout)
+            stream = io.StringIO()
+            app = self.make_app(stream, output_buffer_size=1 << 16)
+            self.assertIs(stream, app.stdout)
+
+    def test_not_buffered_tty(self):
+        path = self.useFixture(fixtures.TempDir()).join('out')
+        with open(path, 'w') as stdout:
+            with mock.patch.object(stdout, 'isatty', return_value=True):
+                app = self.make_app(stdout, output_buffer_size=1 << 16)
+            self.assertIs(stdout, app.stdout)
+
+    def test_broken_pipe(self):
+        read_fd, write_fd = os.pipe()
+        os.close(read_fd)
+        with open(write_fd, 'w') as stdout:
+            app = self.make_app(stdout, output_buffer_size=1 << 16)
+            self.assertEqual(141, app.run(['write', '10']))
+            # What is left in the buffer is discarded.
+            app.stdout.write('more\n')
+            app.stdout.flush()
+            stdout.write('more\n')
+            stdout.flush()
+
+    def test_broken_pipe_while_writing(self):
+        read_fd, write_fd = os.pipe()
+        os.close(read_fd)
+        with open(write_fd, 'w') as stdout:
+            app = self.make_app(stdout, output_buffer_size=1024)
+            self.assertEqual(141, app.run(['write', '1000']))
+            app.stdout.flush()
+
+
+class CountingCommand(c_cmd.Command):
+    "Count the parsers built."
+
+    parsers_built = 0
+
+    def get_parser(self, prog_name):
+        type(self).parsers_built += 1
+        parser = super().get_parser(prog_name)
+        parser.add_argument('--value')
+        return parser
+
+    def take_action(self, parsed_args):
+        self.app.stdout.write(f'{parsed_args.value}\n')
+        return 0
+
+
+class TestParserCache(base.TestBase):
+    def make_app(self, **kwargs):
+        self.addCleanup(setattr, CountingCommand, 'parsers_built', 0)
+        cmd_mgr = commandmanager.CommandManager('cliff.tests')
+        cmd_mgr.add_command('count', CountingCommand)
+        stdout = io.StringIO()
+        app = application.App('testing', '1', cmd_mgr, stdout=stdout, **kwargs)
+        app.options = argparse.Namespace(debug=False)
+        return app, stdout
+
+    def test_parser_not_cached_by_default(self):
+        app, stdout = self.make_app()
+        app.run_subcommand(['count', '--value', 'a'])
+        app.run_subcommand(['count', '--value', 'b'])
+        self.assertEqual(2, CountingCommand.parsers_built)
+        self.assertEqual('a\nb\n', stdout.getvalue())
+
+    def test_parser_cached(self):
+        app, stdout = self.make_app(cache_parsers=True)
+        app.run_subcommand(['count', '--value', 'a'])
+        app.run_subcommand(['count', '--value', 'b'])
+        app.run_subcommand(['count'])
+        self.assertEqual(1, CountingCommand.parsers_built)
+        self.assertEqual('a\nb\nNone\n', stdout.getvalue())
+
+    def test_parser_cache_keyed_on_prog_name(self):
+        app, stdout = self.make_app(cache_parsers=True)
+        app.run_subcommand(['count', '--value', 'a'])
+        app.interactive_mode = True
+        app.run_subcommand(['count', '--value', 'b'])
+        self.assertEqual(2, CountingCommand.parsers_built)
+
+    def test_parser_cache_keyed_on_hooks(self):
+        app, stdout = self.make_app(cache_parsers=True)
+        cmd = CountingCommand(app, None)
+        first = app.get_command_parser(cmd, 'test count')
+        self.assertIs(first, app.get_command_parser(cmd, 'test count'))
+        hook = mock.Mock(obj=None)
+        hook.name = 'new-hook'
+        with mock.patch.object(cmd, '_hooks', [hook]):
+            second = app.get_command_parser(cmd, 'test count')
+        self.assertIsNot(first, second)
+
+
+class FailingCommand(c_cmd.Command):
+    "Fail with the given exit code."
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument('code', type=int)
+        return parser
+
+    def take_action(self, parsed_args):
+        return parsed_args.code
+
+
+class AsyncListCommand(lister.AsyncLister):
+    "List the given values."
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument('values', nargs='*')
+        return parser
+
+    async def rows(self, values):
+        for value in values:
+            yield (value,)
+
+    async def take_action(self, parsed_args):
+        return ('value',), self.rows(parsed_args.values)
+
+
+class BinaryCommand(test_utils.SleepCommand):
+    "Sleep, then print a message as text and as bytes."
+
+    def take_action(self, parsed_args):
+        super().take_action(parsed_args)
+        self.app.stdout.flush()
+        self.app.stdout.buffer.write(f'<{parsed_args.message}>\n'.encode())
+        return 0
+
+
+class TestBatchMode(base.TestBase):
+    def make_app(self, lines=''):
+        cmd_mgr = commandmanager.CommandManager('cliff.tests')
+        cmd_mgr.add_command('count', CountingCommand)
+        cmd_mgr.add_command('fail', FailingCommand)
+        cmd_mgr.add_command('sleep', test_utils.SleepCommand)
+        cmd_mgr.add_command('rendezvous', test_utils.RendezvousCommand)
+        cmd_mgr.add_command('async list', AsyncListCommand)
+        cmd_mgr.add_command('binary', BinaryCommand)
+        self.out = io.StringIO()
+        app = application.App(
+            'testing',
+            '1',
+            cmd_mgr,
+            stdin=io.StringIO(lines),
+            stdout=self.out,
+            stderr=mock.Mock(),
+            batch_mode=True,
+        )
+        self.initialize_app = self.useFixture(
+            fixtures.MockPatchObject(app, 'initialize_app')
+        ).mock
+        self.interact = self.useFixture(
+            fixtures.MockPatchObject(app, 'interact')
+        ).mock
+        return app
+
+    def test_batch_option_requires_batch_mode(self):
+        app = application.App(
+            'testing', '1', commandmanager.CommandManager('cliff.tests')
+        )
+        self.assertNotIn('--batch', app.parser.format_help())
+
+    def test_batch_stdin(self):
+        app = self.make_app(
+            'count --value a\n'
+            '\n'
+            '# a comment\n'
+            'count --value "b c"  # trailing comment\n'
+        )
+        self.assertEqual(0, app.run(['--batch', '-']))
+        self.assertEqual('a\nb c\n', self.out.getvalue())
+        self.initialize_app.assert_called_once_with([])
+        self.interact.assert_not_called()
+        self.assertFalse(app.interactive_mode)
+
+    def test_batch_file(self):
+        app = self.make_app()
+        path = self.useFixture(fixtures.TempDir()).join('commands')
+        with open(path, 'w') as f:
+            f.write('count --value a\ncount --value b\n')
+        self.assertEqual(0, app.run(['--batch', path]))
+        self.assertEqual('a\nb\n', self.out.getvalue())
+
+    def test_batch_missing_file(self):
+        app = self.make_app()
+        path = self.useFixture(fixtures.TempDir()).join('missing')
+        self.assertEqual(1, app.run(['--batch', path]))
+
+    def test_batch_reports_first_failure(self):
+        app = self.make_app(
+            'fail 3\ncount --value a\nfail 4\nfail --bad\ncount --value b\n'
+        )
+        with mock.patch.object(app.LOG, 'error') as log_error:
+            self.assertEqual(3, app.run(['--batch', '-']))
+        self.assertEqual('a\nb\n', self.out.getvalue())
+        self.assertEqual(
+            [
+                mock.call('line %d: %r exited with %d', 1, 'fail 3', 3),
+                mock.call('line %d: %r exited with %d', 3, 'fail 4', 4),
+                mock.call('line %d: %r exited with %d', 4, 'fail --bad', 2),
+            ],
+            log_error.call_args_list,
+        )
+
+    def test_batch_errexit(self):
+        app = self.make_app('count --value a\nfail 3\ncount --value b\n')
+        self.assertEqual(3, app.run(['--batch', '-', '--batch-errexit']))
+        self.assertEqual('a\n', self.out.getvalue())
+
+    def test_batch_syntax_error(self):
+        app = self.make_app('count --value "a\ncount --value b\n')
+        self.assertEqual(2, app.run(['--batch', '-']))
+        self.assertEqual('b\n', self.out.getvalue())
+
+    def test_batch_with_command(self):
+        app = self.make_app()
+        self.assertRaises(
+            SystemExit, app.run, ['--batch', '-', 'count', '--value', 'a']
+        )
+        self.assertEqual('', self.out.getvalue())
+
+    def test_batch_workers_keep_output_order(self):
+        app = self.make_app(
+            'sleep 0.2 first\nsleep 0.1 second\nfail 3\nsleep 0 third\n'
+        )
+        self.assertEqual(3, app.run(['--batch', '-', '--batch-workers', '4']))
+        self.assertEqual('first\nsecond\nthird\n', self.out.getvalue())
+        self.assertIs(self.out, app.stdout)
+
+    def test_batch_workers_run_concurrently(self):
+        path = self.useFixture(fixtures.TempDir()).path
+        app = self.make_app(
+            ''.join(f'rendezvous {path} 4 {name}\n' for name in 'abcd')
+        )
+        self.assertEqual(0, app.run(['--batch', '-', '--batch-workers', '4']))
+        self.assertEqual('a\nb\nc\nd\n', self.out.getvalue())
+
+    def test_batch_workers_async_output_order(self):
+        app = self.make_app(
+            'sleep 0.1 a\nasync list -f value b c\nsleep 0 d\n'
+        )
+        self.assertEqual(0, app.run(['--batch', '-', '--batch-workers', '3']))
+        self.assertEqual('a\nb\nc\nd\n', self.out.getvalue())
+
+    def test_batch_workers_binary_output_order(self):
+        app = self.make_app('binary 0.2 a\nbinary 0 b\nsleep 0 c\n')
+        output = io.BytesIO()
+        app.stdout = io.TextIOWrapper(output, encoding='utf-8')
+        self.assertEqual(0, app.run(['--batch', '-', '--batch-workers', '3']))
+        app.stdout.flush()
+        self.assertEqual(b'a\n<a>\nb\n<b>\nc\n', output.getvalue())
+
+    def test_batch_workers_errexit(self):
+        app = self.make_app('sleep 0 a\nfail 3\n' + 'sleep 0 b\n' * 20)
+        self.assertEqual(
+            3,
+            app.run(
+                ['--batch', '-', '--batch-errexit', '--batch-workers', '2']
+            ),
+        )
+        self.assertEqual('a\n', self.out.getvalue())
+        self.assertIs(self.out, app.stdout)
+
+    def test_batch_workers_errexit_stops_commands(self):
+        run = []
+
+        class RecordingCommand(CountingCommand):
+            def take_action(self, parsed_args):
+                run.append(parsed_args.value)
+                return 0
+
+        app = self.make_app(
+            'fail 3\n' + ''.join(f'record --value {i}\n' for i in range(20))
+        )
+        app.command_manager.add_command('record', RecordingCommand)
+        self.assertEqual(
+            3,
+            app.run(
+                ['--batch', '-', '--batch-errexit', '--batch-workers', '2']
+            ),
+        )
+        # Only the command running alongside the failed one may have run.
+        self.assertLessEqual(set(run), {'0'})
+
+    def test_batch_invalid_workers(self):
+        app = self.make_app()
+        self.assertRaises(ValueError, app.run_batch, [], workers=0)
+
+    def test_batch_workers_option_invalid(self):
+        for value in ('0', '-1', 'x'):
+            app = self.make_app()
+            stderr = io.StringIO()
+            with mock.patch('sys.stderr', stderr):
+                ex = self.assertRaises(
+                    SystemExit,
+                    app.run,
+                    ['--batch', '-', '--batch-workers', value],
+                )
+            self.assertEqual(2, ex.code)
+            self.assertIn(
+                f"invalid positive integer: '{value}'", stderr.getvalue()
+            )
+
+
+class TestImports(base.TestBase):
+    def assertNotImported(self, module):
+        result = subprocess.run(
+            [
+                sys.executable,
+                '-c',
+                f'import sys, cliff.app; print({module!r} in sys.modules)',
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        self.assertEqual('False\n', result.stdout)
+
+    def test_asyncio_not_imported(self):
+        self.assertNotImported('asyncio')
+
+    def test_concurrent_futures_not_imported(self):
+        self.assertNotImported('concurrent.futures')
+
+    def test_daemon_not_imported(self):
+        self.assertNotImported('cliff.daemon')
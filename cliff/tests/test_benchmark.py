@@ -0,0 +1,64 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import contextlib
+import io
+import json
+
+import fixtures
+
+from cliff.tests import base
+from cliff.tests import benchmark
+
+QUICK = ['--rows', '10', '--commands', '20', '--min-time', '0']
+
+
+class TestBenchmark(base.TestBase):
+    def test_benchmarks_run(self):
+        options = benchmark.get_parser().parse_args(QUICK)
+        names = []
+        for bench in benchmark.benchmarks(options):
+            names.append(bench.name)
+            with contextlib.ExitStack() as stack:
+                bench.setup(stack)()
+        self.assertIn('command_manager', names)
+        self.assertIn('app_list', names)
+        self.assertIn('list_table_10', names)
+        self.assertIn('show_yaml_10', names)
+
+    def test_compare(self):
+        path = self.useFixture(fixtures.TempDir()).join('baseline.json')
+        argv = QUICK + ['--repeat', '1', '-k', 'list_value']
+        out = io.StringIO()
+        self.assertEqual(0, benchmark.main(argv + ['--save', path], out))
+        with open(path) as f:
+            results = json.load(f)['results']
+        self.assertEqual(['list_value_10'], list(results))
+        self.assertEqual(1, results['list_value_10']['runs'])
+
+        out = io.StringIO()
+        self.assertEqual(
+            0,
+            benchmark.main(
+                argv + ['--compare', path, '--threshold', '1000'], out
+            ),
+        )
+        self.assertIn('list_value_10 ', out.getvalue())
+        self.assertNotIn('SLOWER', out.getvalue())
+        out = io.StringIO()
+        self.assertEqual(
+            1,
+            benchmark.main(
+                argv + ['--compare', path, '--threshold', '-1'], out
+            ),
+        )
+        self.assertIn('SLOWER', out.getvalue())
@@ -11,10 +11,21 @@
 #  under the License.
 
 import argparse
+import asyncio
+import concurrent.futures
 import functools
+import importlib.metadata
+import os
+import sys
+from unittest import mock
+
+import fixtures
+
+from stevedore import extension
 
 from cliff import app
 from cliff import command
+from cliff import hooks
 from cliff.tests import base
 from cliff.tests import utils
 
@@ -107,6 +118,100 @@ class TestBasicValues(base.TestBase):
         assert cmd.run(argparse.Namespace()) == 42
 
 
+class TestEpilog(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.app = app.App(
+            'foo', '1.0', utils.TestCommandManager(utils.TEST_NAMESPACE)
+        )
+
+    def test_epilog_built_with_help(self):
+        cmd = TestCommand(self.app, None)
+        with mock.patch.object(
+            cmd, 'get_epilog', return_value='the epilog'
+        ) as get_epilog:
+            parser = cmd.get_parser('NAME')
+            get_epilog.assert_not_called()
+            self.assertIn('the epilog', parser.format_help())
+            self.assertEqual('the epilog', parser.epilog)
+        get_epilog.assert_called_once_with()
+
+
+class TestDistributionsCache(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.get_cache_dir = self.useFixture(
+            fixtures.MockPatchObject(
+                command, '_get_cache_dir', return_value=self.cache_dir
+            )
+        ).mock
+        self.packages_distributions = self.useFixture(
+            fixtures.MockPatchObject(
+                command,
+                'packages_distributions',
+                return_value={'cliff': ['cliff'], 'ns': ['ns-a', 'ns-b']},
+            )
+        ).mock
+
+    def test_cached(self):
+        expected = {'cliff': 'cliff', 'ns': 'ns-a'}
+        self.assertEqual(expected, command._load_distributions_by_modules())
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+        self.assertEqual(expected, command._load_distributions_by_modules())
+        self.packages_distributions.assert_called_once_with()
+
+    def test_path_changed(self):
+        command._load_distributions_by_modules()
+        path = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.MonkeyPatch('sys.path', sys.path + [path]))
+        command._load_distributions_by_modules()
+        self.assertEqual(2, self.packages_distributions.call_count)
+
+    def test_other_path_changed(self):
+        # Files created in a directory without distributions, such as that
+        # of a script, do not change the cache.
+        path = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.MonkeyPatch('sys.path', sys.path + [path]))
+        command._load_distributions_by_modules()
+        with open(os.path.join(path, 'script.py'), 'w'):
+            pass
+        os.utime(path, (0, 0))
+        command._load_distributions_by_modules()
+        self.packages_distributions.assert_called_once_with()
+
+    def test_distributions_changed(self):
+        path = self.useFixture(fixtures.TempDir()).path
+        os.mkdir(os.path.join(path, 'a-1.0.dist-info'))
+        os.utime(path, (0, 0))
+        self.useFixture(fixtures.MonkeyPatch('sys.path', sys.path + [path]))
+        command._load_distributions_by_modules()
+        os.mkdir(os.path.join(path, 'b-1.0.dist-info'))
+        command._load_distributions_by_modules()
+        self.assertEqual(2, self.packages_distributions.call_count)
+        # The older cache of the interpreter is removed.
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+    def test_other_interpreter_kept(self):
+        command._load_distributions_by_modules()
+        self.useFixture(
+            fixtures.MonkeyPatch('sys.executable', '/other/python')
+        )
+        command._load_distributions_by_modules()
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+    def test_unwritable(self):
+        with open(os.path.join(self.cache_dir, 'file'), 'w'):
+            pass
+        self.get_cache_dir.return_value = os.path.join(
+            self.cache_dir, 'file', 'cliff'
+        )
+        self.assertEqual(
+            {'cliff': 'cliff', 'ns': 'ns-a'},
+            command._load_distributions_by_modules(),
+        )
+
+
 expected_help_message = """
   long_help_argument    Create a NIC on the server.
                         Specify option multiple times to create multiple NICs.
@@ -232,3 +337,76 @@ class TestArgumentParser(base.TestBase):
         cmd.conflict_handler = 'wrong'
         with self.assertRaises(ValueError):
             cmd.get_parser('NAME')
+
+
+class TestAsyncCommand(command.AsyncCommand):
+    """Description of async command."""
+
+    async def take_action(self, parsed_args):
+        self.loop = asyncio.get_running_loop()
+        await asyncio.sleep(0)
+        return 42
+
+
+class AsyncHook(hooks.CommandHook):
+    def get_parser(self, parser):
+        return parser
+
+    def get_epilog(self):
+        return None
+
+    async def before(self, parsed_args):  # type: ignore[override]
+        await asyncio.sleep(0)
+        parsed_args.before = True
+        return parsed_args
+
+    def after(self, parsed_args, return_code):
+        return return_code + 1
+
+
+class TestAsync(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.app = app.App(
+            'foo', '1.0', utils.TestCommandManager(utils.TEST_NAMESPACE)
+        )
+        self.addCleanup(self.app._close_event_loop)
+
+    def test_run(self):
+        cmd = TestAsyncCommand(self.app, None)
+        self.assertEqual(42, cmd.run(argparse.Namespace()))
+
+    def test_event_loop_shared(self):
+        first = TestAsyncCommand(self.app, None)
+        first.run(argparse.Namespace())
+        second = TestAsyncCommand(self.app, None)
+        second.run(argparse.Namespace())
+        self.assertIs(first.loop, second.loop)
+        self.app._close_event_loop()
+        self.assertTrue(first.loop.is_closed())
+
+    def test_event_loop_in_thread(self):
+        cmd = TestAsyncCommand(self.app, None)
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            result = executor.submit(cmd.run, argparse.Namespace()).result()
+        self.assertEqual(42, result)
+        self.assertTrue(cmd.loop.is_closed())
+
+    def test_async_hooks(self):
+        cmd = TestAsyncCommand(self.app, None)
+        hook = AsyncHook(cmd)
+        cmd._hooks = extension.ExtensionManager.make_test_instance(
+            [
+                extension.Extension(
+                    'hook',
+                    importlib.metadata.EntryPoint(
+                        'hook', 'cliff.tests:AsyncHook', 'cliff.tests.hooks'
+                    ),
+                    AsyncHook,
+                    hook,
+                )
+            ]
+        )
+        parsed_args = argparse.Namespace()
+        self.assertEqual(43, cmd.run(parsed_args))
+        self.assertTrue(parsed_args.before)
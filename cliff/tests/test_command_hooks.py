@@ -13,6 +13,8 @@
 import argparse
 import importlib.metadata
 
+import fixtures
+
 from cliff import app as application
 from cliff import command
 from cliff import commandmanager
@@ -214,14 +216,56 @@ class TestCommandLoadHooks(base.TestBase):
         cmd = TestCommand(app, None)
         self.assertEqual([], cmd._hooks)
 
+    def setUp(self):
+        super().setUp()
+        self.useFixture(
+            fixtures.MockPatchObject(command, '_hook_managers', {})
+        )
+
     @mock.patch('stevedore.extension.ExtensionManager')
     def test_app_and_name(self, em):
         app = make_app()
-        TestCommand(app, None, cmd_name='test')
-        print(em.mock_calls[0])
-        name, args, kwargs = em.mock_calls[0]
-        print(kwargs)
-        self.assertEqual('cliff.tests.test', kwargs['namespace'])
+        cmd = TestCommand(app, None, cmd_name='test')
+        em.assert_not_called()
+        list(cmd._hooks)
+        em.assert_called_once_with(namespace='cliff.tests.test')
+
+    def test_hook_classes_shared(self):
+        app = make_app()
+        mgr = extension.ExtensionManager.make_test_instance(
+            [make_extension('hook', TestHook, None)]
+        )
+        with mock.patch(
+            'stevedore.extension.ExtensionManager', return_value=mgr
+        ) as em:
+            first = TestCommand(app, None, cmd_name='test')
+            second = TestCommand(app, None, cmd_name='test')
+            first_hooks = list(first._hooks)
+            second_hooks = list(second._hooks)
+        em.assert_called_once_with(namespace='cliff.tests.test')
+        self.assertEqual(['hook'], [h.name for h in first_hooks])
+        self.assertIsInstance(first_hooks[0].obj, TestHook)
+        self.assertEqual([first], [h.obj.cmd for h in first_hooks if h.obj])
+        self.assertEqual([second], [h.obj.cmd for h in second_hooks if h.obj])
+        self.assertIsNone(mgr['hook'].obj)
+
+    def test_hook_failing_to_load(self):
+        class BrokenHook(TestHook):
+            def __init__(self, command):
+                raise RuntimeError('broken')
+
+        app = make_app()
+        mgr = extension.ExtensionManager.make_test_instance(
+            [
+                make_extension('broken', BrokenHook, None),
+                make_extension('hook', TestHook, None),
+            ]
+        )
+        with mock.patch(
+            'stevedore.extension.ExtensionManager', return_value=mgr
+        ):
+            cmd = TestCommand(app, None, cmd_name='test')
+            self.assertEqual(['hook'], [h.name for h in cmd._hooks])
 
 
 class TestHooks(base.TestBase):
@@ -10,10 +10,13 @@
 #  License for the specific language governing permissions and limitations
 #  under the License.
 
+import random
+import string
 from unittest import mock
 
 from cliff import command
 from cliff import commandmanager
+from cliff import utils as cliff_utils
 from cliff.tests import base
 from cliff.tests import utils
 
@@ -194,6 +197,42 @@ class TestLoad(base.TestBase):
         )
 
 
+class TestPreload(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.mgr = commandmanager.CommandManager()
+        self.one = mock.Mock()
+        self.two = mock.Mock()
+        self.broken = mock.Mock(**{'load.side_effect': ImportError('gone')})
+        self.mgr.commands = {
+            'one': self.one,
+            'two': self.two,
+            'broken': self.broken,
+        }
+
+    def test_preload(self):
+        self.assertEqual(['one', 'two'], self.mgr.preload())
+        for ep in (self.one, self.two, self.broken):
+            ep.load.assert_called_once_with()
+        self.assertIn(
+            "could not preload command 'broken': gone", self.logger.output
+        )
+
+    def test_preload_names(self):
+        self.assertEqual(['two'], self.mgr.preload(['two']))
+        self.one.load.assert_not_called()
+        self.assertRaises(ValueError, self.mgr.preload, ['three'])
+
+    def test_preload_unsafe(self):
+        with mock.patch.object(
+            self.mgr,
+            'is_preload_safe',
+            side_effect=lambda name, ep: name != 'two',
+        ):
+            self.assertEqual(['one'], self.mgr.preload(['one', 'two']))
+        self.two.load.assert_not_called()
+
+
 class FauxCommand(command.Command):
     def take_action(self, parsed_args):
         return 0
@@ -416,3 +455,99 @@ class TestCommandManagerGroups(base.TestBase):
                 [mock.call('test'), mock.call('test')]
             )
             self.assertEqual(['one', 'cmd two'], cmds)
+
+
+def _fuzzy_matches_by_scan(name, names):
+    # Scan every command, as App.get_fuzzy_matches used to.
+    dist = []
+    for candidate in sorted(names):
+        if candidate.startswith(name):
+            dist.append((0, candidate))
+            continue
+        prefix = candidate.split(' ')[0]
+        distance = cliff_utils.damerau_levenshtein(
+            name, prefix, cliff_utils.COST
+        )
+        dist.append((distance + 1, candidate))
+    matches = []
+    match_distance = 0
+    for distance, candidate in sorted(dist):
+        if distance > match_distance:
+            if match_distance:
+                break
+            match_distance = distance
+        matches.append(candidate)
+    return matches
+
+
+class TestFuzzyMatches(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.mgr = commandmanager.CommandManager('test')
+        for name in (
+            'server create',
+            'server delete',
+            'server list',
+            'service list',
+            'user create',
+            'user list',
+            'usage show',
+            'volume list',
+            'flavor list',
+            'network list',
+            'net',
+        ):
+            self.mgr.add_command(name, FauxCommand)
+
+    def test_prefix_and_closest(self):
+        self.assertEqual(
+            ['server create', 'server delete', 'server list', 'service list'],
+            self.mgr.get_fuzzy_matches('server'),
+        )
+        self.assertEqual(
+            ['user create', 'user list'], self.mgr.get_fuzzy_matches('usr')
+        )
+
+    def test_same_as_scan(self):
+        rand = random.Random(42)
+        names = [name for name, _ in self.mgr]
+        words = {name.split(' ')[0] for name in names}
+        typos = ['', 'x', 'serv', 'sevrer', 'lsit', 'volumes', 'netwrok']
+        for word in sorted(words):
+            for _ in range(5):
+                chars = list(word)
+                index = rand.randrange(len(chars))
+                operation = rand.choice('isdw')
+                if operation == 'i':
+                    chars.insert(index, rand.choice(string.ascii_lowercase))
+                elif operation == 's':
+                    chars[index] = rand.choice(string.ascii_lowercase)
+                elif operation == 'd':
+                    del chars[index]
+                elif index:
+                    chars[index - 1], chars[index] = (
+                        chars[index],
+                        chars[index - 1],
+                    )
+                typos.append(''.join(chars))
+        for typo in typos:
+            self.assertEqual(
+                _fuzzy_matches_by_scan(typo, names),
+                self.mgr.get_fuzzy_matches(typo),
+                typo,
+            )
+
+    def test_index_follows_commands(self):
+        self.assertEqual(
+            ['volume list', 'flavor list'], self.mgr.get_fuzzy_matches('vol')
+        )
+        self.mgr.add_command('volume create', FauxCommand)
+        self.assertEqual(
+            ['volume create', 'volume list', 'flavor list'],
+            self.mgr.get_fuzzy_matches('vol'),
+        )
+        del self.mgr.commands['volume list']
+        self.assertEqual(
+            ['volume create', 'flavor list'],
+            self.mgr.get_fuzzy_matches('vol'),
+        )
@@ -0,0 +1,376 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import concurrent.futures
+import io
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from unittest import mock
+
+import fixtures
+
+from cliff import app as application
+from cliff import command
+from cliff import commandmanager
+from cliff import daemon
+from cliff.tests import base
+from cliff.tests import utils as test_utils
+
+
+class EchoCommand(command.Command):
+    "Print the arguments."
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument('words', nargs='*')
+        return parser
+
+    def take_action(self, parsed_args):
+        self.app.stdout.write(' '.join(parsed_args.words) + '\n')
+        return 0
+
+
+class EnvCommand(command.Command):
+    "Print the working directory and an environment variable."
+
+    def take_action(self, parsed_args):
+        print(os.getcwd(), os.environ.get('CLIFF_TEST_VALUE'))
+        return 0
+
+
+class UpperCommand(command.Command):
+    "Copy standard input to standard output in upper case."
+
+    def take_action(self, parsed_args):
+        self.app.stdout.write(self.app.stdin.read().upper())
+        return 0
+
+
+class ExitCommand(command.Command):
+    "Exit with the given code."
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument('code', type=int)
+        return parser
+
+    def take_action(self, parsed_args):
+        return parsed_args.code
+
+
+class FailCommand(command.Command):
+    "Raise an exception."
+
+    def take_action(self, parsed_args):
+        raise RuntimeError('forwarded failure')
+
+
+class TerminateCommand(command.Command):
+    "Send SIGTERM to the process."
+
+    def take_action(self, parsed_args):
+        os.kill(os.getpid(), signal.SIGTERM)
+        time.sleep(10)
+        return 0
+
+
+def make_app(**kwargs):
+    cmd_mgr = commandmanager.CommandManager('cliff.tests')
+    cmd_mgr.add_command('echo', EchoCommand)
+    cmd_mgr.add_command('env', EnvCommand)
+    cmd_mgr.add_command('upper', UpperCommand)
+    cmd_mgr.add_command('exit', ExitCommand)
+    cmd_mgr.add_command('fail', FailCommand)
+    cmd_mgr.add_command('rendezvous', test_utils.RendezvousCommand)
+    cmd_mgr.add_command('terminate', TerminateCommand)
+    return application.App(
+        'testing',
+        '1',
+        cmd_mgr,
+        stdin=io.StringIO(),
+        stdout=io.StringIO(),
+        stderr=io.StringIO(),
+        daemon_mode=True,
+        **kwargs,
+    )
+
+
+class TestDaemon(base.TestBase):
+    server_class = daemon.DaemonServer
+
+    def setUp(self):
+        super().setUp()
+        self.tempdir = self.useFixture(fixtures.TempDir())
+        self.socket_path = self.tempdir.join('cli.sock')
+        self.app = make_app()
+        self.app.options, _ = self.app.parser.parse_known_args([])
+        self.server = self.server_class(self.app, self.socket_path)
+        thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.01}
+        )
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.shutdown)
+
+    def forward(self, argv, stdin='', name='std'):
+        with (
+            open(self.tempdir.join(f'{name}in'), 'w+') as fin,
+            open(self.tempdir.join(f'{name}out'), 'w+') as fout,
+            open(self.tempdir.join(f'{name}err'), 'w+') as ferr,
+        ):
+            fin.write(stdin)
+            fin.seek(0)
+            result = daemon.forward(
+                self.socket_path, argv, stdin=fin, stdout=fout, stderr=ferr
+            )
+            fout.seek(0)
+            ferr.seek(0)
+            return result, fout.read(), ferr.read()
+
+    def test_forward(self):
+        self.assertEqual((0, 'a b\n', ''), self.forward(['echo', 'a', 'b']))
+        self.assertEqual((0, 'c\n', ''), self.forward(['echo', 'c']))
+
+    def test_forward_stdin(self):
+        self.assertEqual((0, 'ABC\n', ''), self.forward(['upper'], 'abc\n'))
+
+    def test_forward_exit_code(self):
+        self.assertEqual(3, self.forward(['exit', '3'])[0])
+
+    def test_forward_argument_error(self):
+        result, out, err = self.forward(['exit', 'x'])
+        self.assertEqual(2, result)
+        self.assertIn("invalid int value: 'x'", err)
+
+    def test_forward_unknown_command(self):
+        result, out, err = self.forward(['uper'])
+        self.assertEqual(2, result)
+        self.assertIn('Did you mean one of these?\n  upper\n', out)
+
+    def test_forward_logging(self):
+        result, out, err = self.forward(['fail'])
+        self.assertEqual(1, result)
+        self.assertEqual('forwarded failure\n', err)
+
+    def test_forward_global_options(self):
+        result, out, err = self.forward(['--debug', 'fail'])
+        self.assertEqual(1, result)
+        self.assertIn('Traceback', err)
+        self.assertFalse(self.app.options.debug)
+
+    def test_forward_interactive(self):
+        result, out, err = self.forward([])
+        self.assertEqual(2, result)
+        self.assertIn('interactive mode cannot be forwarded', err)
+
+    def test_forward_restores_state(self):
+        stdout = self.app.stdout
+        self.forward(['echo', 'a'])
+        self.assertIs(stdout, self.app.stdout)
+        self.assertIs(self.stdout, sys.stdout)
+        self.assertEqual('', stdout.getvalue())
+
+    def test_run_command_environment(self):
+        cwd = os.getcwd()
+        stdout = io.StringIO()
+        self.assertEqual(
+            0,
+            self.server.run_command(
+                ['env'],
+                self.tempdir.path,
+                {'CLIFF_TEST_VALUE': 'forwarded'},
+                io.StringIO(),
+                stdout,
+                io.StringIO(),
+            ),
+        )
+        self.assertEqual(f'{self.tempdir.path} forwarded\n', stdout.getvalue())
+        self.assertEqual(cwd, os.getcwd())
+        self.assertNotIn('CLIFF_TEST_VALUE', os.environ)
+
+    def test_daemon_unavailable(self):
+        self.assertRaises(
+            daemon.DaemonUnavailable,
+            daemon.forward,
+            self.tempdir.join('missing.sock'),
+            ['echo'],
+        )
+
+    def test_forward_rejected(self):
+        self.useFixture(
+            fixtures.MockPatchObject(
+                self.server, 'verify_request', return_value=False
+            )
+        )
+        self.assertRaises(ConnectionError, self.forward, ['echo'])
+
+    def test_forward_terminated(self):
+        with mock.patch.object(
+            self.app,
+            'run_subcommand',
+            side_effect=application._Terminated(143),
+        ):
+            self.assertRaises(
+                application._Terminated,
+                self.server.run_command,
+                ['echo'],
+                self.tempdir.path,
+                {},
+                io.StringIO(),
+                io.StringIO(),
+                io.StringIO(),
+            )
+
+    def test_idle_client(self):
+        # A client sending nothing does not keep the others waiting.
+        self.server.request_timeout = 0.1
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+            idle.connect(self.socket_path)
+            self.assertEqual((0, 'a\n', ''), self.forward(['echo', 'a']))
+
+    def test_socket_permissions(self):
+        self.assertEqual(0o600, os.stat(self.socket_path).st_mode & 0o777)
+
+    def test_already_listening(self):
+        self.assertRaises(
+            OSError, daemon.DaemonServer, self.app, self.socket_path
+        )
+
+
+class TestForkingDaemon(TestDaemon):
+    server_class = daemon.ForkingDaemonServer
+
+    def test_already_listening(self):
+        # The server forks a child for the connection of the probe while
+        # the probe is open, so the child holds both ends of the connection
+        # and only gives up waiting for a request after the timeout.
+        self.server.request_timeout = 0.1
+        super().test_already_listening()
+
+    def test_forward_concurrently(self):
+        # Each command waits until all three are running.
+        path = self.useFixture(fixtures.TempDir()).path
+        with concurrent.futures.ThreadPoolExecutor(3) as executor:
+            results = list(
+                executor.map(
+                    lambda name: self.forward(
+                        ['rendezvous', path, '3', name], name=name
+                    ),
+                    ['a', 'b', 'c'],
+                )
+            )
+        self.assertEqual(
+            [(0, 'a\n', ''), (0, 'b\n', ''), (0, 'c\n', '')], results
+        )
+
+
+class TestDaemonServer(base.TestBase):
+    def test_replace_stale_socket(self):
+        path = self.useFixture(fixtures.TempDir()).join('cli.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(path)
+        with daemon.DaemonServer(make_app(), path):
+            self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path))
+
+    def test_daemon_option_requires_daemon_mode(self):
+        app = application.App(
+            'testing', '1', commandmanager.CommandManager('cliff.tests')
+        )
+        self.assertNotIn('--daemon', app.parser.format_help())
+
+    def test_run_serves(self):
+        app = make_app()
+        with (
+            mock.patch.object(app, 'initialize_app') as initialize_app,
+            mock.patch.object(app, 'serve', return_value=0) as serve,
+        ):
+            self.assertEqual(0, app.run(['--daemon', 'cli.sock']))
+        initialize_app.assert_called_once_with([])
+        serve.assert_called_once_with('cli.sock', fork=False)
+        self.assertFalse(app.interactive_mode)
+
+    def test_run_serves_fork(self):
+        app = make_app()
+        with (
+            mock.patch.object(app, 'initialize_app'),
+            mock.patch.object(app, 'serve', return_value=0) as serve,
+        ):
+            app.run(['--daemon', 'cli.sock', '--daemon-fork'])
+        serve.assert_called_once_with('cli.sock', fork=True)
+
+    def test_serve_preloads(self):
+        app = make_app()
+        path = self.useFixture(fixtures.TempDir()).join('cli.sock')
+        with (
+            mock.patch.object(app.command_manager, 'preload') as preload,
+            mock.patch.object(
+                daemon.DaemonServer, 'serve_forever'
+            ) as serve_forever,
+        ):
+            self.assertEqual(0, app.serve(path))
+        preload.assert_called_once_with()
+        serve_forever.assert_called_once_with()
+        self.assertFalse(os.path.exists(path))
+
+    def test_serve_terminated(self):
+        app = make_app()
+        path = self.useFixture(fixtures.TempDir()).join('cli.sock')
+        errors = []
+
+        def forward():
+            with open(os.devnull, 'w+') as null:
+                while True:
+                    try:
+                        daemon.forward(path, ['terminate'], null, null, null)
+                    except daemon.DaemonUnavailable:
+                        # The daemon is not listening yet.
+                        time.sleep(0.01)
+                    except ConnectionError as err:
+                        errors.append(err)
+                        break
+                    else:
+                        break
+
+        thread = threading.Thread(target=forward)
+        thread.start()
+        self.addCleanup(thread.join)
+        ex = self.assertRaises(SystemExit, app.serve, path)
+        self.assertEqual(128 + signal.SIGTERM, ex.code)
+        self.assertFalse(os.path.exists(path))
+        thread.join()
+        self.assertEqual(1, len(errors))
+
+    def test_main_connection_closed(self):
+        stderr = io.StringIO()
+        with (
+            mock.patch.object(
+                daemon, 'forward', side_effect=ConnectionError('closed')
+            ),
+            mock.patch('sys.stderr', stderr),
+        ):
+            self.assertEqual(1, daemon.main(['cli.sock', 'echo']))
+        self.assertEqual(
+            'daemon on cli.sock closed the connection: closed\n',
+            stderr.getvalue(),
+        )
+
+    def test_daemon_with_command(self):
+        app = make_app()
+        self.assertRaises(
+            SystemExit, app.run, ['--daemon', 'cli.sock', 'echo']
+        )
@@ -0,0 +1,52 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+from cliff.formatters import base as base_formatters
+from cliff.tests import base
+from cliff.tests import test_columns
+
+
+class TestColumnarRows(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.rows = base_formatters.ColumnarRows(
+            [[1, 2, 3], ['a', 'b', 'c'], [None, 'x', 'y']]
+        )
+
+    def test_rows(self):
+        self.assertEqual(3, len(self.rows))
+        self.assertEqual(
+            [(1, 'a', None), (2, 'b', 'x'), (3, 'c', 'y')], list(self.rows)
+        )
+        self.assertEqual((2, 'b', 'x'), self.rows[1])
+        self.assertEqual((3, 'c', 'y'), self.rows[-1])
+        self.assertEqual([(2, 'b', 'x')], list(self.rows[1:2]))
+        self.assertRaises(IndexError, self.rows.__getitem__, 3)
+
+    def test_empty(self):
+        rows = base_formatters.ColumnarRows([])
+        self.assertEqual(0, len(rows))
+        self.assertEqual([], list(rows))
+
+    def test_select(self):
+        rows = self.rows.select([True, False, True])
+        self.assertEqual([[1, 2, 3], [None, 'x', 'y']], rows.columns)
+
+
+class TestMachineReadable(base.TestBase):
+    def test_machine_readable(self):
+        self.assertEqual(
+            [1, ['a', 'b'], None],
+            base_formatters.machine_readable(
+                [1, test_columns.FauxColumn(['a', 'b']), None]
+            ),
+        )
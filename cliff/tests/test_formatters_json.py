@@ -14,6 +14,7 @@ import io
 import json
 from unittest import mock
 
+from cliff.formatters import base as base_formatters
 from cliff.formatters import json_format
 from cliff.tests import base
 from cliff.tests import test_columns
@@ -95,6 +96,118 @@ class TestJSONFormatter(base.TestBase):
         actual = json.loads(value)
         self.assertEqual(expected, actual)
 
+    def test_list_empty(self):
+        sf = json_format.JSONFormatter()
+        args = mock.Mock()
+        for noindent in (True, False):
+            args.noindent = noindent
+            output = io.StringIO()
+            sf.emit_list(('a', 'b'), [], output, args)
+            self.assertEqual('[]\n', output.getvalue())
+
+    def test_list_streamed(self):
+        sf = json_format.JSONFormatter()
+        sf.STREAM_ROWS = 2
+        output = io.StringIO()
+        written = []
+
+        def rows():
+            for i in range(5):
+                written.append(output.getvalue())
+                yield (i, [i])
+
+        args = mock.Mock()
+        args.noindent = False
+        sf.emit_list(('a', 'b'), rows(), output, args)
+        expected = (
+            json.dumps([{'a': i, 'b': [i]} for i in range(5)], indent=2) + '\n'
+        )
+        self.assertEqual(expected, output.getvalue())
+        # The first batch is written before the next rows are generated.
+        self.assertEqual(['', ''], written[:2])
+        self.assertTrue(expected.startswith(written[2]))
+        self.assertIn('"a": 1', written[2])
+        self.assertNotIn('"a": 2', written[2])
+
+    def test_list_batches(self):
+        sf = json_format.JSONFormatter()
+        sf.BATCH_ROWS = 2
+        c = ('a', 'b')
+        d = [(i, {'c': [i]}) for i in range(5)]
+        args = mock.Mock()
+        for noindent in (True, False):
+            args.noindent = noindent
+            indent = None if noindent else 2
+            for data in (d, iter(d)):
+                output = io.StringIO()
+                sf.emit_list(c, data, output, args)
+                self.assertEqual(
+                    json.dumps([dict(zip(c, row)) for row in d], indent=indent)
+                    + '\n',
+                    output.getvalue(),
+                )
+
+    def emit_layout(self, layout, data, noindent=False):
+        sf = json_format.JSONFormatter()
+        sf.BATCH_ROWS = 2
+        args = mock.Mock()
+        args.noindent = noindent
+        args.json_layout = layout
+        output = io.StringIO()
+        sf.emit_list(('a', 'b'), data, output, args)
+        return output.getvalue()
+
+    def test_list_table_layout(self):
+        d = [(i, {'c': [i]}) for i in range(5)]
+        expected = {'columns': ['a', 'b'], 'data': [list(row) for row in d]}
+        for noindent in (True, False):
+            indent = None if noindent else 2
+            for data in (d, iter(d)):
+                self.assertEqual(
+                    json.dumps(expected, indent=indent) + '\n',
+                    self.emit_layout('table', data, noindent),
+                )
+
+    def test_list_table_layout_empty(self):
+        self.assertEqual(
+            '{"columns": ["a", "b"], "data": []}\n',
+            self.emit_layout('table', [], True),
+        )
+
+    def test_list_table_layout_streamed(self):
+        written = []
+
+        def rows():
+            yield ('A1', 'B1')
+            written.append(output.getvalue())
+            yield ('A2', 'B2')
+
+        sf = json_format.JSONFormatter()
+        sf.STREAM_ROWS = 1
+        args = mock.Mock()
+        args.noindent = True
+        args.json_layout = 'table'
+        output = io.StringIO()
+        sf.emit_list(('a', 'b'), rows(), output, args)
+        self.assertEqual(
+            ['{"columns": ["a", "b"], "data": [["A1", "B1"]'], written
+        )
+
+    def test_list_columns_layout(self):
+        d = [(i, test_columns.FauxColumn([str(i)])) for i in range(3)]
+        expected = {'a': [0, 1, 2], 'b': [['0'], ['1'], ['2']]}
+        for noindent in (True, False):
+            indent = None if noindent else 2
+            for data in (
+                d,
+                iter(d),
+                base_formatters.ColumnarRows([list(c) for c in zip(*d)]),
+            ):
+                self.assertEqual(
+                    json.dumps(expected, indent=indent) + '\n',
+                    self.emit_layout('columns', data, noindent),
+                )
+
     def test_formattablecolumn_list(self):
         sf = json_format.JSONFormatter()
         c = ('a', 'b', 'c')
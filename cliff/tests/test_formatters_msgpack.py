@@ -0,0 +1,106 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import argparse
+import io
+import sys
+from unittest import mock
+
+import msgpack
+
+from cliff.formatters import msgpack_format
+from cliff.tests import base
+from cliff.tests import test_columns
+
+
+class TestMsgPackFormatter(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.formatter = msgpack_format.MsgPackFormatter()
+        self.buffer = io.BytesIO()
+        self.output = io.TextIOWrapper(self.buffer, write_through=True)
+
+    def unpack(self):
+        return list(msgpack.Unpacker(io.BytesIO(self.buffer.getvalue())))
+
+    def test_list(self):
+        c = ('a', 'b', 'c')
+        d = (('A1', 1, None), ('A2', 2.5, [1, 2]))
+        self.formatter.emit_list(c, d, self.output, argparse.Namespace())
+        self.assertEqual(
+            [['a', 'b', 'c'], ['A1', 1, None], ['A2', 2.5, [1, 2]]],
+            self.unpack(),
+        )
+
+    def test_list_empty(self):
+        self.formatter.emit_list(('a',), [], self.output, argparse.Namespace())
+        self.assertEqual([['a']], self.unpack())
+
+    def test_formattablecolumn_list(self):
+        c = ('a', 'b')
+        d = (('A1', test_columns.FauxColumn(['the', 'value'])),)
+        self.formatter.emit_list(c, d, self.output, argparse.Namespace())
+        self.assertEqual([['a', 'b'], ['A1', ['the', 'value']]], self.unpack())
+
+    def test_list_streamed(self):
+        def rows():
+            yield ('A1',)
+            # The header and the first row can be read already.
+            self.assertEqual([['a'], ['A1']], self.unpack())
+            yield ('A2',)
+
+        self.formatter.emit_list(
+            ('a',), rows(), self.output, argparse.Namespace()
+        )
+        self.assertEqual([['a'], ['A1'], ['A2']], self.unpack())
+
+    def test_one(self):
+        c = ('a', 'b', 'c')
+        d = ('A', test_columns.FauxColumn(['the', 'value']), {'k': 'v'})
+        self.formatter.emit_one(c, d, self.output, argparse.Namespace())
+        self.assertEqual(
+            [['a', 'b', 'c'], ['A', ['the', 'value'], {'k': 'v'}]],
+            self.unpack(),
+        )
+
+    def test_text_written_first(self):
+        buffer = io.BytesIO()
+        output = io.TextIOWrapper(buffer)
+        output.write('text')
+        self.formatter.emit_one(('a',), ('A',), output, argparse.Namespace())
+        self.assertEqual(
+            b'text' + msgpack.packb(['a']) + msgpack.packb(['A']),
+            buffer.getvalue(),
+        )
+
+    def test_text_output(self):
+        self.assertRaisesRegex(
+            RuntimeError,
+            'requires a binary output',
+            self.formatter.emit_one,
+            ('a',),
+            ('A',),
+            io.StringIO(),
+            argparse.Namespace(),
+        )
+
+    def test_msgpack_missing(self):
+        with mock.patch.dict(sys.modules, {'msgpack': None}):
+            self.assertRaisesRegex(
+                RuntimeError,
+                'requires the msgpack package',
+                self.formatter.emit_list,
+                ('a',),
+                [],
+                self.output,
+                argparse.Namespace(),
+            )
@@ -645,3 +645,115 @@ class TestFieldWidths(base.TestBase):
         self.assertEqual((76, 76), (tf._width_info(80, 1)))
         self.assertEqual((79, 0), (tf._width_info(80, 0)))
         self.assertEqual((0, 0), (tf._width_info(0, 80)))
+
+
+class TTYStringIO(StringIO):
+    def isatty(self):
+        return True
+
+
+class TestProgressive(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.formatter = table.TableFormatter()
+        self.formatter.PROGRESSIVE_ROWS = 2
+        parser = argparse.ArgumentParser()
+        self.formatter.add_argument_group(parser)
+        self.parsed_args = parser.parse_args(['--progressive'])
+
+    def emit(self, data, output=None):
+        output = output or TTYStringIO()
+        self.formatter.emit_list(
+            ('ID', 'Name'), data, output, self.parsed_args
+        )
+        return output.getvalue()
+
+    def test_progressive(self):
+        data = [(1, 'a'), (2, 'bb'), (3, 'c'), (4, 'd'), (5, 'e')]
+        self.assertEqual(
+            _table_tester_helper(('ID', 'Name'), data), self.emit(iter(data))
+        )
+
+    def test_widen(self):
+        expected = textwrap.dedent(
+            '''\
+        +----+------+
+        | ID | Name |
+        +----+------+
+        |  1 | a    |
+        |  2 | bb   |
+        +----+------+
+        +----+-----------+
+        | ID | Name      |
+        +----+-----------+
+        |  3 | ccccccccc |
+        |  4 | multi     |
+        |    | line      |
+        |  5 | e         |
+        +----+-----------+
+        '''
+        )
+        data = [
+            (1, 'a'),
+            (2, 'bb'),
+            (3, 'c' * 9),
+            (4, 'multi\nline'),
+            (5, 'e'),
+        ]
+        self.assertEqual(expected, self.emit(iter(data)))
+
+    def test_rows_printed_early(self):
+        output = TTYStringIO()
+
+        def generate():
+            yield (1, 'a')
+            yield (2, 'b')
+            # The first rows are out before the next one is generated
+            self.assertIn('|  2 | b    |\n', output.getvalue())
+            yield (3, 'c')
+
+        self.emit(generate(), output)
+        self.assertTrue(
+            output.getvalue().endswith('|  3 | c    |\n+----+------+\n')
+        )
+
+    def test_first_window(self):
+        data = [(1, 'a')]
+        self.assertEqual(
+            _table_tester_helper(('ID', 'Name'), data), self.emit(iter(data))
+        )
+
+    def test_empty(self):
+        self.assertEqual('\n', self.emit(iter([])))
+
+    def test_sequence(self):
+        # The rows of a sequence have all arrived, there is no need to
+        # print them progressively.
+        data = [(1, 'a'), (2, 'bb'), (3, 'c' * 9)]
+        self.assertEqual(
+            _table_tester_helper(('ID', 'Name'), data), self.emit(data)
+        )
+
+    def test_not_tty(self):
+        output = StringIO()
+
+        def generate():
+            yield (1, 'a')
+            yield (2, 'b')
+            self.assertEqual('', output.getvalue())
+            yield (3, 'c')
+
+        self.emit(generate(), output)
+        self.assertIn('|  3 | c    |\n', output.getvalue())
+
+    @mock.patch.dict(os.environ, {'CLIFF_PROGRESSIVE_TABLE': '1'})
+    def test_envvar(self):
+        parser = argparse.ArgumentParser()
+        self.formatter.add_argument_group(parser)
+        self.assertTrue(parser.parse_args([]).progressive)
+
+    @mock.patch.dict(os.environ, {'CLIFF_PROGRESSIVE_TABLE': 'true'})
+    def test_envvar_word(self):
+        parser = argparse.ArgumentParser()
+        self.formatter.add_argument_group(parser)
+        self.assertTrue(parser.parse_args([]).progressive)
@@ -85,6 +85,37 @@ class TestYAMLFormatter(base.TestBase):
         actual = yaml.safe_load(output.getvalue())
         self.assertEqual(expected, actual)
 
+    def test_list_empty(self):
+        sf = yaml_format.YAMLFormatter()
+        output = StringIO()
+        sf.emit_list(('a', 'b'), [], output, mock.Mock())
+        self.assertEqual('[]\n', output.getvalue())
+
+    def test_list_streamed(self):
+        sf = yaml_format.YAMLFormatter()
+        sf.STREAM_ROWS = 2
+        output = StringIO()
+        written = []
+
+        def rows():
+            for i in range(5):
+                written.append(output.getvalue())
+                yield (i, [i])
+
+        sf.emit_list(('a', 'b'), rows(), output, mock.Mock())
+        self.assertEqual(
+            yaml.safe_dump(
+                [{'a': i, 'b': [i]} for i in range(5)],
+                default_flow_style=False,
+            ),
+            output.getvalue(),
+        )
+        # The first batch is written before the next rows are generated.
+        self.assertEqual(
+            ['', '', '- a: 0\n  b:\n  - 0\n- a: 1\n  b:\n  - 1\n'],
+            written[:3],
+        )
+
     def test_formattablecolumn_list(self):
         sf = yaml_format.YAMLFormatter()
         c = ('a', 'b', 'c')
@@ -10,9 +10,16 @@
 #  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #  License for the specific language governing permissions and limitations
 #  under the License.
+import io
+from unittest import mock
 
+import cmd2
+import fixtures
 
 from cliff import app
+from cliff import command
+from cliff import commandmanager
+from cliff import lister
 from cliff.interactive import InteractiveApp
 from cliff.tests import base
 from cliff.tests import utils
@@ -65,3 +72,209 @@ class TestInteractive(base.TestBase):
         command_names = set(['show file', 'show folder', 'list all'])
         app = self.make_interactive_app(True, *command_names)
         self.assertTrue(app.errexit)
+
+
+class CountingCommand(command.Command):
+    "Print an option, counting the parsers built."
+
+    parsers_built = 0
+
+    def get_parser(self, prog_name):
+        CountingCommand.parsers_built += 1
+        parser = super().get_parser(prog_name)
+        parser.add_argument('--value')
+        return parser
+
+    def take_action(self, parsed_args):
+        self.app.stdout.write(f'{parsed_args.value}\n')
+        return 0
+
+
+class OtherCommand(command.Command):
+    "Print a message."
+
+    def take_action(self, parsed_args):
+        self.app.stdout.write('other\n')
+        return 0
+
+
+class TestInteractiveCommandCache(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        CountingCommand.parsers_built = 0
+        self.command_manager = commandmanager.CommandManager('cliff.tests')
+        self.command_manager.add_command('show file', CountingCommand)
+        self.output = io.StringIO()
+        self.app = app.App(
+            'testing',
+            '1',
+            self.command_manager,
+            stdin=io.StringIO(),
+            stdout=self.output,
+            stderr=io.StringIO(),
+        )
+        self.app.options, _ = self.app.parser.parse_known_args([])
+        self.find_command = self.useFixture(
+            fixtures.MockPatchObject(
+                self.command_manager,
+                'find_command',
+                wraps=self.command_manager.find_command,
+            )
+        ).mock
+
+    def interact(self, *lines):
+        def cmdloop(interpreter, intro=None):
+            for line in lines:
+                interpreter.default(line)
+
+        with mock.patch.object(InteractiveApp, 'cmdloop', cmdloop):
+            self.app.interactive_mode = True
+            self.app.interact()
+
+    def test_find_command_cached(self):
+        interpreter = InteractiveApp(
+            self.app, self.command_manager, stdin=None, stdout=None
+        )
+        self.assertEqual(
+            (CountingCommand, 'show file', ['--value', 'a']),
+            interpreter.find_command(['show', 'file', '--value', 'a']),
+        )
+        self.assertEqual(
+            (CountingCommand, 'show file', ['--value', 'b']),
+            interpreter.find_command(['show', 'file', '--value', 'b']),
+        )
+        self.assertEqual(
+            (CountingCommand, 'show file', []),
+            interpreter.find_command(['show', 'file']),
+        )
+        self.assertEqual(1, self.find_command.call_count)
+
+    def test_find_command_cache_invalidated(self):
+        interpreter = InteractiveApp(
+            self.app, self.command_manager, stdin=None, stdout=None
+        )
+        interpreter.find_command(['show', 'file'])
+        self.command_manager.add_command('show file', OtherCommand)
+        self.assertEqual(
+            (OtherCommand, 'show file', []),
+            interpreter.find_command(['show', 'file']),
+        )
+        self.command_manager.add_legacy_command('show_file', 'show file')
+        self.assertEqual(
+            (OtherCommand, 'show_file', []),
+            interpreter.find_command(['show_file']),
+        )
+
+    def test_find_command_unknown(self):
+        interpreter = InteractiveApp(
+            self.app, self.command_manager, stdin=None, stdout=None
+        )
+        self.assertRaises(ValueError, interpreter.find_command, ['show'])
+        self.assertRaises(ValueError, interpreter.find_command, ['show'])
+        self.assertEqual(2, self.find_command.call_count)
+
+    def test_session_reuses_commands_and_parsers(self):
+        self.interact(
+            'show file --value a', 'show file --value b', 'show file'
+        )
+        self.assertEqual('a\nb\nNone\n', self.output.getvalue())
+        self.assertEqual(1, self.find_command.call_count)
+        self.assertEqual(1, CountingCommand.parsers_built)
+        self.assertIsNone(self.app._parser_cache)
+
+    def test_session_parser_cache_disabled(self):
+        with mock.patch.object(InteractiveApp, 'cache_parsers', False):
+            self.interact('show file --value a', 'show file --value b')
+        self.assertEqual('a\nb\n', self.output.getvalue())
+        self.assertEqual(2, CountingCommand.parsers_built)
+
+
+class FilesCommand(lister.Lister):
+    "List files, counting the rows generated."
+
+    rows_generated = 0
+
+    def take_action(self, parsed_args):
+        def rows():
+            for row in [('a', 3), ('b', 1), ('ab', 2)]:
+                FilesCommand.rows_generated += 1
+                yield row
+
+        return ('Name', 'Size'), rows()
+
+
+class TestInteractivePipeline(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        FilesCommand.rows_generated = 0
+        CountingCommand.parsers_built = 0
+        command_manager = commandmanager.CommandManager('cliff.tests')
+        command_manager.add_command('list files', FilesCommand)
+        command_manager.add_command('show file', CountingCommand)
+        self.output = io.StringIO()
+        self.app = app.App(
+            'testing',
+            '1',
+            command_manager,
+            stdin=io.StringIO(),
+            stdout=self.output,
+            stderr=io.StringIO(),
+        )
+        self.app.options, _ = self.app.parser.parse_known_args([])
+        self.app.interactive_mode = True
+        self.interpreter = InteractiveApp(
+            self.app, command_manager, stdin=None, stdout=None, errexit=True
+        )
+        self.app.interpreter = self.interpreter
+        self.log = self.useFixture(
+            fixtures.MockPatchObject(self.app, 'LOG')
+        ).mock
+
+    def test_filters(self):
+        self.assertFalse(
+            self.interpreter.default(
+                'list files -f value -c Name :: grep a :: sort -r Size'
+            )
+        )
+        self.assertEqual('a\nab\n', self.output.getvalue())
+
+    def test_head_stops_rows(self):
+        self.assertFalse(
+            self.interpreter.default('list files -f value :: head 1')
+        )
+        self.assertEqual('a 3\n', self.output.getvalue())
+        self.assertEqual(1, FilesCommand.rows_generated)
+
+    def test_filter_error(self):
+        self.assertTrue(
+            self.interpreter.default('list files :: grep -c Owner a')
+        )
+        self.log.error.assert_called_once_with(mock.ANY)
+        self.assertEqual('', self.output.getvalue())
+
+    def test_unknown_filter(self):
+        self.assertTrue(self.interpreter.default('list files :: uniq'))
+        self.log.error.assert_called_once_with(
+            'Unknown filter %r, known filters are: %s',
+            'uniq',
+            'grep, head, sort',
+        )
+
+    def test_invalid_filter_arguments(self):
+        self.assertRaises(
+            cmd2.exceptions.Cmd2ArgparseError,
+            self.interpreter.default,
+            'list files :: head x',
+        )
+
+    def test_empty_stage(self):
+        self.assertTrue(self.interpreter.default('list files ::'))
+        self.assertEqual(FilesCommand.rows_generated, 0)
+
+    def test_not_a_lister(self):
+        self.assertTrue(self.interpreter.default('show file :: head'))
+        self.log.error.assert_called_once_with(
+            'The output of %r cannot be filtered, it does not list rows',
+            'show file',
+        )
+        self.assertEqual(0, CountingCommand.parsers_built)
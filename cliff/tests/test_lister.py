@@ -11,14 +11,28 @@
 #  under the License.
 
 import argparse
+import asyncio
+from collections.abc import Sequence
+import io
+import os
+import shlex
+import sys
+import threading
+import time
 from typing import Any
 import weakref
 
 from unittest import mock
 
+import fixtures
+
+from cliff import app
+from cliff import commandmanager
+from cliff import display
 from cliff.formatters import base as base_formatters
 from cliff import lister
 from cliff.tests import base
+from cliff.tests import utils
 
 
 class FauxFormatter(base_formatters.ListFormatter):
@@ -103,6 +117,42 @@ class TestLister(base.TestBase):
         data = list(args[1])
         self.assertEqual([['a', 'A'], ['b', 'B'], ['c', 'A']], data)
 
+    def run_filtered(self, data):
+        test_lister = ExerciseLister(mock.Mock(), None)
+        parsed_args = mock.Mock()
+        parsed_args.columns = ('Col2',)
+        parsed_args.formatter = 'test'
+        parsed_args.sort_columns = []
+        with mock.patch.object(
+            test_lister,
+            'take_action',
+            return_value=(('Col1', 'Col2'), data),
+        ):
+            test_lister.run(parsed_args)
+        f = test_lister._formatter_plugins['test']
+        assert isinstance(f, FauxFormatter)
+        return f.args[0][1]
+
+    def test_filter_by_columns_sequence(self):
+        data = self.run_filtered(ExerciseLister.data)
+        self.assertIsInstance(data, Sequence)
+        self.assertEqual(3, len(data))
+        self.assertEqual(['B'], data[1])
+        self.assertEqual([['A'], ['B'], ['A']], list(data))
+        self.assertEqual([['B'], ['A']], list(data[1:]))
+
+    def test_filter_by_columns_columnar(self):
+        data = self.run_filtered(
+            base_formatters.ColumnarRows([['a', 'b'], ['A', 'B']])
+        )
+        self.assertIsInstance(data, base_formatters.ColumnarRows)
+        self.assertEqual([['A', 'B']], data.columns)
+
+    def test_filter_by_columns_iterator(self):
+        data = self.run_filtered(iter(ExerciseLister.data))
+        self.assertNotIsInstance(data, Sequence)
+        self.assertEqual([['A'], ['B'], ['A']], list(data))
+
     def test_sort_by_column_cliff_side_procedure(self):
         test_lister = ExerciseLister(mock.Mock(), None)
         parsed_args = mock.Mock()
@@ -226,3 +276,441 @@ class TestLister(base.TestBase):
         args = f.args[0]
         data = list(args[1])
         self.assertEqual([['a', 'A'], ['b', 'B'], ['c', 'A']], data)
+
+
+class ExercisePluginLister(lister.Lister):
+    def take_action(self, parsed_args):
+        return (('Col1', 'Col2'), [('a', 'A')])
+
+
+class TestFormatterPlugins(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.useFixture(
+            fixtures.MockPatchObject(display, '_formatter_managers', {})
+        )
+
+    def test_plugins_shared(self):
+        first = ExercisePluginLister(mock.Mock(), None)
+        second = ExercisePluginLister(mock.Mock(), None)
+        self.assertIs(first._formatter_plugins, second._formatter_plugins)
+
+    def test_selected_formatter_instantiated(self):
+        test_lister = ExercisePluginLister(mock.Mock(), None)
+        plugins = test_lister._formatter_plugins
+        self.assertEqual(
+            [None] * len(plugins.names()), [ext.obj for ext in plugins]
+        )
+        parsed_args = argparse.Namespace(
+            formatter='value', columns=[], sort_columns=[]
+        )
+        test_lister.app.stdout = io.StringIO()
+        test_lister.run(parsed_args)
+        self.assertEqual('a A\n', test_lister.app.stdout.getvalue())
+        self.assertEqual(
+            ['value'], [ext.name for ext in plugins if ext.obj is not None]
+        )
+        self.assertIs(plugins['value'].obj, test_lister.formatter)
+
+    def test_run_subcommand_instantiates_selected_formatter(self):
+        cmd_mgr = commandmanager.CommandManager('cliff.tests')
+        cmd_mgr.add_command('plugin list', ExercisePluginLister)
+        out = io.StringIO()
+        test_app = app.App('testing', '1', cmd_mgr, stdout=out)
+        test_app.options, _ = test_app.parser.parse_known_args([])
+        self.assertEqual(
+            0, test_app.run_subcommand(['plugin', 'list', '-f', 'csv'])
+        )
+        self.assertEqual('"Col1","Col2"\n"a","A"\n', out.getvalue())
+        plugins = display._formatter_managers['cliff.formatter.list']
+        self.assertEqual(
+            ['csv'], [ext.name for ext in plugins if ext.obj is not None]
+        )
+
+    def test_parse_adds_selected_formatter_arguments(self):
+        test_lister = ExercisePluginLister(mock.Mock(), None)
+        parser = test_lister.get_parser('test')
+        parsed_args = parser.parse_args(['-f', 'json', '--noindent'])
+        self.assertTrue(parsed_args.noindent)
+        self.assertEqual(
+            ['json formatter'],
+            [
+                group.title
+                for group in parser._action_groups
+                if (group.title or '').endswith('formatter')
+            ],
+        )
+        plugins = test_lister._formatter_plugins
+        self.assertEqual(
+            ['json'], [ext.name for ext in plugins if ext.obj is not None]
+        )
+
+    def test_help_shows_all_formatter_arguments(self):
+        test_lister = ExercisePluginLister(mock.Mock(), None)
+        help_text = test_lister.get_parser('test').format_help()
+        self.assertIn('--noindent', help_text)
+        self.assertIn('--max-width', help_text)
+        self.assertIn('--quote', help_text)
+
+    def test_formatter_arguments_not_deferred(self):
+        class EagerLister(ExercisePluginLister):
+            defer_formatter_arguments = False
+
+        parser = EagerLister(mock.Mock(), None).get_parser('test')
+        parsed_args = parser.parse_args(['-f', 'json'])
+        self.assertIn('max_width', vars(parsed_args))
+
+
+class StreamingFormatter(FauxFormatter):
+    def emit_list(self, columns, data, stdout, args):
+        self.thread = threading.current_thread()
+        self.args.append((columns, list(data)))
+
+
+class ExerciseAsyncLister(lister.AsyncLister):
+    closed = False
+
+    def _load_formatter_plugins(self):
+        return {
+            'test': StreamingFormatter(),
+        }
+
+    async def rows(self):
+        try:
+            for row in ExerciseLister.data:
+                await asyncio.sleep(0)
+                yield row
+        finally:
+            self.closed = True
+
+    async def take_action(self, parsed_args):
+        return (parsed_args.columns, self.rows())
+
+
+class TestAsyncLister(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.app = app.App(
+            'foo', '1.0', utils.TestCommandManager(utils.TEST_NAMESPACE)
+        )
+        self.addCleanup(self.app._close_event_loop)
+        self.parsed_args = argparse.Namespace(
+            columns=('Col1', 'Col2'),
+            formatter='test',
+            sort_columns=[],
+            sort_direction=None,
+        )
+
+    def test_async_iterable_rows(self):
+        test_lister = ExerciseAsyncLister(self.app, None)
+        self.assertEqual(0, test_lister.run(self.parsed_args))
+        f = test_lister._formatter_plugins['test']
+        assert isinstance(f, StreamingFormatter)
+        self.assertEqual(
+            [(['Col1', 'Col2'], [['a', 'A'], ['b', 'B'], ['c', 'A']])], f.args
+        )
+        self.assertIsNot(threading.current_thread(), f.thread)
+        self.assertTrue(test_lister.closed)
+
+    def test_async_iterable_rows_sorted(self):
+        test_lister = ExerciseAsyncLister(self.app, None)
+        self.parsed_args.sort_columns = ['Col2']
+        test_lister.run(self.parsed_args)
+        f = test_lister._formatter_plugins['test']
+        assert isinstance(f, StreamingFormatter)
+        self.assertEqual([['a', 'A'], ['c', 'A'], ['b', 'B']], f.args[0][1])
+
+    def test_rows_closed_on_error(self):
+        test_lister = ExerciseAsyncLister(self.app, None)
+        f = test_lister._formatter_plugins['test']
+
+        def emit_list(columns, data, stdout, args):
+            next(iter(data))
+            raise BrokenPipeError()
+
+        with mock.patch.object(f, 'emit_list', emit_list):
+            self.assertRaises(
+                BrokenPipeError, test_lister.run, self.parsed_args
+            )
+        self.assertTrue(test_lister.closed)
+
+    def test_sequence_rows(self):
+        class ExerciseAsyncListerSequence(ExerciseAsyncLister):
+            async def take_action(self, parsed_args):
+                return (parsed_args.columns, ExerciseLister.data)
+
+        test_lister = ExerciseAsyncListerSequence(self.app, None)
+        test_lister.run(self.parsed_args)
+        f = test_lister._formatter_plugins['test']
+        assert isinstance(f, StreamingFormatter)
+        self.assertIs(threading.current_thread(), f.thread)
+
+
+class ExerciseListerAsyncRows(ExerciseLister):
+    closed = False
+    fetched = 0
+
+    def _load_formatter_plugins(self):
+        return {
+            'test': StreamingFormatter(),
+        }
+
+    @property
+    def async_prefetch(self):
+        return 1
+
+    async def rows(self):
+        try:
+            for row in self.data:
+                await asyncio.sleep(0)
+                self.fetched += 1
+                yield row
+        finally:
+            self.closed = True
+
+    def take_action(self, parsed_args):
+        return (parsed_args.columns, self.rows())
+
+
+class TestListerAsyncRows(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.parsed_args = argparse.Namespace(
+            columns=('Col1', 'Col2'),
+            formatter='test',
+            sort_columns=[],
+            sort_direction=None,
+        )
+
+    def test_rows(self):
+        test_lister = ExerciseListerAsyncRows(mock.Mock(), None)
+        self.assertEqual(0, test_lister.run(self.parsed_args))
+        f = test_lister._formatter_plugins['test']
+        assert isinstance(f, StreamingFormatter)
+        self.assertEqual(
+            [(['Col1', 'Col2'], [['a', 'A'], ['b', 'B'], ['c', 'A']])], f.args
+        )
+        self.assertIs(threading.current_thread(), f.thread)
+        self.assertTrue(test_lister.closed)
+
+    def test_prefetch(self):
+        test_lister = ExerciseListerAsyncRows(mock.Mock(), None)
+        f = test_lister._formatter_plugins['test']
+        fetched = []
+
+        def emit_list(columns, data, stdout, args):
+            for i, _ in enumerate(data):
+                # Wait for the next row to be fetched in the background.
+                expected = min(i + 2, len(test_lister.data))
+                deadline = time.monotonic() + 5
+                while (
+                    test_lister.fetched < expected
+                    and time.monotonic() < deadline
+                ):
+                    time.sleep(0.001)
+                time.sleep(0.01)
+                fetched.append(test_lister.fetched)
+
+        with mock.patch.object(f, 'emit_list', emit_list):
+            test_lister.run(self.parsed_args)
+        # With a prefetch of one, the next row is fetched while each row is
+        # processed, but never more than that.
+        self.assertEqual([2, 3, 3], fetched)
+
+    def test_rows_closed_early(self):
+        test_lister = ExerciseListerAsyncRows(mock.Mock(), None)
+        f = test_lister._formatter_plugins['test']
+
+        def emit_list(columns, data, stdout, args):
+            next(iter(data))
+            raise BrokenPipeError()
+
+        with mock.patch.object(f, 'emit_list', emit_list):
+            self.assertRaises(
+                BrokenPipeError, test_lister.run, self.parsed_args
+            )
+        self.assertTrue(test_lister.closed)
+        self.assertLess(test_lister.fetched, len(test_lister.data))
+
+    def test_error_in_rows(self):
+        class ExerciseListerAsyncRowsError(ExerciseListerAsyncRows):
+            async def rows(self):
+                yield ('a', 'A')
+                raise RuntimeError('page not found')
+
+        test_lister = ExerciseListerAsyncRowsError(mock.Mock(), None)
+        self.assertRaisesRegex(
+            RuntimeError,
+            'page not found',
+            test_lister.run,
+            self.parsed_args,
+        )
+
+
+class ExercisePagedLister(lister.Lister):
+    "List many rows."
+
+    count = 100000
+    generated = 0
+    closed = False
+
+    pager_option = True
+
+    def take_action(self, parsed_args):
+        return ('ID',), self.rows()
+
+    def rows(self):
+        try:
+            for i in range(self.count):
+                self.generated += 1
+                yield (i,)
+        finally:
+            self.closed = True
+
+
+class ClosedPipe(io.StringIO):
+    """A stream whose reader goes away after some output."""
+
+    def __init__(self, size):
+        super().__init__()
+        self.size = size
+
+    def write(self, s):
+        if self.tell() + len(s) > self.size:
+            raise BrokenPipeError('closed')
+        return super().write(s)
+
+
+class TestListerClosedPipe(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.test_lister = ExercisePagedLister(mock.Mock(), None)
+        self.test_lister.app.stdout = ClosedPipe(100)
+
+    def run_lister(self, *argv):
+        parser = self.test_lister.get_parser('test')
+        self.assertRaises(
+            BrokenPipeError, self.test_lister.run, parser.parse_args(argv)
+        )
+        # The rows stop being generated within a batch of the formatters.
+        self.assertLess(self.test_lister.generated, 1000)
+        self.assertTrue(self.test_lister.closed)
+
+    def test_value(self):
+        self.run_lister('-f', 'value')
+
+    def test_json(self):
+        self.run_lister('-f', 'json')
+
+    def test_yaml(self):
+        self.run_lister('-f', 'yaml')
+
+    def test_rows_closed(self):
+        self.test_lister.app.stdout = io.StringIO()
+        self.test_lister.count = 2
+        parser = self.test_lister.get_parser('test')
+        self.test_lister.run(parser.parse_args(['-f', 'csv']))
+        self.assertTrue(self.test_lister.closed)
+
+
+class TestListerPager(base.TestBase):
+    def setUp(self):
+        super().setUp()
+        self.path = self.useFixture(fixtures.TempDir()).join('paged')
+        self.test_lister = ExercisePagedLister(mock.Mock(), None)
+        parser = self.test_lister.get_parser('test')
+        self.parsed_args = parser.parse_args(['-f', 'value', '--pager'])
+
+    def use_pager(self, script):
+        # The pager writes what it reads to a file.
+        self.useFixture(
+            fixtures.EnvironmentVariable(
+                'PAGER', shlex.join([sys.executable, '-c', script, self.path])
+            )
+        )
+        primary, secondary = os.openpty()
+        self.addCleanup(os.close, primary)
+        self.test_lister.app.stdout = open(secondary, 'w')
+        self.addCleanup(self.test_lister.app.stdout.close)
+
+    def read_paged(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_pager(self):
+        self.use_pager(
+            'import sys; open(sys.argv[1], "w").write(sys.stdin.read())'
+        )
+        self.test_lister.count = 2
+        self.assertEqual(0, self.test_lister.run(self.parsed_args))
+        self.assertEqual('0\n1\n', self.read_paged())
+
+    def test_pager_exits(self):
+        self.use_pager(
+            'import sys; open(sys.argv[1], "w").write(sys.stdin.readline())'
+        )
+        self.assertRaises(
+            BrokenPipeError, self.test_lister.run, self.parsed_args
+        )
+        self.assertEqual('0\n', self.read_paged())
+        self.assertLess(self.test_lister.generated, self.test_lister.count)
+
+    def test_not_tty(self):
+        self.test_lister.app.stdout = io.StringIO()
+        self.test_lister.count = 2
+        self.assertEqual(0, self.test_lister.run(self.parsed_args))
+        self.assertEqual('0\n1\n', self.test_lister.app.stdout.getvalue())
+
+    def test_envvar(self):
+        self.useFixture(fixtures.EnvironmentVariable('CLIFF_USE_PAGER', '1'))
+        parser = self.test_lister.get_parser('test')
+        self.assertTrue(parser.parse_args([]).pager)
+
+    def test_envvar_word(self):
+        self.useFixture(
+            fixtures.EnvironmentVariable('CLIFF_USE_PAGER', 'true')
+        )
+        parser = self.test_lister.get_parser('test')
+        self.assertTrue(parser.parse_args([]).pager)
+
+
+class ExerciseOwnPagerLister(ExercisePluginLister):
+    "List rows with an option of the same name as that of the pager."
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument('--pager', metavar='<name>')
+        return parser
+
+
+class TestPagerOption(base.TestBase):
+    def make_app(self, **kwargs):
+        return app.App(
+            'testing',
+            '1',
+            commandmanager.CommandManager('cliff.tests'),
+            stdout=io.StringIO(),
+            **kwargs,
+        )
+
+    def test_disabled_by_default(self):
+        test_lister = ExerciseOwnPagerLister(self.make_app(), None)
+        parser = test_lister.get_parser('test')
+        self.assertEqual('less', parser.parse_args(['--pager', 'less']).pager)
+
+    def test_app_option(self):
+        test_lister = ExercisePluginLister(
+            self.make_app(pager_option=True), None
+        )
+        parser = test_lister.get_parser('test')
+        self.assertTrue(parser.parse_args(['--pager']).pager)
+
+    def test_command_option(self):
+        class ExerciseNoPagerLister(ExerciseOwnPagerLister):
+            pager_option = False
+
+        test_lister = ExerciseNoPagerLister(
+            self.make_app(pager_option=True), None
+        )
+        parser = test_lister.get_parser('test')
+        self.assertEqual('less', parser.parse_args(['--pager', 'less']).pager)
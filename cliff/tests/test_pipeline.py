@@ -0,0 +1,114 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import itertools
+
+from cliff import pipeline
+from cliff.tests import base
+
+COLUMNS = ('Name', 'Size')
+ROWS = [('a', 3), ('b', None), ('ab', 1), ('c', 2)]
+
+
+def run_filter(pipe_filter, argv, rows=ROWS):
+    parsed_args = pipe_filter.get_parser('filter').parse_args(argv)
+    columns, data = pipe_filter.filter(parsed_args, COLUMNS, iter(rows))
+    return columns, list(data)
+
+
+class TestGrepFilter(base.TestBase):
+    def test_all_columns(self):
+        self.assertEqual(
+            (COLUMNS, [('a', 3), ('ab', 1)]),
+            run_filter(pipeline.GrepFilter(), ['a|1']),
+        )
+
+    def test_column(self):
+        self.assertEqual(
+            (COLUMNS, [('ab', 1)]),
+            run_filter(pipeline.GrepFilter(), ['-c', 'size', '1']),
+        )
+
+    def test_ignore_case_invert(self):
+        self.assertEqual(
+            (COLUMNS, [('b', None), ('c', 2)]),
+            run_filter(pipeline.GrepFilter(), ['-i', '-v', '^A']),
+        )
+
+    def test_unknown_column(self):
+        self.assertRaises(
+            ValueError,
+            run_filter,
+            pipeline.GrepFilter(),
+            ['-c', 'owner', 'a'],
+        )
+
+
+class TestSortFilter(base.TestBase):
+    def test_sort(self):
+        self.assertEqual(
+            (COLUMNS, [('ab', 1), ('c', 2), ('a', 3), ('b', None)]),
+            run_filter(pipeline.SortFilter(), ['Size']),
+        )
+
+    def test_reverse(self):
+        self.assertEqual(
+            (COLUMNS, [('c', 2), ('b', None), ('ab', 1), ('a', 3)]),
+            run_filter(pipeline.SortFilter(), ['-r', 'name']),
+        )
+
+    def test_unsortable(self):
+        self.assertRaises(
+            ValueError,
+            run_filter,
+            pipeline.SortFilter(),
+            ['Name'],
+            [('a', 1), (2, 2)],
+        )
+
+
+class TestHeadFilter(base.TestBase):
+    def test_head(self):
+        self.assertEqual(
+            (COLUMNS, [('a', 3), ('b', None)]),
+            run_filter(pipeline.HeadFilter(), ['2']),
+        )
+
+    def test_default(self):
+        rows = [(str(i), i) for i in range(20)]
+        self.assertEqual(
+            rows[:10], run_filter(pipeline.HeadFilter(), [], rows)[1]
+        )
+
+    def test_lazy(self):
+        rows = ((str(i), i) for i in itertools.count())
+        self.assertEqual(
+            [('0', 0)], run_filter(pipeline.HeadFilter(), ['1'], rows)[1]
+        )
+
+    def test_invalid_count(self):
+        self.assertRaises(
+            SystemExit, run_filter, pipeline.HeadFilter(), ['-1']
+        )
+
+
+class TestFiltering(base.TestBase):
+    def test_filter(self):
+        parsed_args = (
+            pipeline.HeadFilter().get_parser('head').parse_args(['1'])
+        )
+        with pipeline._filtering([(pipeline.HeadFilter(), parsed_args)]):
+            columns, data = pipeline._filter(COLUMNS, ROWS)
+            self.assertEqual([('a', 3)], list(data))
+            # The filters only apply once.
+            self.assertEqual((COLUMNS, ROWS), pipeline._filter(COLUMNS, ROWS))
+        self.assertEqual((COLUMNS, ROWS), pipeline._filter(COLUMNS, ROWS))
@@ -11,13 +11,16 @@
 #  under the License.
 
 import argparse
+import asyncio
 import weakref
 
 from unittest import mock
 
+from cliff import app
 from cliff.formatters import base as base_formatters
 from cliff import show
 from cliff.tests import base
+from cliff.tests import utils
 
 
 class FauxFormatter(base_formatters.SingleFormatter):
@@ -45,6 +48,17 @@ class ExerciseShowOne(show.ShowOne):
         )
 
 
+class ExerciseAsyncShowOne(show.AsyncShowOne):
+    def _load_formatter_plugins(self):
+        return {
+            'test': FauxFormatter(),
+        }
+
+    async def take_action(self, parsed_args):
+        await asyncio.sleep(0)
+        return (parsed_args.columns, ('A', 'B'))
+
+
 class TestShow(base.TestBase):
     def test_formatter_args(self):
         app = mock.Mock()
@@ -80,3 +94,15 @@ class TestShow(base.TestBase):
             mock_take_action.return_value = (('Col1', 'Col2', 'Col3'), [])
             with self.assertRaises(ValueError):
                 test_show.run(parsed_args)
+
+    def test_async_show(self):
+        test_app = app.App(
+            'foo', '1.0', utils.TestCommandManager(utils.TEST_NAMESPACE)
+        )
+        self.addCleanup(test_app._close_event_loop)
+        test_show = ExerciseAsyncShowOne(test_app, None)
+        parsed_args = argparse.Namespace(columns=('Col1',), formatter='test')
+        self.assertEqual(0, test_show.run(parsed_args))
+        f = test_show._formatter_plugins['test']
+        assert isinstance(f, FauxFormatter)
+        self.assertEqual([(['Col1'], ['A'])], f.args)
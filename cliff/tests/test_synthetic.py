@@ -0,0 +1,121 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import importlib.metadata
+import io
+import sys
+
+from cliff import command
+from cliff import commandmanager
+from cliff import sphinxext
+from cliff.tests import base
+from cliff.tests import synthetic
+
+
+class TestSyntheticCLI(base.TestBase):
+    def make_app(self, **kwargs):
+        self.cli = self.useFixture(synthetic.SyntheticCLI(**kwargs))
+        self.output = io.StringIO()
+        return self.cli.make_app(
+            stdin=io.StringIO(), stdout=self.output, stderr=self.output
+        )
+
+    def test_command_names(self):
+        names = synthetic.command_names(100)
+        self.assertEqual(100, len(set(names)))
+        words = {word for name in names for word in name.split()}
+        for word in words:
+            self.assertEqual([word], [w for w in words if w.startswith(word)])
+
+    def test_namespaces(self):
+        app = self.make_app(commands=30, namespaces=3)
+        self.assertEqual(
+            sorted(self.cli.names + ['help', 'complete']),
+            sorted(app.command_manager.commands),
+        )
+        manager = commandmanager.CommandManager(self.cli.namespaces[1])
+        self.assertEqual(
+            sorted(self.cli.names[1::3]), sorted(manager.commands)
+        )
+
+    def test_run(self):
+        app = self.make_app(commands=10, hooks=2)
+        name = self.cli.names[3]
+        self.assertEqual(
+            0,
+            app.run([*name.split(), 'x', '--option-4', 'y', '--hook-1', 'z']),
+        )
+        self.assertEqual(f'{name} x\n', self.output.getvalue())
+
+    def test_help(self):
+        app = self.make_app(commands=10, hooks=2, arguments=3)
+        self.assertEqual(0, app.run(['help', *self.cli.names[5].split()]))
+        help_text = self.output.getvalue()
+        self.assertIn('--option-2', help_text)
+        self.assertNotIn('--option-3', help_text)
+        self.assertIn('--hook-1', help_text)
+        self.assertIn('Extended by hook 0. Extended by hook 1.', help_text)
+
+    def test_complete(self):
+        app = self.make_app(commands=10)
+        self.assertEqual(0, app.run(['complete']))
+        words = self.cli.names[0].split()
+        self.assertIn(
+            f"cmds_{words[0]}_{words[1]}='add create delete",
+            self.output.getvalue(),
+        )
+
+    def test_distribution(self):
+        app = self.make_app(commands=10)
+        self.assertEqual('1.0', importlib.metadata.version(self.cli.package))
+        cmd_factory = app.command_manager.find_command(
+            self.cli.names[0].split()
+        )[0]
+        self.assertEqual(
+            self.cli.package,
+            command._get_distribution_for_module(
+                sys.modules[cmd_factory.__module__]
+            ),
+        )
+
+    def test_sphinx(self):
+        app = self.make_app(commands=10)
+        cmd_factory = app.command_manager.find_command(
+            self.cli.names[2].split()
+        )[0]
+        cmd = cmd_factory(None, None)
+        text = '\n'.join(
+            sphinxext._format_parser(cmd.get_parser(self.cli.names[2]))
+        )
+        self.assertIn('.. option:: --option-4 <value-4>', text)
+        self.assertIn(f'provided by the {self.cli.package} plugin', text)
+
+    def test_cleanup(self):
+        cli = synthetic.SyntheticCLI(commands=10)
+        with cli:
+            cli.make_app()
+            self.assertIn(f'{cli.package}.app', sys.modules)
+        self.assertNotIn(f'{cli.package}.app', sys.modules)
+        self.assertEqual(
+            [], list(importlib.metadata.entry_points(group=cli.namespaces[0]))
+        )
+        self.assertEqual(
+            {}, commandmanager.CommandManager(cli.namespaces[0]).commands
+        )
+        self.assertEqual(
+            [],
+            [
+                ns
+                for ns in command._hook_managers
+                if ns.startswith(cli.package)
+            ],
+        )
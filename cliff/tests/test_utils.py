@@ -11,6 +11,7 @@
 #  under the License.
 
 import os
+import random
 from unittest import mock
 
 from cliff.tests import base
@@ -34,3 +35,82 @@ class TestTerminalWidth(base.TestBase):
         mock_os.get_terminal_size.side_effect = OSError()
         width = utils.terminal_width()
         self.assertIs(None, width)
+
+
+class TestEnvFlag(base.TestBase):
+    def test_enabled(self):
+        for value in ('1', 'true', 'True', 'YES', 'on', ' 1 '):
+            with mock.patch.dict(os.environ, {'CLIFF_TEST_FLAG': value}):
+                self.assertTrue(utils.env_flag('CLIFF_TEST_FLAG'), value)
+
+    def test_disabled(self):
+        for value in ('0', 'false', 'no', 'off', '', 'nonsense'):
+            with mock.patch.dict(os.environ, {'CLIFF_TEST_FLAG': value}):
+                self.assertFalse(utils.env_flag('CLIFF_TEST_FLAG'), value)
+
+    def test_unset(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('CLIFF_TEST_FLAG', None)
+            self.assertFalse(utils.env_flag('CLIFF_TEST_FLAG'))
+
+
+class TestDamerauLevenshtein(base.TestBase):
+    costs = [
+        utils.COST,
+        {'w': 1, 's': 1, 'a': 1, 'd': 1},
+        {'w': 2, 's': 3, 'a': 2, 'd': 1},
+    ]
+
+    def random_words(self, rand, count, max_length):
+        return [
+            ''.join(
+                rand.choice('abc') for _ in range(rand.randint(0, max_length))
+            )
+            for _ in range(count)
+        ]
+
+    def test_bounded(self):
+        rand = random.Random(0)
+        for cost in self.costs:
+            words = self.random_words(rand, 40, 7)
+            for s1, s2 in zip(words, reversed(words)):
+                distance = utils.damerau_levenshtein(s1, s2, cost)
+                for max_distance in range(12):
+                    self.assertEqual(
+                        distance if distance <= max_distance else None,
+                        utils.damerau_levenshtein_bounded(
+                            s1, s2, cost, max_distance
+                        ),
+                        repr((s1, s2, cost, max_distance)),
+                    )
+
+    def test_bounded_length_difference(self):
+        self.assertIsNone(
+            utils.damerau_levenshtein_bounded('a', 'abcdef', utils.COST, 4)
+        )
+        self.assertEqual(
+            5, utils.damerau_levenshtein_bounded('a', 'abcdef', utils.COST, 5)
+        )
+
+    def test_many(self):
+        rand = random.Random(0)
+        candidates = self.random_words(rand, 100, 6)
+        for cost in self.costs:
+            for s1 in ('', 'a', 'abc', 'cabba'):
+                distances = [
+                    utils.damerau_levenshtein(s1, candidate, cost)
+                    for candidate in candidates
+                ]
+                for max_distance in (None, 0, 1, 3, 8):
+                    self.assertEqual(
+                        [
+                            distance
+                            if max_distance is None or distance <= max_distance
+                            else None
+                            for distance in distances
+                        ],
+                        utils.damerau_levenshtein_many(
+                            s1, candidates, cost, max_distance
+                        ),
+                        repr((s1, cost, max_distance)),
+                    )
@@ -10,6 +10,9 @@
 #  License for the specific language governing permissions and limitations
 #  under the License.
 
+import os
+import time
+
 from cliff.command import Command
 from cliff.commandmanager import CommandManager
 
@@ -43,3 +46,49 @@ class TestCommandManager(CommandManager):
             for key in ('one', 'two words', 'three word command'):
                 self.add_command(key, TestCommand)
             self.add_command('old cmd', TestDeprecatedCommand)
+
+
+class SleepCommand(Command):
+    "Sleep, then print a message."
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument('delay', type=float)
+        parser.add_argument('message')
+        return parser
+
+    def take_action(self, parsed_args):
+        time.sleep(parsed_args.delay)
+        self.app.stdout.write(f'{parsed_args.message}\n')
+        return 0
+
+
+class RendezvousCommand(Command):
+    """Wait until a number of commands are running, then print a message.
+
+    Each command creates a file named after its message in the directory,
+    so that commands running in other threads or processes meet. The
+    command fails if the others are not all running within 10 seconds.
+    """
+
+    timeout = 10
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument('directory')
+        parser.add_argument('count', type=int)
+        parser.add_argument('message')
+        return parser
+
+    def take_action(self, parsed_args):
+        with open(
+            os.path.join(parsed_args.directory, parsed_args.message), 'w'
+        ):
+            pass
+        deadline = time.monotonic() + self.timeout
+        while len(os.listdir(parsed_args.directory)) < parsed_args.count:
+            if time.monotonic() > deadline:
+                return 1
+            time.sleep(0.01)
+        self.app.stdout.write(f'{parsed_args.message}\n')
+        return 0
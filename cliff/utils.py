@@ -11,6 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections.abc import Sequence
 import os
 
 # Each edit operation is assigned different cost, such as:
@@ -90,6 +91,158 @@ def damerau_levenshtein(s1: str, s2: str, cost: dict[str, int]) -> int:
     return row1[-1]
 
 
+def damerau_levenshtein_bounded(
+    s1: str, s2: str, cost: dict[str, int], max_distance: int
+) -> int | None:
+    """Calculates the Damerau-Levenshtein distance up to a maximum.
+
+    Returns the same distance as :func:`damerau_levenshtein`, or None if it
+    is greater than ``max_distance``. Every insertion or deletion changes
+    the difference between the lengths of the prefixes compared, so only
+    the cells of the matrix within a band around its diagonal can lead to
+    a distance below the maximum, and only those are computed. The
+    computation stops as soon as the last two rows exceed the maximum.
+    This makes the cost proportional to the maximum rather than to the
+    length of the strings.
+    """
+    if s1 == s2:
+        return 0 if max_distance >= 0 else None
+
+    len1 = len(s1)
+    len2 = len(s2)
+    ins = cost['a']
+    dele = cost['d']
+
+    # Lowest cost of the insertions or deletions needed for the lengths
+    delta = len2 - len1
+    base = delta * ins if delta >= 0 else -delta * dele
+    if base > max_distance:
+        return None
+    if len1 == 0 or len2 == 0:
+        return base
+
+    # The band of the offsets between the column and the row of the cells
+    # which can be reached with at most max_distance.
+    if ins + dele > 0:
+        reach = (max_distance - base) // (ins + dele)
+        low = min(0, delta) - reach
+        high = max(0, delta) + reach
+    else:
+        low, high = -len1, len2
+    over = max_distance + 1
+
+    row1 = [j * ins for j in range(len2 + 1)]
+    row2 = row1[:]
+    row0 = row1[:]
+    row1_min = 0
+
+    for i in range(len1):
+        row2[0] = (i + 1) * dele
+        first = max(1, i + 1 + low)
+        last = min(len2, i + 1 + high)
+        # The cells next to the band are read but not computed.
+        if first > 1:
+            row2[first - 1] = over
+        if last < len2:
+            row2[last + 1] = over
+        row2_min = row2[0]
+
+        for j in range(first - 1, last):
+            p_cost = min(
+                # substitution
+                row1[j] + (s1[i] != s2[j]) * cost['s'],
+                # insertion
+                row2[j] + ins,
+                # deletion
+                row1[j + 1] + dele,
+            )
+            # swap
+            if i > 0 and j > 0 and s1[i - 1] == s2[j] and s1[i] == s2[j - 1]:
+                p_cost = min(p_cost, row0[j - 1] + cost['w'])
+            row2[j + 1] = p_cost
+            if p_cost < row2_min:
+                row2_min = p_cost
+
+        if row1_min > max_distance and row2_min > max_distance:
+            return None
+        row0, row1, row2 = row1, row2, row0
+        row1_min = row2_min
+
+    distance = row1[-1]
+    return distance if distance <= max_distance else None
+
+
+def damerau_levenshtein_many(
+    s1: str,
+    candidates: Sequence[str],
+    cost: dict[str, int],
+    max_distance: int | None = None,
+) -> list[int | None]:
+    """Calculates the Damerau-Levenshtein distances to many strings.
+
+    Returns the distance from ``s1`` to each of the candidates, as
+    :func:`damerau_levenshtein` does, or None for the candidates further
+    than ``max_distance``. The candidates are compared in sorted order, so
+    that the rows of the matrix computed for the prefix a candidate shares
+    with the previous one are reused. When the rows of a prefix all exceed
+    the maximum, the candidates starting with it are skipped.
+    """
+    len1 = len(s1)
+    ins = cost['a']
+    dele = cost['d']
+    # rows[j] holds the distances from the prefixes of s1 to the first j
+    # characters of the current candidate.
+    rows = [[i * dele for i in range(len1 + 1)]]
+    row_mins = [0]
+    previous = ''
+    results: list[int | None] = [None] * len(candidates)
+
+    for index in sorted(range(len(candidates)), key=candidates.__getitem__):
+        candidate = candidates[index]
+        common = 0
+        limit = min(len(candidate), len(previous), len(rows) - 1)
+        while common < limit and candidate[common] == previous[common]:
+            common += 1
+        del rows[common + 1 :]
+        del row_mins[common + 1 :]
+        previous = candidate
+
+        for j in range(len(rows), len(candidate) + 1):
+            if max_distance is not None and min(row_mins[-2:]) > max_distance:
+                break
+            char = candidate[j - 1]
+            row1 = rows[j - 1]
+            row0 = rows[j - 2] if j > 1 else row1
+            row2 = [j * ins]
+            for i in range(1, len1 + 1):
+                p_cost = min(
+                    # substitution
+                    row1[i - 1] + (s1[i - 1] != char) * cost['s'],
+                    # insertion
+                    row1[i] + ins,
+                    # deletion
+                    row2[i - 1] + dele,
+                )
+                # swap
+                if (
+                    i > 1
+                    and j > 1
+                    and s1[i - 2] == char
+                    and s1[i - 1] == candidate[j - 2]
+                ):
+                    p_cost = min(p_cost, row0[i - 2] + cost['w'])
+                row2.append(p_cost)
+            rows.append(row2)
+            row_mins.append(min(row2))
+
+        if len(rows) == len(candidate) + 1:
+            distance = rows[-1][-1]
+            if max_distance is None or distance <= max_distance:
+                results[index] = distance
+
+    return results
+
+
 def terminal_width() -> int | None:
     """Return terminal width in columns
 
@@ -102,3 +255,17 @@ def terminal_width() -> int | None:
         return os.get_terminal_size().columns
     except OSError:
         return None
+
+
+def env_flag(name: str) -> bool:
+    """Return whether an environment variable enables an option
+
+    Values such as ``1``, ``true``, ``yes`` or ``on`` enable it, in any
+    case, and any other value disables it rather than failing.
+
+    :param name: name of the environment variable
+    :returns: whether the option is enabled
+    :rtype: bool
+    """
+    value = os.environ.get(name, '')
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')